@@ -0,0 +1,62 @@
+"""
+Arrival schedules for open-loop load generation.
+"""
+import numpy as np
+
+ARRIVAL_TYPES = ("poisson", "constant")
+
+
+def build_schedule(arrival, num_requests):
+    """
+    Precomputes the dispatch offsets of an open-loop run.
+
+    Args:
+        arrival (dict): Arrival configuration, e.g. {"type": "poisson", "rate_qps": 5}.
+            "poisson" draws exponential inter-arrival gaps, "constant" spaces
+            requests evenly. An optional "seed" makes the schedule reproducible.
+        num_requests (int): Number of requests to schedule.
+
+    Returns:
+        numpy.ndarray: Offsets in seconds from the start of the run, one per request.
+    """
+    arrival_type = arrival.get("type", "poisson")
+    if arrival_type not in ARRIVAL_TYPES:
+        raise ValueError(
+            f"Arrival type '{arrival_type}' is not supported. Choose from {ARRIVAL_TYPES}."
+        )
+    rate_qps = float(arrival.get("rate_qps", 0))
+    if rate_qps <= 0:
+        raise ValueError("Arrival 'rate_qps' must be a positive number.")
+
+    if arrival_type == "constant":
+        gaps = np.full(num_requests, 1.0 / rate_qps)
+    else:
+        rng = np.random.default_rng(arrival.get("seed"))
+        gaps = rng.exponential(1.0 / rate_qps, num_requests)
+
+    # the first request is dispatched immediately
+    gaps[:1] = 0.0
+    return np.cumsum(gaps)
+
+
+def build_duration_schedule(arrival, duration_s, min_requests=None):
+    """
+    Precomputes the dispatch offsets of an open-loop run bounded by a time window.
+
+    Args:
+        arrival (dict): Arrival configuration, as for build_schedule.
+        duration_s (float): Length of the window in seconds.
+        min_requests (int, optional): Requests scheduled even past the window.
+
+    Returns:
+        numpy.ndarray: Offsets in seconds of every request due within the window,
+        and at least min_requests of them.
+    """
+    min_requests = min_requests or 0
+    expected = int(np.ceil(duration_s * float(arrival.get("rate_qps", 0))))
+    num_requests = max(min_requests, expected, 1)
+    schedule = build_schedule(arrival, num_requests)
+    while schedule[-1] < duration_s:
+        num_requests *= 2
+        schedule = build_schedule(arrival, num_requests)
+    return schedule[: max(min_requests, int(np.searchsorted(schedule, duration_s)))]
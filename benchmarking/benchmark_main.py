@@ -1,9 +1,16 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import os
-import time
 from datetime import datetime
 from matplotlib.ticker import LogLocator, FormatStrFormatter
+from benchmarking.calibration import OverheadCalibration
+from benchmarking.sequential import run_benchmark_requests
+from benchmarking.server_timing import report_server_timing
+from benchmarking.throughput import report_throughput
+from benchmarking.warmup import report_warmup
+from providers.network_timing import NETWORK_PHASES
+from providers.response_headers import SERVER_TIMING_METRICS
+from providers.token_attribution import CHUNK_METRICS
 
 class Benchmark:
     """
@@ -29,7 +36,20 @@ class Benchmark:
         prompt,
         streaming=False,
         verbosity=False,
-        vllm_ip=None
+        concurrency=None,
+        arrival=None,
+        rate_limits=None,
+        retry=None,
+        parallel_providers=False,
+        scheduler=None,
+        trace=None,
+        duration_s=None,
+        min_requests=None,
+        precision=None,
+        connection=None,
+        capture_headers=None,
+        warmup=None,
+        calibration=None,
     ):
         """
         Initializes the Benchmark instance with provided parameters.
@@ -42,7 +62,62 @@ class Benchmark:
             prompt (str): The input prompt to use for benchmarking.
             streaming (bool, optional): Flag to indicate streaming mode. Defaults to False.
             verbosity (bool, optional): Flag to enable verbose output. Defaults to False.
+            concurrency (int | dict, optional): In-flight requests per provider, either
+                one level for all providers or a mapping of provider name to level.
+                When set, requests are sent by the asyncio engine. Defaults to None.
+            arrival (dict, optional): Open-loop arrival process, e.g.
+                {"type": "poisson", "rate_qps": 5}. Requests are dispatched on the
+                precomputed schedule regardless of completions. Defaults to None.
+            rate_limits (dict, optional): Per-provider token-bucket limits, e.g.
+                {"Groq": {"requests_per_minute": 30, "tokens_per_minute": 6000}}.
+                Overrides the limits declared on the provider class. Defaults to None.
+            retry (dict, optional): Backoff settings for throttled (429/529) requests,
+                e.g. {"max_retries": 5, "base_delay": 1.0, "max_delay": 60.0}.
+                Defaults to None, which uses those values.
+            parallel_providers (bool, optional): Run every provider at the same time
+                instead of one after another. Defaults to False.
+            scheduler (dict, optional): Order of sequential requests, e.g.
+                {"type": "interleaved", "seed": 42} to shuffle the requests of all
+                providers and models. The plan and seed are saved with the run.
+                Defaults to None, which sends each provider and model in a block.
+            trace (dict, optional): JSONL trace to replay instead of num_requests
+                fixed prompts, e.g. {"path": "trace.jsonl", "time_scale": 1.0}.
+                Records are dispatched at their recorded offsets. Defaults to None.
+            duration_s (float, optional): Send requests to each provider and model
+                for this many seconds instead of num_requests. Defaults to None.
+            min_requests (int, optional): Requests sent within a duration_s window
+                even if the provider is slow. Defaults to None.
+            precision (dict, optional): Early stopping target, e.g.
+                {"quantile": 50, "rel_half_width": 0.05, "max_requests": 200} stops
+                once the 95% CI of the p50 is within 5%. Defaults to None.
+            connection (dict, optional): Connection handling of raw-HTTP providers,
+                e.g. {"mode": "cold", "pool_size": 10, "keep_alive": True, "http2": False}.
+                Cold, warm and HTTP/2 runs are saved to separate graph directories.
+                Defaults to None.
+            capture_headers (list, optional): Response headers kept per request, e.g.
+                ["openai-processing-ms", "x-request-id"]. Defaults to None, which
+                uses the providers' CAPTURED_HEADERS allow-list.
+            warmup (dict, optional): Unmeasured warm-up before each provider and model,
+                e.g. {"mode": "requests", "requests": 2} or {"mode": "connect"}.
+                Its samples are kept in the providers' warmup_metrics. Defaults to None.
+            calibration (dict, optional): Harness overhead calibration against a local
+                loopback server before the run, e.g. {"chunks": 20, "interval_ms": 20,
+                "ttft_ms": 100, "requests": 5, "subtract": False}. The overhead profile
+                is saved with the run and, with "subtract", taken off its samples.
+                Defaults to None.
+
+        Raises:
+            ValueError: If a scheduler plan is combined with duration_s,
+                min_requests or precision; a plan has a fixed num_requests per
+                provider and model.
         """
+        if scheduler is not None and (
+            duration_s is not None or min_requests is not None or precision is not None
+        ):
+            raise ValueError(
+                "A scheduler plan sends num_requests per provider and model; "
+                "remove duration_s, min_requests and precision."
+            )
         self.providers = providers
         self.num_requests = num_requests
         self.models = models
@@ -50,9 +125,35 @@ class Benchmark:
         self.streaming = streaming
         self.max_output = max_output
         self.verbosity = verbosity
-        self.vllm_ip = vllm_ip
+        self.concurrency = concurrency
+        self.arrival = arrival
+        self.rate_limits = rate_limits
+        self.retry = retry
+        self.parallel_providers = parallel_providers
+        self.scheduler = scheduler
+        self.trace = trace
+        self.duration_s = duration_s
+        self.min_requests = min_requests
+        self.precision = precision
+        self.connection = connection
+        if connection is not None:
+            for provider in providers:
+                if hasattr(provider, "configure_http"):
+                    provider.configure_http(**connection)
+        self.capture_headers = capture_headers
+        if capture_headers is not None:
+            for provider in providers:
+                provider.captured_headers = tuple(capture_headers)
+        self.warmup = warmup
+        self.calibration = calibration
+        self.request_plan = None
+        self.schedule_seed = None
 
         base_dir = "streaming" if streaming else "end_to_end"
+        if connection is not None:
+            base_dir = f"{base_dir}_{connection.get('mode', 'warm')}"
+            if connection.get("http2"):
+                base_dir = f"{base_dir}_http2"
 
         provider_names = sorted(
             [provider.__class__.__name__.lower() for provider in providers]
@@ -77,7 +178,7 @@ class Benchmark:
 
         for provider in self.providers:
             provider_name = provider.__class__.__name__
-            for model, latencies in provider.metrics[metric].items():
+            for model, latencies in provider.metrics.get(metric, {}).items():
                 # Convert to milliseconds and sort for CDF
                 latencies_sorted = np.sort(latencies) * 1000
                 cdf = np.arange(1, len(latencies_sorted) + 1) / len(latencies_sorted)
@@ -142,42 +243,18 @@ class Benchmark:
         Runs the benchmark for the selected providers and models, and plots the results.
 
         This method sends a number of requests to each model for each provider, collects
-        performance metrics, and generates plots based on those metrics.
+        performance metrics, and generates plots based on those metrics. Requests are
+        sent sequentially unless a concurrency level, an arrival process or a
+        trace is configured, in which case the asyncio engine sends them.
         """
-        for provider in self.providers:
-            provider_name = provider.__class__.__name__
-            # logging.debug(f"{provider_name}")
-            print(f"{provider_name}")
-            for model in self.models:
-                model_name = provider.get_model_name(model)
-                print(f"Model: {model_name}\nPrompt: {self.prompt}")
-
-                for i in range(self.num_requests):
-                    if self.verbosity:
-                        print(f"Request {i + 1}/{self.num_requests}")
-
-                    if i % 20 == 0:
-                        # print("[DEBUG] Sleeping for 2 mins to bypass rate limit...")
-                        time.sleep(120)
-
-                    if self.streaming:
-                        if provider_name == "vLLM":
-                            provider.perform_inference_streaming(
-                                model, self.prompt, self.vllm_ip, self.max_output, self.verbosity
-                            )
-                        else:
-                            provider.perform_inference_streaming(
-                                model, self.prompt, self.max_output, self.verbosity
-                            )
-                    else:
-                        if provider_name == "vLLM":
-                            provider.perform_inference(
-                                model, self.prompt, self.vllm_ip, self.max_output, self.verbosity
-                            )
-                        else:
-                            provider.perform_inference(
-                                model, self.prompt, self.max_output, self.verbosity
-                            )
+        calibration = None
+        if self.calibration is not None:
+            calibration = OverheadCalibration(self, **self.calibration)
+            calibration.calibrate()
+
+        run_benchmark_requests(self)
+        if calibration is not None and calibration.subtract:
+            calibration.subtract_overhead()
 
         if not self.streaming:
             self.plot_metrics("response_times", "response_times")
@@ -188,3 +265,14 @@ class Benchmark:
             self.plot_metrics("timebetweentokens", "timebetweentokens")
             self.plot_metrics("timebetweentokens_median", "timebetweentokens_median")
             self.plot_metrics("timebetweentokens_p95", "timebetweentokens_p95")
+        if self.arrival is not None or self.trace is not None:
+            self.plot_metrics("dispatch_lateness", "dispatch_lateness")
+        for metric in NETWORK_PHASES + SERVER_TIMING_METRICS + CHUNK_METRICS:
+            if any(provider.metrics.get(metric) for provider in self.providers):
+                self.plot_metrics(metric, metric)
+        report_throughput(self.providers, self.graph_dir)
+        report_server_timing(self.providers, self.graph_dir)
+        if self.warmup is not None:
+            report_warmup(self.providers, self.graph_dir)
+        if calibration is not None:
+            calibration.save()
@@ -0,0 +1,121 @@
+"""
+Request budgets that bound a run by a request count or a time window.
+"""
+import time
+from benchmarking.precision import PrecisionTarget
+
+
+class RequestBudget:
+    """
+    Decides whether another request may be sent to a provider and model.
+
+    Without a duration the budget is num_requests requests. With duration_s,
+    requests are issued until the time window has passed, and at least
+    min_requests of them are issued even when the provider is slow.
+
+    With a precision target the budget ends early once the target metric's
+    confidence interval is narrow enough, and otherwise at the target's
+    max_requests. The check only looks at the samples logged so far, so it
+    costs a partial sort per request.
+
+    Attributes:
+        num_requests (int): Request count used when no duration is set.
+        duration_s (float | None): Length of the time window in seconds.
+        min_requests (int): Requests issued regardless of the window.
+        issued (int): Requests issued so far.
+        deadline (float | None): perf_counter() time at which the window closes.
+        precision (PrecisionTarget | None): Target that ends the budget early.
+        samples (callable | None): Returns the precision metric's samples so far.
+        converged (bool): Whether the budget ended because the target was met.
+    """
+
+    def __init__(
+        self, num_requests, duration_s=None, min_requests=None, precision=None, samples=None
+    ):
+        """
+        Initializes the budget; the time window starts with the first take().
+
+        Args:
+            num_requests (int): Request count used when no duration is set.
+            duration_s (float, optional): Time window in seconds. Defaults to None.
+            min_requests (int, optional): Minimum requests within a time window.
+                Defaults to None (no minimum).
+            precision (PrecisionTarget, optional): Early stopping target. Defaults to None.
+            samples (callable, optional): Returns the target metric's samples;
+                required with a precision target.
+        """
+        if duration_s is not None and duration_s <= 0:
+            raise ValueError("'duration_s' must be a positive number of seconds.")
+        self.num_requests = num_requests
+        self.duration_s = duration_s
+        self.min_requests = min_requests or 0
+        self.issued = 0
+        self.deadline = None
+        self.precision = precision
+        self.samples = samples
+        self.converged = False
+        if precision is not None and precision.max_requests is not None:
+            self.num_requests = precision.max_requests
+
+    def take(self):
+        """
+        Claims the next request if the budget allows it.
+
+        Returns:
+            bool: True if the request may be sent.
+        """
+        if self.precision is not None and self.precision.reached(self.samples()):
+            self.converged = True
+            return False
+        if self.duration_s is None:
+            allowed = self.issued < self.num_requests
+        else:
+            now = time.perf_counter()
+            if self.deadline is None:
+                self.deadline = now + self.duration_s
+            allowed = now < self.deadline or self.issued < self.min_requests
+        if allowed:
+            self.issued += 1
+        return allowed
+
+    def describe(self):
+        """Returns the size of the budget for progress output."""
+        if self.duration_s is None:
+            return str(self.num_requests)
+        return f"{self.duration_s}s"
+
+
+def build_budget(benchmark, provider, model):
+    """
+    Builds the request budget of one provider and model from a Benchmark's settings.
+
+    Args:
+        benchmark: The Benchmark instance.
+        provider: The provider instance.
+        model (str): The model key.
+
+    Returns:
+        RequestBudget: The budget; its precision target only counts samples
+        logged from now on.
+    """
+    if benchmark.precision is None:
+        return RequestBudget(
+            benchmark.num_requests, benchmark.duration_s, benchmark.min_requests
+        )
+
+    precision = PrecisionTarget(**benchmark.precision)
+    metric = precision.metric or (
+        "timetofirsttoken" if benchmark.streaming else "response_times"
+    )
+    start = len(provider.metrics.get(metric, {}).get(model, []))
+
+    def samples():
+        return provider.metrics.get(metric, {}).get(model, [])[start:]
+
+    return RequestBudget(
+        benchmark.num_requests,
+        benchmark.duration_s,
+        benchmark.min_requests,
+        precision,
+        samples,
+    )
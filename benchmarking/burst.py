@@ -0,0 +1,231 @@
+"""
+Synchronized burst workload that shows how providers queue or batch a sudden spike.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+import matplotlib.pyplot as plt
+import numpy as np
+from benchmarking.engine import AsyncEngine, record_metric, use_thread_pool
+from benchmarking.rate_limiter import estimate_request_tokens, get_rate_limiter
+from benchmarking.retry import send_with_retry_async
+
+
+def burst_summary(latencies, release_starts):
+    """
+    Summarizes the latencies of one burst.
+
+    Args:
+        latencies (list): Latency of every completed request of the burst.
+        release_starts (list): perf_counter() time each request was sent at.
+
+    Returns:
+        dict: The sorted latencies, their spread (slowest minus fastest),
+        median and standard deviation, and the spread of the send times.
+    """
+    latencies = sorted(latencies)
+    return {
+        "latencies": latencies,
+        "spread": latencies[-1] - latencies[0] if latencies else None,
+        "p50": float(np.median(latencies)) if latencies else None,
+        "stdev": float(np.std(latencies)) if latencies else None,
+        "release_spread": max(release_starts) - min(release_starts),
+    }
+
+
+class BurstWorkload:
+    """
+    Fires bursts of simultaneous requests at every provider and model.
+
+    The requests of a burst are started as tasks that first pass the rate
+    limiter and then wait on a shared event, so they are released in the
+    same event-loop iteration instead of trickling out. Bursts start every
+    interval_s seconds; a burst that takes longer delays the next one, so
+    bursts never overlap.
+
+    Attributes:
+        benchmark: The Benchmark instance providing providers, models and settings.
+        size (int): Requests per burst.
+        interval_s (float): Seconds between the starts of consecutive bursts.
+        bursts (int): Bursts per provider and model.
+        results (dict): Burst summaries keyed by (provider name, model).
+    """
+
+    def __init__(self, benchmark, size=8, interval_s=10.0, bursts=5):
+        """
+        Initializes the workload.
+
+        Args:
+            benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+            size (int, optional): Requests per burst. Defaults to 8.
+            interval_s (float, optional): Seconds between bursts. Defaults to 10.
+            bursts (int, optional): Bursts per provider and model. Defaults to 5.
+        """
+        if size < 1 or bursts < 1:
+            raise ValueError("A burst workload needs at least one burst of one request.")
+        self.benchmark = benchmark
+        self.size = size
+        self.interval_s = interval_s
+        self.bursts = bursts
+        self.results = {}
+        self.engine = AsyncEngine(benchmark)
+
+    def latency_metric(self):
+        """Returns the metric whose spread is reported."""
+        return "timetofirsttoken" if self.benchmark.streaming else "response_times"
+
+    async def fire(self, provider, model, limiter):
+        """
+        Sends one burst and returns its summary.
+
+        Args:
+            provider: The provider instance.
+            model (str): The model key.
+            limiter: The provider's rate limiter.
+
+        Returns:
+            dict: The summary from burst_summary().
+        """
+        benchmark = self.benchmark
+        request_tokens = estimate_request_tokens(benchmark.prompt, benchmark.max_output)
+        metric = self.latency_metric()
+        release = asyncio.Event()
+        ready = [0]
+        starts = []
+
+        async def member():
+            await limiter.acquire_async(request_tokens)
+            ready[0] += 1
+            if ready[0] == self.size:
+                release.set()
+            await release.wait()
+            starts.append(time.perf_counter())
+            _, throttled_time = await send_with_retry_async(
+                lambda: self.engine.send_request(provider, model),
+                self.engine.retry_policy,
+                limiter,
+                request_tokens,
+            )
+            record_metric(provider, model, "throttled_time", throttled_time)
+
+        logged = len(provider.metrics.get(metric, {}).get(model, []))
+        # the last member through the rate limiter releases the whole burst
+        tasks = [asyncio.create_task(member()) for _ in range(self.size)]
+        await asyncio.gather(*tasks)
+        latencies = provider.metrics.get(metric, {}).get(model, [])[logged:]
+        return burst_summary(latencies, starts)
+
+    async def run_provider(self, provider):
+        """
+        Sends every burst to each model of one provider.
+        """
+        provider_name = provider.__class__.__name__
+        limiter = get_rate_limiter(self.benchmark.rate_limits, provider)
+        for model in self.benchmark.models:
+            results = self.results.setdefault((provider_name, model), [])
+            run_start = time.perf_counter()
+            for i in range(self.bursts):
+                delay = run_start + i * self.interval_s - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                summary = await self.fire(provider, model, limiter)
+                results.append(summary)
+                if summary["spread"] is None:
+                    print(f"{provider_name} - {model}: burst {i + 1}/{self.bursts} failed")
+                    continue
+                print(
+                    f"{provider_name} - {model}: burst {i + 1}/{self.bursts}, "
+                    f"{len(summary['latencies'])} requests, "
+                    f"{self.latency_metric()} spread {summary['spread']:.3f}s"
+                )
+
+    async def run_async(self):
+        """
+        Runs the bursts of every provider, in turn or all at once.
+        """
+        benchmark = self.benchmark
+        running = len(benchmark.providers) if benchmark.parallel_providers else 1
+        use_thread_pool(self.size * running)
+        if self.benchmark.parallel_providers:
+            await asyncio.gather(
+                *(self.run_provider(provider) for provider in self.benchmark.providers)
+            )
+            return
+        for provider in self.benchmark.providers:
+            await self.run_provider(provider)
+
+    def plot(self):
+        """
+        Saves a latency-by-rank plot of the bursts next to the benchmark's CDF plots.
+
+        The k-th fastest request of each burst is plotted against k (median over
+        all bursts, with the range as a band): a flat line means the provider
+        batched the spike, a staircase means it served it from a queue.
+        """
+        plt.figure(figsize=(8, 8))
+        for (provider_name, model), results in self.results.items():
+            bursts = [r["latencies"] for r in results if len(r["latencies"]) == self.size]
+            if not bursts:
+                continue
+            by_rank = np.array(bursts) * 1000
+            ranks = np.arange(1, self.size + 1)
+            plt.plot(
+                ranks,
+                np.median(by_rank, axis=0),
+                marker="o",
+                linestyle="-",
+                markersize=5,
+                label=f"{provider_name} - {model}",
+            )
+            plt.fill_between(ranks, by_rank.min(axis=0), by_rank.max(axis=0), alpha=0.2)
+
+        plt.xlabel("Rank within burst", fontsize=12)
+        plt.ylabel(f"{self.latency_metric()} (ms)", fontsize=12)
+        plt.grid(True)
+        plt.legend(loc="best")
+        plt.tight_layout()
+
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filepath = os.path.join(self.benchmark.graph_dir, f"burst_{current_time}.png")
+        plt.savefig(filepath)
+        plt.close()
+
+        print(f"Saved graph: {filepath}")
+
+    def save(self):
+        """Saves every burst summary as JSON."""
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filepath = os.path.join(self.benchmark.graph_dir, f"burst_{current_time}.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "size": self.size,
+                    "interval_s": self.interval_s,
+                    "metric": self.latency_metric(),
+                    "bursts": {
+                        f"{provider_name} - {model}": results
+                        for (provider_name, model), results in self.results.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+        print(f"Saved bursts: {filepath}")
+
+    def run(self):
+        """
+        Runs the bursts, plots the per-rank latencies and saves the summaries.
+
+        Returns:
+            dict: The median in-burst spread keyed by (provider name, model).
+        """
+        asyncio.run(self.run_async())
+        spreads = {}
+        for key, results in self.results.items():
+            values = [r["spread"] for r in results if r["spread"] is not None]
+            spreads[key] = float(np.median(values)) if values else None
+        self.plot()
+        self.save()
+        return spreads
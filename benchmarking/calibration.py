@@ -0,0 +1,270 @@
+"""
+Calibration of the benchmark's own latency against a local loopback server.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+import numpy as np
+from benchmarking.loopback import LoopbackServer
+from benchmarking.warmup import metric_counts
+
+# overhead in the profile -> metric it is subtracted from
+OVERHEAD_METRICS = {
+    "ttft_overhead": "timetofirsttoken",
+    "response_overhead": "response_times",
+    "chunk_overhead": "timebetweenchunks",
+}
+
+
+def pop_samples(provider, model, counts):
+    """
+    Removes and returns the samples logged since counts were taken.
+
+    Args:
+        provider: The provider instance.
+        model (str): The model key.
+        counts (dict): metric_counts() taken before the requests.
+
+    Returns:
+        dict: The new samples of every metric that got any.
+    """
+    samples = {}
+    for metric, values in provider.metrics.items():
+        logged = values.get(model)
+        start = counts.get(metric, 0)
+        if logged and len(logged) > start:
+            samples[metric] = logged[start:]
+            del logged[start:]
+    return samples
+
+
+def overhead_profile(samples, records, streaming):
+    """
+    Compares the latencies the providers measured with those the server sent.
+
+    Medians are compared, so a request that failed only shrinks the sample.
+
+    Args:
+        samples (dict): Metric samples from pop_samples().
+        records (list): LoopbackServer records of the same requests.
+        streaming (bool): Whether the streaming path was calibrated.
+
+    Returns:
+        dict: Overheads in seconds, empty if no request completed.
+    """
+    measured = samples.get("response_times")
+    if not measured or not records:
+        return {}
+    profile = {
+        "requests": len(measured),
+        "response_overhead": float(
+            np.median(measured) - np.median([r["total"] for r in records])
+        ),
+    }
+    if not streaming or not samples.get("timetofirsttoken"):
+        return profile
+    profile["ttft_overhead"] = float(
+        np.median(samples["timetofirsttoken"]) - np.median([r["first"] for r in records])
+    )
+    gaps = [r["gaps"] for r in records if r["gaps"]]
+    if gaps and samples.get("timebetweenchunks"):
+        profile["chunk_overhead"] = float(
+            np.median(samples["timebetweenchunks"]) - np.median([np.mean(g) for g in gaps])
+        )
+        profile["chunk_jitter_p95"] = float(
+            np.median(samples["timebetweenchunks_p95"])
+            - np.median([np.percentile(g, 95) for g in gaps])
+        )
+    return profile
+
+
+class OverheadCalibration:
+    """
+    Measures the latency the benchmark itself adds to every provider.
+
+    Each provider's inference path (sync or async, streaming or not, as the
+    benchmark runs it) is pointed at a LoopbackServer that sends its chunks
+    on a known schedule. Whatever the provider measures beyond what the
+    server sent is the harness's own overhead: request building, the SDK,
+    parsing and Python scheduling. Requests are sent one at a time, so the
+    profile is the noise floor of an idle client.
+
+    Attributes:
+        benchmark: The Benchmark instance whose providers are calibrated.
+        profiles (dict): {(provider name, model): overhead profile}.
+    """
+
+    def __init__(
+        self,
+        benchmark,
+        chunks=20,
+        interval_ms=20,
+        ttft_ms=100,
+        requests=5,
+        subtract=False,
+    ):
+        """
+        Initializes the calibration.
+
+        Args:
+            benchmark: The Benchmark instance whose providers are calibrated.
+            chunks (int, optional): Chunks per loopback response. Defaults to 20.
+            interval_ms (float, optional): Gap between chunks. Defaults to 20.
+            ttft_ms (float, optional): Delay before the first chunk. Defaults to 100.
+            requests (int, optional): Requests per provider and model. Defaults to 5.
+            subtract (bool, optional): Subtract the overheads from the metrics
+                of the run. Defaults to False.
+        """
+        if requests < 1:
+            raise ValueError("Calibration 'requests' must be at least 1.")
+        self.benchmark = benchmark
+        self.chunks = chunks
+        self.interval_s = interval_ms / 1000
+        self.ttft_s = ttft_ms / 1000
+        self.requests = requests
+        self.subtract = subtract
+        self.profiles = {}
+
+    def uses_engine(self):
+        """Whether the benchmark sends its requests through the asyncio engine."""
+        benchmark = self.benchmark
+        return (
+            benchmark.concurrency is not None
+            or benchmark.arrival is not None
+            or benchmark.trace is not None
+        )
+
+    def send(self, provider, model):
+        """Sends the calibration requests of one model through the benchmark's path."""
+        benchmark = self.benchmark
+        args = (model, benchmark.prompt, benchmark.max_output, False)
+        if not self.uses_engine():
+            for _ in range(self.requests):
+                if benchmark.streaming:
+                    provider.perform_inference_streaming(*args)
+                else:
+                    provider.perform_inference(*args)
+            return
+
+        async def send_async():
+            for _ in range(self.requests):
+                if benchmark.streaming:
+                    await provider.perform_inference_streaming_async(*args)
+                else:
+                    await provider.perform_inference_async(*args)
+
+        asyncio.run(send_async())
+
+    def calibrate_provider(self, provider, server):
+        """
+        Calibrates every model of one provider against the server.
+
+        The provider's own base URL is restored afterwards and the samples of
+        the calibration requests are removed from its metrics.
+
+        Returns:
+            bool: False if the provider cannot be pointed at the server.
+        """
+        provider_name = provider.__class__.__name__
+        set_base_url = getattr(provider, "set_base_url", None)
+        original = getattr(provider, "base_url", None)
+        if set_base_url is None or not set_base_url(server.base_url):
+            print(f"[INFO] {provider_name} cannot be pointed at a local server; not calibrated")
+            return False
+        try:
+            for model in self.benchmark.models:
+                counts = metric_counts(provider, model)
+                server.records.clear()
+                self.send(provider, model)
+                profile = overhead_profile(
+                    pop_samples(provider, model, counts),
+                    list(server.records),
+                    self.benchmark.streaming,
+                )
+                if profile:
+                    self.profiles[(provider_name, model)] = profile
+                else:
+                    print(f"[ERROR] Calibration of {provider_name} - {model} failed")
+        finally:
+            set_base_url(original)
+        return True
+
+    def calibrate(self):
+        """
+        Calibrates every provider of the benchmark.
+
+        Returns:
+            dict: The overhead profiles.
+        """
+        with LoopbackServer(self.ttft_s, self.interval_s, self.chunks) as server:
+            for provider in self.benchmark.providers:
+                self.calibrate_provider(provider, server)
+        for (provider_name, model), profile in self.profiles.items():
+            parts = [
+                f"{key} {profile[key] * 1000:.2f} ms"
+                for key in ("ttft_overhead", "chunk_overhead", "chunk_jitter_p95", "response_overhead")
+                if key in profile
+            ]
+            print(f"{provider_name} - {model} harness overhead: {', '.join(parts)}")
+        return self.profiles
+
+    def subtract_overhead(self):
+        """
+        Subtracts each provider's overheads from the samples of its run.
+
+        Corrected samples are floored at zero. Per-token metrics are left as
+        measured, since a chunk's overhead is not split over its tokens.
+        """
+        for provider in self.benchmark.providers:
+            provider_name = provider.__class__.__name__
+            for model in self.benchmark.models:
+                profile = self.profiles.get((provider_name, model), {})
+                for key, metric in OVERHEAD_METRICS.items():
+                    samples = provider.metrics.get(metric, {}).get(model)
+                    if key in profile and samples:
+                        samples[:] = [max(0.0, s - profile[key]) for s in samples]
+
+    def summary(self):
+        """
+        Returns the profiles by provider and model ID.
+
+        Returns:
+            dict: {provider name: {model name: overhead profile}}
+        """
+        names = {
+            provider.__class__.__name__: provider for provider in self.benchmark.providers
+        }
+        summary = {}
+        for (provider_name, model), profile in self.profiles.items():
+            model_name = names[provider_name].get_model_name(model) or model
+            summary.setdefault(provider_name, {})[model_name] = profile
+        return summary
+
+    def save(self):
+        """Saves the profiles and the loopback schedule next to the plots."""
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filepath = os.path.join(self.benchmark.graph_dir, f"calibration_{current_time}.json")
+        data = {
+            "chunks": self.chunks,
+            "interval_s": self.interval_s,
+            "ttft_s": self.ttft_s,
+            "requests": self.requests,
+            "subtracted": self.subtract,
+            "profiles": self.summary(),
+        }
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"Saved calibration: {filepath}")
+        return filepath
+
+    def run(self):
+        """
+        Calibrates the providers and saves their profiles, without the benchmark.
+
+        Returns:
+            dict: The overhead profiles.
+        """
+        self.calibrate()
+        self.save()
+        return self.profiles
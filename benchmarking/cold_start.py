@@ -0,0 +1,247 @@
+"""
+Cold-start probe that measures latency as a function of the idle time before a request.
+"""
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+import matplotlib.pyplot as plt
+import numpy as np
+from benchmarking.rate_limiter import get_rate_limiter
+from benchmarking.sequential import SequentialRunner
+
+DEFAULT_GAPS_S = [0, 30, 300, 900, 3600]
+
+
+def build_gap_schedule(gaps_s, repeats=1, seed=None):
+    """
+    Lists the idle gaps to probe, one shuffled round of all gaps per repeat.
+
+    Shuffling each round keeps the long gaps from all falling at the end of the
+    run, so time-of-day drift does not masquerade as a cold-start effect.
+
+    Args:
+        gaps_s (list): Idle gaps in seconds.
+        repeats (int, optional): Probes per gap. Defaults to 1.
+        seed (int, optional): Shuffle seed; drawn when None.
+
+    Returns:
+        tuple: The gaps in probe order and the seed used.
+    """
+    if any(gap < 0 for gap in gaps_s):
+        raise ValueError("Cold-start gaps must not be negative.")
+    if seed is None:
+        seed = secrets.randbits(32)
+    rng = np.random.default_rng(seed)
+    schedule = []
+    for _ in range(repeats):
+        schedule.extend(gaps_s[i] for i in rng.permutation(len(gaps_s)))
+    return schedule, seed
+
+
+def find_cold_start(results, penalty_ratio=1.5):
+    """
+    Finds the shortest idle gap after which latency rises above the warm baseline.
+
+    The baseline is the median latency at the shortest gap probed.
+
+    Args:
+        results (list): Probe results, each with "gap_s" and "latency" entries.
+        penalty_ratio (float, optional): Median latency relative to the baseline
+            that counts as a cold start. Defaults to 1.5.
+
+    Returns:
+        dict | None: "gap_s", "latency_p50" and "penalty_s" of the first cold
+        gap, or None if no gap is slow enough.
+    """
+    medians = gap_medians(results)
+    if not medians:
+        return None
+    gaps = sorted(medians)
+    baseline = medians[gaps[0]]
+    for gap in gaps[1:]:
+        if medians[gap] >= baseline * penalty_ratio:
+            return {
+                "gap_s": gap,
+                "latency_p50": medians[gap],
+                "penalty_s": medians[gap] - baseline,
+            }
+    return None
+
+
+def gap_medians(results):
+    """Returns the median latency per idle gap of a list of probe results."""
+    by_gap = {}
+    for result in results:
+        by_gap.setdefault(result["gap_s"], []).append(result["latency"])
+    return {gap: float(np.median(latencies)) for gap, latencies in by_gap.items()}
+
+
+class ColdStartProbe:
+    """
+    Sends single requests after controlled idle gaps to expose scale-to-zero behavior.
+
+    Every provider and model is primed with one request, then probed once per
+    entry of the gap schedule: the probe waits until the gap has passed since
+    the previous request to the pair completed, and records its latency (time
+    to first token when streaming, response time otherwise). Providers are
+    probed at the same time, each on its own timeline; the models of a
+    provider are probed one after another.
+
+    Attributes:
+        benchmark: The Benchmark instance providing providers, models and settings.
+        gaps_s (list): Idle gaps probed, in seconds.
+        repeats (int): Probes per gap.
+        penalty_ratio (float): Latency ratio to the warm baseline counted as cold.
+        schedule (list): Gaps in probe order.
+        seed (int): Seed the schedule was shuffled with.
+        results (dict): Probe results keyed by (provider name, model).
+    """
+
+    def __init__(self, benchmark, gaps_s=None, repeats=1, penalty_ratio=1.5, seed=None):
+        """
+        Initializes the probe.
+
+        Args:
+            benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+            gaps_s (list, optional): Idle gaps in seconds. Defaults to 0 s, 30 s,
+                5 min, 15 min and 1 h.
+            repeats (int, optional): Probes per gap. Defaults to 1.
+            penalty_ratio (float, optional): Cold-start threshold. Defaults to 1.5.
+            seed (int, optional): Schedule shuffle seed. Defaults to None.
+        """
+        self.benchmark = benchmark
+        self.gaps_s = sorted(DEFAULT_GAPS_S if gaps_s is None else gaps_s)
+        self.repeats = repeats
+        self.penalty_ratio = penalty_ratio
+        self.schedule, self.seed = build_gap_schedule(self.gaps_s, repeats, seed)
+        self.results = {}
+
+    def latency_metric(self):
+        """Returns the metric recorded for each probe."""
+        return "timetofirsttoken" if self.benchmark.streaming else "response_times"
+
+    def probe_provider(self, provider):
+        """
+        Runs the gap schedule against every model of one provider.
+
+        Args:
+            provider: The provider instance.
+        """
+        benchmark = self.benchmark
+        metric = self.latency_metric()
+        runner = SequentialRunner(benchmark)
+        provider_name = provider.__class__.__name__
+
+        limiter = get_rate_limiter(benchmark.rate_limits, provider)
+        for model in benchmark.models:
+            send = partial(runner.dispatch, provider, model, limiter)
+            send()
+            last_done = time.perf_counter()
+            results = self.results.setdefault((provider_name, model), [])
+            for i, gap in enumerate(self.schedule):
+                delay = last_done + gap - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                logged = len(provider.metrics.get(metric, {}).get(model, []))
+                send()
+                last_done = time.perf_counter()
+                values = provider.metrics.get(metric, {}).get(model, [])
+                if len(values) > logged:
+                    results.append({"gap_s": gap, "latency": values[-1]})
+                if benchmark.verbosity:
+                    print(f"{provider_name} - {model}: probe {i + 1}/{len(self.schedule)}")
+
+    def plot(self):
+        """
+        Saves a latency-vs-idle-gap plot next to the benchmark's CDF plots.
+        """
+        plt.figure(figsize=(8, 8))
+        for (provider_name, model), results in self.results.items():
+            medians = gap_medians(results)
+            gaps = sorted(medians)
+            plt.plot(
+                gaps,
+                [medians[gap] * 1000 for gap in gaps],
+                marker="o",
+                linestyle="-",
+                markersize=5,
+                label=f"{provider_name} - {model}",
+            )
+            cold = find_cold_start(results, self.penalty_ratio)
+            if cold is not None:
+                plt.scatter(
+                    cold["gap_s"], cold["latency_p50"] * 1000, s=150, c="red", marker="x"
+                )
+
+        plt.xlabel("Idle gap before request (s)", fontsize=12)
+        plt.ylabel(f"Median {self.latency_metric()} (ms)", fontsize=12)
+        plt.xscale("symlog", linthresh=1)
+        plt.grid(True)
+        plt.legend(loc="best")
+        plt.tight_layout()
+
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filepath = os.path.join(self.benchmark.graph_dir, f"cold_start_{current_time}.png")
+        plt.savefig(filepath)
+        plt.close()
+
+        print(f"Saved graph: {filepath}")
+
+    def save(self, cold_starts):
+        """Saves the probe results and the detected cold starts as JSON."""
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filepath = os.path.join(self.benchmark.graph_dir, f"cold_start_{current_time}.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "seed": self.seed,
+                    "penalty_ratio": self.penalty_ratio,
+                    "metric": self.latency_metric(),
+                    "providers": {
+                        f"{provider_name} - {model}": {
+                            "cold_start": cold_starts[(provider_name, model)],
+                            "probes": results,
+                        }
+                        for (provider_name, model), results in self.results.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+        print(f"Saved cold-start probes: {filepath}")
+
+    def run(self):
+        """
+        Probes every provider, reports where cold starts begin, and plots the result.
+
+        Returns:
+            dict: The cold start found (or None) keyed by (provider name, model).
+        """
+        print(f"Cold-start gap schedule seed: {self.seed}")
+        with ThreadPoolExecutor(max_workers=len(self.benchmark.providers)) as executor:
+            futures = [
+                executor.submit(self.probe_provider, provider)
+                for provider in self.benchmark.providers
+            ]
+            for future in futures:
+                future.result()
+
+        cold_starts = {}
+        for (provider_name, model), results in self.results.items():
+            cold = find_cold_start(results, self.penalty_ratio)
+            cold_starts[(provider_name, model)] = cold
+            if cold is None:
+                print(f"{provider_name} - {model}: no cold start up to {self.gaps_s[-1]}s idle")
+            else:
+                print(
+                    f"{provider_name} - {model}: cold start after {cold['gap_s']}s idle "
+                    f"(+{cold['penalty_s']:.3f}s, median {cold['latency_p50']:.3f}s)"
+                )
+
+        self.plot()
+        self.save(cold_starts)
+        return cold_starts
@@ -0,0 +1,347 @@
+"""
+Asyncio execution engine that sends benchmark requests concurrently.
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarking.arrivals import build_duration_schedule, build_schedule
+from benchmarking.budget import build_budget
+from benchmarking.rate_limiter import estimate_request_tokens, get_rate_limiter
+from benchmarking.retry import RetryPolicy, send_with_retry_async
+from benchmarking.settings import provider_setting
+from benchmarking.throughput import completed_counts, record_throughput
+from benchmarking.trace import read_trace, record_prompt, trace_schedule
+from benchmarking.warmup import warm_up_async
+
+
+def get_concurrency(concurrency, provider):
+    """
+    Resolves the concurrency level configured for a provider.
+
+    Args:
+        concurrency (int | dict | None): A single level for every provider, or a
+            mapping of provider name to level with an optional "default" entry.
+        provider: The provider instance.
+
+    Returns:
+        int: Maximum number of in-flight requests for the provider.
+    """
+    if isinstance(concurrency, dict):
+        concurrency = provider_setting(concurrency, provider, 1)
+    return max(1, int(concurrency or 1))
+
+
+def record_metric(provider, model, metric, value):
+    """
+    Appends a harness-side measurement to a provider's per-model metrics.
+
+    Unlike ProviderInterface.log_metrics, the metric is created on first use so
+    engine measurements work with any provider object exposing a metrics dict.
+    """
+    provider.metrics.setdefault(metric, {}).setdefault(model, []).append(value)
+
+
+def use_thread_pool(size):
+    """
+    Gives the running event loop a default executor with size worker threads.
+
+    Providers without an async client (Google, Bedrock) run their synchronous
+    inference through asyncio.to_thread. The loop's stock executor has only
+    min(32, cpu_count + 4) workers, which would silently cap the requests in
+    flight below the configured concurrency. Threads are started on demand,
+    and asyncio.run shuts the executor down with the loop.
+
+    Args:
+        size (int): Most requests the run keeps in flight at once.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=size))
+
+
+class AsyncEngine:
+    """
+    Runs the requests of a Benchmark on an asyncio event loop.
+
+    Each (provider, model) pair gets its own semaphore limiting the number of
+    in-flight requests to the provider's configured concurrency. Each provider
+    gets one token-bucket rate limiter, shared by all of its models, since
+    provider rate limits apply to the account rather than to one model. Providers
+    expose *_async inference methods backed by async clients; objects without
+    them fall back to their synchronous methods in a worker thread, from a
+    pool sized to the run's concurrency.
+
+    With an arrival configuration the run is open-loop: requests are started
+    on a precomputed schedule whether or not earlier ones have finished, and
+    the delay between each scheduled and actual dispatch is recorded as the
+    "dispatch_lateness" metric. A trace replay is open-loop as well, with the
+    dispatch times, prompts and output limits taken from the trace records.
+
+    Requests rejected by provider rate limits are retried with backoff; the
+    time each request spent throttled is recorded as "throttled_time",
+    separately from the latency metrics of its final attempt.
+
+    Attributes:
+        benchmark: The Benchmark instance whose providers and settings are used.
+    """
+
+    def __init__(self, benchmark):
+        """
+        Initializes the engine for a benchmark.
+
+        Args:
+            benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+        """
+        self.benchmark = benchmark
+        self.retry_policy = RetryPolicy(**(benchmark.retry or {}))
+
+    def request_args(self, provider, model, prompt=None, max_output=None):
+        """
+        Builds the positional arguments of an inference call for a provider.
+
+        The prompt and max_output default to the benchmark's own settings.
+        """
+        benchmark = self.benchmark
+        prompt = benchmark.prompt if prompt is None else prompt
+        max_output = benchmark.max_output if max_output is None else max_output
+        return (model, prompt, max_output, benchmark.verbosity)
+
+    async def send_request(self, provider, model, prompt=None, max_output=None):
+        """
+        Sends a single inference request and waits for it to complete.
+        """
+        method_name = (
+            "perform_inference_streaming"
+            if self.benchmark.streaming
+            else "perform_inference"
+        )
+        args = self.request_args(provider, model, prompt, max_output)
+        async_method = getattr(provider, f"{method_name}_async", None)
+        if async_method is not None:
+            return await async_method(*args)
+        return await asyncio.to_thread(getattr(provider, method_name), *args)
+
+    def get_semaphore(self, provider):
+        """
+        Returns the semaphore bounding in-flight requests, or None if unbounded.
+
+        Open-loop runs and trace replays are unbounded unless a concurrency
+        level is configured.
+        """
+        benchmark = self.benchmark
+        open_loop = benchmark.arrival is not None or benchmark.trace is not None
+        if open_loop and benchmark.concurrency is None:
+            return None
+        return asyncio.Semaphore(get_concurrency(benchmark.concurrency, provider))
+
+    async def dispatch(
+        self, provider, model, semaphore, limiter, scheduled=None, prompt=None, max_output=None
+    ):
+        """
+        Sends one request once the semaphore and rate limiter allow it.
+
+        Args:
+            provider: The provider instance.
+            model (str): The model key to query.
+            semaphore (asyncio.Semaphore | None): Bound on in-flight requests.
+            limiter (RateLimiter): The provider's rate limiter.
+            scheduled (float, optional): perf_counter() time the request was due,
+                used to record the dispatch lateness of open-loop runs.
+            prompt (str, optional): Prompt overriding the benchmark's.
+            max_output (int, optional): Output limit overriding the benchmark's.
+        """
+        benchmark = self.benchmark
+        request_tokens = estimate_request_tokens(
+            benchmark.prompt if prompt is None else prompt,
+            benchmark.max_output if max_output is None else max_output,
+        )
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            await limiter.acquire_async(request_tokens)
+            if scheduled is not None:
+                lateness = time.perf_counter() - scheduled
+                record_metric(provider, model, "dispatch_lateness", lateness)
+            _, throttled_time = await send_with_retry_async(
+                lambda: self.send_request(provider, model, prompt, max_output),
+                self.retry_policy,
+                limiter,
+                request_tokens,
+            )
+            record_metric(provider, model, "throttled_time", throttled_time)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    async def run_provider_model(self, provider, model, limiter):
+        """
+        Sends the requests of one model and records the rates achieved.
+
+        Closed-loop runs keep one worker per concurrency slot sending requests
+        back to back until the budget (num_requests, or the duration_s window)
+        is used up. Open-loop runs dispatch on the arrival schedule.
+
+        Args:
+            provider: The provider instance.
+            model (str): The model key to query.
+            limiter (RateLimiter): The provider's rate limiter.
+        """
+        benchmark = self.benchmark
+        await warm_up_async(self, provider, model, limiter)
+        before = completed_counts(provider, model)
+        start = time.perf_counter()
+
+        if benchmark.arrival is None:
+            budget = build_budget(benchmark, provider, model)
+
+            async def worker():
+                while budget.take():
+                    if benchmark.verbosity:
+                        print(f"Request {budget.issued}/{budget.describe()}")
+                    await self.dispatch(provider, model, None, limiter)
+
+            concurrency = get_concurrency(benchmark.concurrency, provider)
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            if budget.converged:
+                print(f"Precision target reached after {budget.issued} requests")
+        else:
+            await self.run_schedule(provider, model, limiter)
+
+        record_throughput(provider, model, before, time.perf_counter() - start)
+
+    async def run_schedule(self, provider, model, limiter):
+        """
+        Dispatches the requests of one model on the open-loop arrival schedule.
+        """
+        benchmark = self.benchmark
+        semaphore = self.get_semaphore(provider)
+        if benchmark.duration_s is None:
+            schedule = build_schedule(benchmark.arrival, benchmark.num_requests)
+        else:
+            schedule = build_duration_schedule(
+                benchmark.arrival, benchmark.duration_s, benchmark.min_requests
+            )
+
+        tasks = []
+        run_start = time.perf_counter()
+        for i, offset in enumerate(schedule):
+            scheduled = run_start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if benchmark.verbosity:
+                print(f"Request {i + 1}/{len(schedule)}")
+            tasks.append(
+                asyncio.create_task(
+                    self.dispatch(provider, model, semaphore, limiter, scheduled)
+                )
+            )
+        await asyncio.gather(*tasks)
+
+    async def run_trace(self, provider, limiter):
+        """
+        Replays the benchmark's trace against one provider at its recorded offsets.
+
+        Records are read lazily and finished requests are dropped right away, so
+        the replay uses constant memory however long the trace is. Records
+        without a model go to the benchmark's first model; records for models
+        outside the benchmark are skipped.
+
+        Args:
+            provider: The provider instance.
+            limiter (RateLimiter): The provider's rate limiter.
+        """
+        benchmark = self.benchmark
+        trace = benchmark.trace
+        semaphore = self.get_semaphore(provider)
+        pending = set()
+        skipped = 0
+        if benchmark.warmup is not None:
+            for model in benchmark.models:
+                await warm_up_async(self, provider, model, limiter)
+        run_start = time.perf_counter()
+        records = read_trace(trace["path"])
+        for i, (offset, record) in enumerate(
+            trace_schedule(records, trace.get("time_scale", 1.0))
+        ):
+            model = record.get("model", benchmark.models[0])
+            if model not in benchmark.models:
+                skipped += 1
+                continue
+            scheduled = run_start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if benchmark.verbosity:
+                print(f"Trace request {i + 1}: {model}")
+            task = asyncio.create_task(
+                self.dispatch(
+                    provider,
+                    model,
+                    semaphore,
+                    limiter,
+                    scheduled,
+                    prompt=record_prompt(record),
+                    max_output=record.get("max_output"),
+                )
+            )
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+        if skipped:
+            print(f"Skipped {skipped} trace records for models outside the benchmark.")
+
+    async def run_provider(self, provider):
+        """
+        Runs every model of one provider in turn, or replays the trace against it.
+        """
+        provider_name = provider.__class__.__name__
+        print(f"{provider_name}")
+        limiter = get_rate_limiter(self.benchmark.rate_limits, provider)
+        if self.benchmark.trace is not None:
+            await self.run_trace(provider, limiter)
+            return
+        for model in self.benchmark.models:
+            print(
+                f"Model: {provider.get_model_name(model)}, concurrency: "
+                f"{get_concurrency(self.benchmark.concurrency, provider)}"
+            )
+            await self.run_provider_model(provider, model, limiter)
+
+    def thread_pool_size(self):
+        """
+        Returns how many requests the run can keep in flight at once.
+
+        Open-loop runs without a concurrency level are unbounded, so the thread
+        pool of their synchronous providers is not capped either.
+        """
+        benchmark = self.benchmark
+        open_loop = benchmark.arrival is not None or benchmark.trace is not None
+        if open_loop and benchmark.concurrency is None:
+            return sys.maxsize
+        levels = [
+            get_concurrency(benchmark.concurrency, provider)
+            for provider in benchmark.providers
+        ]
+        return sum(levels) if benchmark.parallel_providers else max(levels)
+
+    async def run_async(self):
+        """
+        Runs every provider of the benchmark, in turn or all at once.
+
+        With parallel_providers set, the providers share the event loop and run
+        at the same time; each keeps its own concurrency and rate limits.
+        """
+        use_thread_pool(self.thread_pool_size())
+        if self.benchmark.parallel_providers:
+            await asyncio.gather(
+                *(self.run_provider(provider) for provider in self.benchmark.providers)
+            )
+            return
+        for provider in self.benchmark.providers:
+            await self.run_provider(provider)
+
+    def run(self):
+        """
+        Runs the benchmark requests on a fresh event loop.
+        """
+        asyncio.run(self.run_async())
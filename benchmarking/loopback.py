@@ -0,0 +1,223 @@
+"""
+Local stand-in server that streams chunks on an exactly known schedule.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+import numpy as np
+from benchmarking.mock_formats import response_format
+
+# requests whose timing is kept; older records are dropped
+MAX_RECORDS = 10000
+
+
+class LoopbackServer:
+    """
+    Serves the provider APIs on 127.0.0.1 from a background thread.
+
+    Every POST is answered with chunks sent ttft_s after the request was read
+    and interval_s apart, in the format of the API its path belongs to (see
+    mock_formats.response_format): OpenAI chat and completions, Anthropic
+    messages, Cloudflare ai/run or Bedrock invoke. Streamed chunks are each
+    sent as their own HTTP chunk; other requests get the whole completion
+    once the last chunk would have been sent.
+
+    The server runs in the benchmark's process, so the perf_counter() stamps
+    it records share the client's clock.
+
+    Attributes:
+        base_url (str): URL to point clients at, set once the server is started.
+        records (deque): One dict per request served, with the time from reading
+            the request to the first chunk ("first"), the gaps between chunks
+            ("gaps") and the time to the end of the response ("total"), all in
+            seconds as actually sent.
+        in_flight (int): Requests being answered.
+        served (int): Requests received since the server was created.
+    """
+
+    def __init__(self, ttft_s=0.1, interval_s=0.02, chunks=20, text=" token"):
+        """
+        Initializes the server.
+
+        Args:
+            ttft_s (float, optional): Delay before the first chunk. Defaults to 0.1.
+            interval_s (float, optional): Delay between chunks. Defaults to 0.02.
+            chunks (int, optional): Chunks per response. Defaults to 20.
+            text (str, optional): Text of every chunk. Defaults to " token".
+        """
+        if chunks < 1:
+            raise ValueError("The loopback server needs at least one chunk per response.")
+        self.ttft_s = ttft_s
+        self.interval_s = interval_s
+        self.chunks = chunks
+        self.text = text
+        self.base_url = None
+        self.records = deque(maxlen=MAX_RECORDS)
+        self.in_flight = 0
+        self.served = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self, host="127.0.0.1", port=0):
+        """
+        Starts the server in a daemon thread and waits until it listens.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to 127.0.0.1.
+            port (int, optional): Port to listen on; 0 picks a free one.
+        """
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self.handle, host, port, backlog=1024)
+            )
+            bound_port = self._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://{host}:{bound_port}/v1"
+            started.set()
+            self._loop.run_forever()
+            self._server.close()
+            # close the connections clients kept alive
+            handlers = asyncio.all_tasks(self._loop)
+            for handler in handlers:
+                handler.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*handlers, return_exceptions=True)
+            )
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        """Stops the server and its thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def draw(self, index):  # pylint: disable=unused-argument
+        """Returns the random state of the index-th request; none is needed here."""
+        return None
+
+    def first_delay(self, api, draw):  # pylint: disable=unused-argument
+        """Returns the delay before the first chunk of a response."""
+        return self.ttft_s
+
+    def gap(self, draw):  # pylint: disable=unused-argument
+        """Returns the delay before the next chunk of a response."""
+        return self.interval_s
+
+    def token_count(self, api):  # pylint: disable=unused-argument
+        """Returns the number of chunks of a response."""
+        return self.chunks
+
+    async def handle(self, reader, writer):
+        """Serves the requests of one connection until the client closes it."""
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                start = time.perf_counter()
+                lines = head.decode("latin-1").split("\r\n")
+                method, path = lines[0].split(" ")[:2]
+                headers = {
+                    key.strip().lower(): value.strip()
+                    for key, _, value in (line.partition(":") for line in lines[1:] if line)
+                }
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if method == "POST":
+                    await self.respond(writer, path, body, start)
+                else:
+                    writer.write(b"HTTP/1.1 200 OK\r\ncontent-length: 0\r\n\r\n")
+                    await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            # the client closed the connection, or the server is stopping
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, path, body, start):
+        """Answers one request in the format of its API."""
+        try:
+            request = json.loads(body)
+        except ValueError:
+            request = {}
+        api = response_format(path, request)
+        draw = self.draw(self.served)
+        self.served += 1
+        self.in_flight += 1
+        try:
+            await self.send(writer, api, draw, start)
+        finally:
+            self.in_flight -= 1
+
+    async def send(self, writer, api, draw, start):
+        """Writes the chunks of one response at their deadlines and records its timing."""
+        tokens = self.token_count(api)
+        # each deadline follows from the previous deadline, not the previous
+        # send, so a late chunk does not delay the rest
+        deadline = start + self.first_delay(api, draw)
+        sent = []
+        if api.stream:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\ncontent-type: %s\r\n"
+                b"transfer-encoding: chunked\r\n\r\n" % api.content_type.encode()
+            )
+            for i in range(tokens):
+                if i:
+                    deadline += self.gap(draw)
+                await self.sleep_until(deadline)
+                sent.append(time.perf_counter())
+                payload = api.token(self.text, i)
+                if i == 0:
+                    payload = api.start() + payload
+                writer.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+                await writer.drain()
+            self.record(start, sent)
+            end = api.end(tokens)
+            writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(end), end))
+        else:
+            for _ in range(tokens - 1):
+                deadline += self.gap(draw)
+            await self.sleep_until(deadline)
+            sent.append(time.perf_counter())
+            self.record(start, sent)
+            content_type, payload = api.complete(self.text * tokens, tokens)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\ncontent-type: %s\r\ncontent-length: %d\r\n\r\n%s"
+                % (content_type.encode(), len(payload), payload)
+            )
+        await writer.drain()
+
+    def record(self, start, sent):
+        """
+        Records the timing of a response before its end is sent, so a client
+        that has read the whole response always finds the record.
+        """
+        self.records.append(
+            {"first": sent[0] - start, "gaps": np.diff(sent).tolist(), "total": sent[-1] - start}
+        )
+
+    @staticmethod
+    async def sleep_until(deadline):
+        """Sleeps until a perf_counter() deadline."""
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
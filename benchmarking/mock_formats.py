@@ -0,0 +1,247 @@
+"""
+Wire formats of the provider APIs served by the local stand-in servers.
+
+A format is built from one request and turns the tokens of its response
+into the bytes the API sends: start() is sent with the first token, token()
+carries one token and end() closes the stream; complete() is the body of a
+non-streaming response.
+"""
+import base64
+import binascii
+import json
+import struct
+
+# input tokens counted per character of the prompt, as in estimate_request_tokens
+CHARS_PER_TOKEN = 4
+
+
+def sse(data, event=None):
+    """Encodes one server-sent event."""
+    line = b"data: " + (data if isinstance(data, bytes) else json.dumps(data).encode())
+    if event is not None:
+        line = b"event: " + event.encode() + b"\n" + line
+    return line + b"\n\n"
+
+
+class OpenAIFormat:
+    """
+    OpenAI chat completions and completions; chunks carry both "delta" and "text".
+
+    Attributes:
+        model (str): Model ID of the request.
+        stream (bool): Whether the response is streamed.
+        input_tokens (int): Prompt tokens, estimated at CHARS_PER_TOKEN.
+        max_tokens (int | None): Output token budget of the request.
+    """
+
+    content_type = "text/event-stream"
+
+    def __init__(self, request, path=""):  # pylint: disable=unused-argument
+        self.model = request.get("model") or "mock"
+        self.stream = bool(request.get("stream"))
+        self.input_tokens = len(self.prompt(request)) // CHARS_PER_TOKEN
+        self.max_tokens = request.get("max_tokens")
+
+    @staticmethod
+    def prompt(request):
+        """Returns the prompt text of a request."""
+        messages = request.get("messages") or []
+        return request.get("prompt") or "".join(
+            str(message.get("content", "")) for message in messages
+        )
+
+    def chunk(self, text, stream=True):
+        choice = {"index": 0, "text": text, "finish_reason": None if stream else "stop"}
+        if stream:
+            choice["delta"] = {"role": "assistant", "content": text}
+        else:
+            choice["message"] = {"role": "assistant", "content": text}
+        return {
+            "id": "mock",
+            "object": "chat.completion.chunk" if stream else "chat.completion",
+            "created": 0,
+            "model": self.model,
+            "choices": [choice],
+        }
+
+    def start(self):
+        return b""
+
+    def token(self, text, index):  # pylint: disable=unused-argument
+        return sse(self.chunk(text))
+
+    def end(self, output_tokens):  # pylint: disable=unused-argument
+        return sse(b"[DONE]")
+
+    def complete(self, text, output_tokens):
+        body = self.chunk(text, stream=False)
+        body["usage"] = {
+            "prompt_tokens": self.input_tokens,
+            "completion_tokens": output_tokens,
+            "total_tokens": self.input_tokens + output_tokens,
+        }
+        return "application/json", json.dumps(body).encode()
+
+
+class AnthropicFormat(OpenAIFormat):
+    """Anthropic messages API and its typed event stream."""
+
+    def message(self, content, output_tokens):
+        return {
+            "id": "msg_mock",
+            "type": "message",
+            "role": "assistant",
+            "model": self.model,
+            "content": content,
+            "stop_reason": "max_tokens" if content else None,
+            "stop_sequence": None,
+            "usage": {"input_tokens": self.input_tokens, "output_tokens": output_tokens},
+        }
+
+    def start(self):
+        return sse(
+            {"type": "message_start", "message": self.message([], 1)},
+            "message_start",
+        ) + sse(
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            },
+            "content_block_start",
+        )
+
+    def token(self, text, index):
+        return sse(
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text},
+            },
+            "content_block_delta",
+        )
+
+    def end(self, output_tokens):
+        return (
+            sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+            + sse(
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "max_tokens", "stop_sequence": None},
+                    "usage": {"output_tokens": output_tokens},
+                },
+                "message_delta",
+            )
+            + sse({"type": "message_stop"}, "message_stop")
+        )
+
+    def complete(self, text, output_tokens):
+        body = self.message([{"type": "text", "text": text}], output_tokens)
+        return "application/json", json.dumps(body).encode()
+
+
+class CloudflareFormat(OpenAIFormat):
+    """Cloudflare Workers AI ai/run, streaming {"response": ...} events."""
+
+    def token(self, text, index):
+        return sse({"response": text})
+
+    def complete(self, text, output_tokens):
+        body = {"result": {"response": text}, "success": True, "errors": [], "messages": []}
+        return "application/json", json.dumps(body).encode()
+
+
+def event_stream_message(payload, event_type="chunk"):
+    """
+    Encodes one message of the AWS event-stream binary framing.
+
+    Args:
+        payload (bytes): Message payload.
+        event_type (str, optional): Value of the :event-type header.
+
+    Returns:
+        bytes: Prelude, headers, payload and CRCs of the message.
+    """
+    headers = b""
+    for name, value in (
+        (":event-type", event_type),
+        (":content-type", "application/json"),
+        (":message-type", "event"),
+    ):
+        # header name, value type 7 (string) and value
+        headers += struct.pack("B", len(name)) + name.encode()
+        headers += struct.pack(">BH", 7, len(value)) + value.encode()
+    prelude = struct.pack(">II", 16 + len(headers) + len(payload), len(headers))
+    message = prelude + struct.pack(">I", binascii.crc32(prelude)) + headers + payload
+    return message + struct.pack(">I", binascii.crc32(message))
+
+
+class BedrockFormat(OpenAIFormat):
+    """Bedrock InvokeModel(WithResponseStream) for Meta Llama models."""
+
+    content_type = "application/vnd.amazon.eventstream"
+
+    def __init__(self, request, path=""):
+        super().__init__(request, path)
+        self.stream = path.endswith("/invoke-with-response-stream")
+        self.max_tokens = request.get("max_gen_len")
+
+    @staticmethod
+    def part(chunk):
+        """Encodes a model chunk as the base64 "bytes" payload of an event."""
+        encoded = base64.b64encode(json.dumps(chunk).encode()).decode()
+        return event_stream_message(json.dumps({"bytes": encoded}).encode())
+
+    def token(self, text, index):
+        return self.part(
+            {
+                "generation": text,
+                "prompt_token_count": None,
+                "generation_token_count": index + 1,
+                "stop_reason": None,
+            }
+        )
+
+    def end(self, output_tokens):
+        return self.part(
+            {
+                "generation": "",
+                "prompt_token_count": None,
+                "generation_token_count": output_tokens,
+                "stop_reason": "length",
+                "amazon-bedrock-invocationMetrics": {
+                    "inputTokenCount": self.input_tokens,
+                    "outputTokenCount": output_tokens,
+                },
+            }
+        )
+
+    def complete(self, text, output_tokens):
+        body = {
+            "generation": text,
+            "prompt_token_count": self.input_tokens,
+            "generation_token_count": output_tokens,
+            "stop_reason": "length",
+        }
+        return "application/json", json.dumps(body).encode()
+
+
+def response_format(path, request):
+    """
+    Picks the API format of a request from its path.
+
+    Args:
+        path (str): Request path, e.g. "/v1/messages".
+        request (dict): Decoded JSON body of the request.
+
+    Returns:
+        OpenAIFormat: The format to answer in; OpenAI's for unknown paths.
+    """
+    path = path.split("?", 1)[0]
+    if path.endswith("/messages"):
+        return AnthropicFormat(request, path)
+    if "/ai/run/" in path:
+        return CloudflareFormat(request, path)
+    if path.endswith("/invoke") or path.endswith("/invoke-with-response-stream"):
+        return BedrockFormat(request, path)
+    return OpenAIFormat(request, path)
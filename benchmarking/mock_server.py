@@ -0,0 +1,202 @@
+"""
+Deterministic local stand-in for the provider APIs, with modelled latencies.
+
+Run it on its own with
+
+    python -m benchmarking.mock_server --port 8080 --config mock.json
+
+and point providers at http://127.0.0.1:8080/v1, or set "mock_server" in a
+benchmark configuration to start one in-process for the run.
+"""
+import argparse
+import json
+import random
+from benchmarking.loopback import LoopbackServer
+
+# distribution -> parameters it needs, all in milliseconds except sigma
+DISTRIBUTIONS = {
+    "constant": ("value_ms",),
+    "normal": ("mean_ms", "std_ms"),
+    "lognormal": ("median_ms", "sigma"),
+    "exponential": ("mean_ms",),
+    "uniform": ("low_ms", "high_ms"),
+}
+
+
+def validate_distribution(spec):
+    """
+    Checks a latency distribution, e.g. {"dist": "lognormal", "median_ms": 200, "sigma": 0.3}.
+
+    Raises:
+        ValueError: For an unknown distribution or a missing parameter.
+    """
+    dist = spec.get("dist", "constant")
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(
+            f"Unknown latency distribution '{dist}'. Choose from {tuple(DISTRIBUTIONS)}."
+        )
+    missing = [param for param in DISTRIBUTIONS[dist] if param not in spec]
+    if missing:
+        raise ValueError(f"Latency distribution '{dist}' needs {missing}.")
+
+
+def sample_delay(spec, rng):
+    """
+    Draws one delay from a latency distribution.
+
+    Args:
+        spec (dict): Distribution checked by validate_distribution().
+        rng (random.Random): Random state of the request.
+
+    Returns:
+        float: The delay in seconds, never negative.
+    """
+    dist = spec.get("dist", "constant")
+    if dist == "constant":
+        delay_ms = spec["value_ms"]
+    elif dist == "normal":
+        delay_ms = rng.gauss(spec["mean_ms"], spec["std_ms"])
+    elif dist == "lognormal":
+        delay_ms = spec["median_ms"] * rng.lognormvariate(0, spec["sigma"])
+    elif dist == "exponential":
+        delay_ms = rng.expovariate(1 / spec["mean_ms"])
+    else:
+        delay_ms = rng.uniform(spec["low_ms"], spec["high_ms"])
+    return max(0.0, delay_ms) / 1000
+
+
+class MockLLMServer(LoopbackServer):
+    """
+    Stand-in server whose responses follow a simple model of an LLM server.
+
+    The time to first token is a draw from the ttft distribution plus a
+    prefill cost per prompt token, and every further token follows a draw
+    from the tbt distribution. Both are stretched by 1 + slowdown * (n - 1)
+    for n requests in flight, like a batching server whose step time grows
+    with its batch. Draws come from a random state seeded with the seed and
+    the request's index, so the same run of requests gets the same latencies.
+
+    Attributes:
+        ttft (dict): Distribution of the time to first token.
+        tbt (dict): Distribution of the time between tokens.
+        prefill_ms_per_token (float): Prefill cost per prompt token.
+        slowdown (float): Latency increase per additional request in flight.
+        output_tokens (int | None): Tokens per response; None follows each
+            request's max_tokens.
+        seed (int): Seed of the latency draws.
+    """
+
+    def __init__(
+        self,
+        ttft=None,
+        tbt=None,
+        prefill_ms_per_token=0.0,
+        slowdown=0.0,
+        output_tokens=None,
+        seed=0,
+        text=" token",
+    ):
+        """
+        Initializes the server.
+
+        Args:
+            ttft (dict, optional): Time to first token distribution, e.g.
+                {"dist": "lognormal", "median_ms": 200, "sigma": 0.3}.
+                Defaults to a constant 100 ms.
+            tbt (dict, optional): Time between tokens distribution, e.g.
+                {"dist": "normal", "mean_ms": 20, "std_ms": 2}. Defaults to a
+                constant 20 ms.
+            prefill_ms_per_token (float, optional): Added to the time to first
+                token per prompt token. Defaults to 0.
+            slowdown (float, optional): Relative latency increase per additional
+                request in flight. Defaults to 0.
+            output_tokens (int, optional): Tokens per response. Defaults to
+                each request's max_tokens, or 100 without one.
+            seed (int, optional): Seed of the latency draws. Defaults to 0.
+            text (str, optional): Text of every token. Defaults to " token".
+        """
+        super().__init__(text=text)
+        self.ttft = ttft or {"dist": "constant", "value_ms": 100}
+        self.tbt = tbt or {"dist": "constant", "value_ms": 20}
+        validate_distribution(self.ttft)
+        validate_distribution(self.tbt)
+        if prefill_ms_per_token < 0 or slowdown < 0:
+            raise ValueError("prefill_ms_per_token and slowdown must not be negative.")
+        if output_tokens is not None and output_tokens < 1:
+            raise ValueError("output_tokens must be at least 1.")
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.slowdown = slowdown
+        self.output_tokens = output_tokens
+        self.seed = seed
+
+    def draw(self, index):
+        """Returns the random state of the index-th request."""
+        return random.Random(f"{self.seed}:{index}")
+
+    def load_factor(self):
+        """Returns how much the requests in flight stretch every delay."""
+        return 1 + self.slowdown * max(0, self.in_flight - 1)
+
+    def first_delay(self, api, draw):
+        prefill = self.prefill_ms_per_token * api.input_tokens / 1000
+        return (sample_delay(self.ttft, draw) + prefill) * self.load_factor()
+
+    def gap(self, draw):
+        return sample_delay(self.tbt, draw) * self.load_factor()
+
+    def token_count(self, api):
+        return self.output_tokens or api.max_tokens or 100
+
+    def serve_forever(self, host="127.0.0.1", port=8080):
+        """Serves until interrupted."""
+        self.start(host, port)
+        print(f"Mock LLM server listening on {self.base_url}")
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+
+def use_mock_server(providers, settings):
+    """
+    Points providers at a mock server, starting one in-process unless a URL is given.
+
+    Args:
+        providers (list): Provider instances.
+        settings (dict): MockLLMServer arguments, or {"url": ...} of a running server.
+
+    Returns:
+        MockLLMServer | None: The server started, which runs until the process exits.
+    """
+    settings = dict(settings)
+    url = settings.pop("url", None)
+    server = None
+    if url is None:
+        server = MockLLMServer(**settings).start()
+        url = server.base_url
+    for provider in providers:
+        set_base_url = getattr(provider, "set_base_url", None)
+        if set_base_url is None or not set_base_url(url):
+            print(f"Warning: {provider.__class__.__name__} cannot be pointed at the mock server")
+    print(f"Providers pointed at mock server {url}")
+    return server
+
+
+def main():
+    """Runs a mock server from the command line."""
+    parser = argparse.ArgumentParser(description="Run a local mock LLM server.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--config", type=str, default=None, help="JSON file of MockLLMServer settings"
+    )
+    args = parser.parse_args()
+    settings = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            settings = json.load(f)
+    MockLLMServer(**settings).serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Confidence-interval targets for stopping a run once a metric is precise enough.
+"""
+import math
+from statistics import NormalDist
+import numpy as np
+
+
+def quantile_ci(values, q, confidence=0.95):
+    """
+    Distribution-free confidence interval of a quantile from order statistics.
+
+    The interval lies between the order statistics whose ranks are the normal
+    approximation of the binomial bounds around n * q, so only two partial
+    sorts are needed however many samples there are.
+
+    Args:
+        values (array-like): Samples.
+        q (float): Quantile between 0 and 1.
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+
+    Returns:
+        tuple | None: Lower and upper bound, or None if there are too few
+        samples for the interval to fall within the data.
+    """
+    n = len(values)
+    if n == 0:
+        return None
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    spread = z * math.sqrt(n * q * (1 - q))
+    lower = math.floor(n * q - spread)
+    upper = math.ceil(n * q + spread)
+    if lower < 0 or upper > n - 1:
+        return None
+    bounds = np.partition(np.asarray(values, dtype=float), [lower, upper])
+    return bounds[lower], bounds[upper]
+
+
+class PrecisionTarget:
+    """
+    Stops a provider and model once a quantile of a metric is known precisely enough.
+
+    Attributes:
+        metric (str | None): Metric to watch; None uses time to first token for
+            streaming runs and response time otherwise.
+        quantile (float): Percentile to estimate, e.g. 50 for the median.
+        rel_half_width (float): Target CI half-width relative to the estimate.
+        confidence (float): Confidence level of the interval.
+        min_requests (int): Requests sent before the target is checked.
+        max_requests (int | None): Cap on requests; None uses num_requests.
+    """
+
+    def __init__(
+        self,
+        metric=None,
+        quantile=50,
+        rel_half_width=0.05,
+        confidence=0.95,
+        min_requests=10,
+        max_requests=None,
+    ):
+        """
+        Initializes the target, e.g. a 95% CI of p50 within 5% of the estimate.
+
+        Args:
+            metric (str, optional): Metric to watch. Defaults to None.
+            quantile (float, optional): Percentile to estimate. Defaults to 50.
+            rel_half_width (float, optional): Relative CI half-width. Defaults to 0.05.
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+            min_requests (int, optional): Requests before checking. Defaults to 10.
+            max_requests (int, optional): Request cap. Defaults to None.
+        """
+        if not 0 < quantile < 100:
+            raise ValueError("Precision 'quantile' must be between 0 and 100.")
+        self.metric = metric
+        self.quantile = quantile
+        self.rel_half_width = rel_half_width
+        self.confidence = confidence
+        self.min_requests = min_requests
+        self.max_requests = max_requests
+
+    def relative_half_width(self, values):
+        """
+        Returns the CI half-width relative to the quantile estimate, or None if unknown.
+        """
+        interval = quantile_ci(values, self.quantile / 100, self.confidence)
+        if interval is None:
+            return None
+        estimate = np.percentile(values, self.quantile)
+        if estimate <= 0:
+            return None
+        return (interval[1] - interval[0]) / 2 / estimate
+
+    def reached(self, values):
+        """Tells whether the samples meet the target precision."""
+        if len(values) < self.min_requests:
+            return False
+        half_width = self.relative_half_width(values)
+        return half_width is not None and half_width <= self.rel_half_width
@@ -0,0 +1,171 @@
+"""
+Token-bucket rate limiting for benchmark requests.
+"""
+import asyncio
+import time
+from benchmarking.settings import provider_setting
+
+
+def estimate_request_tokens(prompt, max_output):
+    """
+    Estimates the tokens a request counts against a tokens-per-minute limit.
+
+    Uses the common ~4 characters per token approximation for the prompt plus
+    the full output budget, which is what providers reserve up front.
+    """
+    return len(prompt) // 4 + max_output
+
+
+class TokenBucket:
+    """
+    A token bucket that refills continuously at a fixed rate per minute.
+
+    Reservations are taken immediately and may drive the bucket negative; the
+    caller then waits until the refill has covered the deficit. This keeps the
+    dispatch order equal to the reservation order.
+
+    Attributes:
+        rate (float): Refill rate in units per second.
+        capacity (float): Maximum number of units the bucket holds (burst size).
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        """
+        Initializes a full bucket.
+
+        Args:
+            per_minute (float): Units allowed per minute.
+            capacity (float, optional): Burst size. Defaults to one minute's worth.
+        """
+        self.rate = per_minute / 60.0
+        self.max_rate = self.rate
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        """Adds the units accumulated since the last update."""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount=1):
+        """
+        Takes amount units from the bucket.
+
+        Returns:
+            float: Seconds to wait before the reserved units are available.
+        """
+        self.refill()
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+    def slow_down(self, factor=0.5):
+        """Cuts the refill rate after a throttled request, down to 1/16 of the limit."""
+        self.refill()
+        self.rate = max(self.rate * factor, self.max_rate / 16)
+
+    def speed_up(self, step=0.1):
+        """Raises the refill rate back towards the configured limit after a success."""
+        self.refill()
+        self.rate = min(self.max_rate, self.rate + self.max_rate * step)
+
+
+class RateLimiter:
+    """
+    Combines request and token buckets for one provider.
+
+    The limiter also adapts to throttling: a rejected request pauses all
+    dispatches for the provider's Retry-After time and halves the bucket
+    rates, which then recover step by step with every accepted request.
+
+    Attributes:
+        buckets (list): Pairs of (TokenBucket, bool) where the flag tells whether the
+            bucket counts tokens (True) or requests (False).
+        paused_until (float): time.monotonic() before which no request is dispatched.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Initializes the limiter.
+
+        Args:
+            requests_per_minute (float, optional): Request limit per minute.
+            tokens_per_minute (float, optional): Token limit per minute.
+        """
+        self.buckets = []
+        self.paused_until = 0.0
+        if requests_per_minute:
+            self.buckets.append((TokenBucket(requests_per_minute), False))
+        if tokens_per_minute:
+            self.buckets.append((TokenBucket(tokens_per_minute), True))
+
+    def reserve(self, tokens=0):
+        """
+        Reserves one request and the given number of tokens.
+
+        Returns:
+            float: Seconds to wait until every bucket allows the request.
+        """
+        delays = [
+            bucket.reserve(tokens if counts_tokens else 1)
+            for bucket, counts_tokens in self.buckets
+        ]
+        return max(delays + [self.paused_until - time.monotonic(), 0.0])
+
+    def throttle(self, delay):
+        """
+        Pauses dispatching for delay seconds and slows the buckets down.
+
+        Args:
+            delay (float): Seconds until the provider accepts requests again.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        for bucket, _ in self.buckets:
+            bucket.slow_down()
+
+    def recover(self):
+        """Speeds the buckets back up after an accepted request."""
+        for bucket, _ in self.buckets:
+            bucket.speed_up()
+
+    def acquire(self, tokens=0):
+        """Blocks until the request is allowed."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens=0):
+        """Waits on the event loop until the request is allowed."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+def get_rate_limiter(rate_limits, provider):
+    """
+    Builds the rate limiter for a provider.
+
+    Limits from the experiment config take precedence over the provider class's
+    own rate_limits declaration.
+
+    Args:
+        rate_limits (dict | None): Mapping of provider name to
+            {"requests_per_minute": ..., "tokens_per_minute": ...}.
+        provider: The provider instance.
+
+    Returns:
+        RateLimiter: The limiter; it has no buckets if the provider is not limited,
+        but still pauses dispatching when the provider throttles.
+    """
+    limits = provider_setting(rate_limits, provider)
+    if limits is None:
+        limits = getattr(provider, "rate_limits", None)
+    if not limits:
+        return RateLimiter()
+    return RateLimiter(
+        requests_per_minute=limits.get("requests_per_minute"),
+        tokens_per_minute=limits.get("tokens_per_minute"),
+    )
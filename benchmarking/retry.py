@@ -0,0 +1,107 @@
+"""
+Retry with backoff for requests rejected by provider rate limits.
+"""
+import random
+import time
+from providers.throttling import as_throttled_error
+
+
+class RetryPolicy:
+    """
+    Decides how long to back off after a throttled request.
+
+    The provider's Retry-After is honored when present; otherwise the wait is
+    exponential with full jitter.
+
+    Attributes:
+        max_retries (int): Retries per request before the sample is given up.
+        base_delay (float): Backoff in seconds for the first retry.
+        max_delay (float): Upper bound of the exponential backoff in seconds.
+    """
+
+    def __init__(self, max_retries=5, base_delay=1.0, max_delay=60.0):
+        """
+        Initializes the policy.
+
+        Args:
+            max_retries (int, optional): Retries per request. Defaults to 5.
+            base_delay (float, optional): First backoff in seconds. Defaults to 1.0.
+            max_delay (float, optional): Backoff cap in seconds. Defaults to 60.0.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Returns the seconds to wait before retry number attempt (starting at 0).
+        """
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def send_with_retry(send, policy, limiter, tokens=0):
+    """
+    Sends a request, backing off and retrying while the provider throttles it.
+
+    Args:
+        send (callable): Performs one attempt of the request.
+        policy (RetryPolicy): Backoff policy.
+        limiter (RateLimiter): The provider's limiter; it is paused and slowed
+            down on every rejection and recovers on success.
+        tokens (int, optional): Token estimate reserved for each retry.
+
+    Returns:
+        tuple: The result of send (None if retries ran out) and the seconds
+        between the first rejection and the final attempt, kept out of the
+        latency metrics.
+    """
+    throttled_since = None
+    for attempt in range(policy.max_retries + 1):
+        if attempt:
+            limiter.acquire(tokens)
+        attempt_start = time.perf_counter()
+        try:
+            result = send()
+        except Exception as exc:  # pylint: disable=broad-except
+            throttled = as_throttled_error(exc)
+            if throttled is None:
+                raise
+            throttled_since = throttled_since or time.perf_counter()
+            if attempt == policy.max_retries:
+                print(f"[ERROR] Request still throttled after {attempt} retries: {throttled}")
+                return None, time.perf_counter() - throttled_since
+            limiter.throttle(policy.backoff(attempt, throttled.retry_after))
+            continue
+        limiter.recover()
+        # the final attempt's own latency belongs to the latency metrics
+        throttled_time = 0.0 if throttled_since is None else attempt_start - throttled_since
+        return result, throttled_time
+
+
+async def send_with_retry_async(send, policy, limiter, tokens=0):
+    """
+    Async variant of send_with_retry; send is a coroutine function.
+    """
+    throttled_since = None
+    for attempt in range(policy.max_retries + 1):
+        if attempt:
+            await limiter.acquire_async(tokens)
+        attempt_start = time.perf_counter()
+        try:
+            result = await send()
+        except Exception as exc:  # pylint: disable=broad-except
+            throttled = as_throttled_error(exc)
+            if throttled is None:
+                raise
+            throttled_since = throttled_since or time.perf_counter()
+            if attempt == policy.max_retries:
+                print(f"[ERROR] Request still throttled after {attempt} retries: {throttled}")
+                return None, time.perf_counter() - throttled_since
+            limiter.throttle(policy.backoff(attempt, throttled.retry_after))
+            continue
+        limiter.recover()
+        # the final attempt's own latency belongs to the latency metrics
+        throttled_time = 0.0 if throttled_since is None else attempt_start - throttled_since
+        return result, throttled_time
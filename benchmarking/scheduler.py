@@ -0,0 +1,84 @@
+"""
+Request plans that decide the order in which benchmark requests are sent.
+"""
+import json
+import os
+import secrets
+from datetime import datetime
+import numpy as np
+
+SCHEDULER_TYPES = ("blocked", "interleaved")
+
+
+def build_request_plan(providers, models, num_requests, scheduler=None):
+    """
+    Lists every request of a run as a (provider index, model) pair in send order.
+
+    Args:
+        providers (list): Provider instances of the benchmark.
+        models (list): Model keys to query on every provider.
+        num_requests (int): Requests per provider and model.
+        scheduler (dict, optional): Scheduler configuration, e.g.
+            {"type": "interleaved", "seed": 42}. "blocked" sends all requests of a
+            provider and model before the next one; "interleaved" shuffles the
+            requests of all pairs so drift over the run affects each equally.
+            A seed is drawn when none is given. Defaults to "blocked".
+
+    Returns:
+        tuple: The plan as a list of (provider index, model) pairs, and the seed
+        used to shuffle it (None for a blocked plan).
+    """
+    scheduler = scheduler or {}
+    scheduler_type = scheduler.get("type", "blocked")
+    if scheduler_type not in SCHEDULER_TYPES:
+        raise ValueError(
+            f"Scheduler type '{scheduler_type}' is not supported. Choose from {SCHEDULER_TYPES}."
+        )
+
+    plan = [
+        (index, model)
+        for index in range(len(providers))
+        for model in models
+        for _ in range(num_requests)
+    ]
+    if scheduler_type == "blocked":
+        return plan, None
+
+    seed = scheduler.get("seed")
+    if seed is None:
+        seed = secrets.randbits(32)
+    order = np.random.default_rng(seed).permutation(len(plan))
+    return [plan[i] for i in order], seed
+
+
+def save_request_plan(graph_dir, providers, plan, seed, scheduler_type):
+    """
+    Saves a request plan and its seed next to the run's graphs so it can be replayed.
+
+    Args:
+        graph_dir (str): Directory of the run's output.
+        providers (list): Provider instances the plan indexes into.
+        plan (list): (provider index, model) pairs in send order.
+        seed (int | None): Seed the plan was shuffled with.
+        scheduler_type (str): Scheduler type that built the plan.
+
+    Returns:
+        str: Path of the written JSON file.
+    """
+    current_time = datetime.now().strftime("%y%m%d_%H%M")
+    filepath = os.path.join(graph_dir, f"request_plan_{current_time}.json")
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "scheduler": scheduler_type,
+                "seed": seed,
+                "plan": [
+                    {"provider": providers[index].__class__.__name__, "model": model}
+                    for index, model in plan
+                ],
+            },
+            f,
+            indent=2,
+        )
+    print(f"Saved request plan: {filepath}")
+    return filepath
@@ -0,0 +1,201 @@
+"""
+Sequential execution of benchmark requests, one request at a time per provider.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from benchmarking.budget import build_budget
+from benchmarking.engine import AsyncEngine, record_metric
+from benchmarking.rate_limiter import estimate_request_tokens, get_rate_limiter
+from benchmarking.retry import RetryPolicy, send_with_retry
+from benchmarking.scheduler import build_request_plan, save_request_plan
+from benchmarking.throughput import completed_counts, record_throughput
+from benchmarking.warmup import warm_up
+
+
+class SequentialRunner:
+    """
+    Sends the requests of a Benchmark one after another.
+
+    Each provider gets one rate limiter, shared by all of its models, and
+    requests wait only as long as it requires. Requests rejected by provider rate limits are
+    retried with backoff; the time each request spent throttled is recorded
+    as "throttled_time", as the AsyncEngine does.
+
+    Attributes:
+        benchmark: The Benchmark instance whose providers and settings are used.
+    """
+
+    def __init__(self, benchmark):
+        """
+        Initializes the runner for a benchmark.
+
+        Args:
+            benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+        """
+        self.benchmark = benchmark
+        self.retry_policy = RetryPolicy(**(benchmark.retry or {}))
+        self.request_tokens = estimate_request_tokens(benchmark.prompt, benchmark.max_output)
+
+    def send_request(self, provider, model):
+        """
+        Sends one request to a provider with the benchmark's settings.
+
+        Args:
+            provider: The provider instance.
+            model (str): The model key to query.
+        """
+        benchmark = self.benchmark
+        if benchmark.streaming:
+            provider.perform_inference_streaming(
+                model, benchmark.prompt, benchmark.max_output, benchmark.verbosity
+            )
+        else:
+            provider.perform_inference(
+                model, benchmark.prompt, benchmark.max_output, benchmark.verbosity
+            )
+
+    def dispatch(self, provider, model, limiter):
+        """
+        Sends one request once the rate limiter allows it, retrying while throttled.
+
+        Args:
+            provider: The provider instance.
+            model (str): The model key to query.
+            limiter (RateLimiter): The provider's rate limiter.
+        """
+        limiter.acquire(self.request_tokens)
+        _, throttled_time = send_with_retry(
+            partial(self.send_request, provider, model),
+            self.retry_policy,
+            limiter,
+            self.request_tokens,
+        )
+        record_metric(provider, model, "throttled_time", throttled_time)
+
+    def run_provider(self, provider):
+        """
+        Sends the requests for every model of one provider, one after another.
+
+        Args:
+            provider: The provider instance.
+        """
+        benchmark = self.benchmark
+        print(f"{provider.__class__.__name__}")
+        limiter = get_rate_limiter(benchmark.rate_limits, provider)
+        for model in benchmark.models:
+            print(f"Model: {provider.get_model_name(model)}\nPrompt: {benchmark.prompt}")
+            warm_up(self, provider, model, limiter)
+
+            budget = build_budget(benchmark, provider, model)
+            before = completed_counts(provider, model)
+            start = time.perf_counter()
+            while budget.take():
+                if benchmark.verbosity:
+                    print(f"Request {budget.issued}/{budget.describe()}")
+                self.dispatch(provider, model, limiter)
+            if budget.converged:
+                print(f"Precision target reached after {budget.issued} requests")
+            record_throughput(provider, model, before, time.perf_counter() - start)
+
+    def run_plan(self):
+        """
+        Sends the requests one at a time in the order of the scheduler's plan.
+
+        The plan and its seed are kept on the benchmark and saved to the graph
+        directory, so a comparison can be repeated in exactly the same order.
+        The rates of each provider and model are taken over the whole plan,
+        since their requests are spread across it.
+        """
+        benchmark = self.benchmark
+        if benchmark.parallel_providers:
+            raise ValueError("A scheduler plan is sent serially; disable parallel_providers.")
+        benchmark.request_plan, benchmark.schedule_seed = build_request_plan(
+            benchmark.providers, benchmark.models, benchmark.num_requests, benchmark.scheduler
+        )
+        save_request_plan(
+            benchmark.graph_dir,
+            benchmark.providers,
+            benchmark.request_plan,
+            benchmark.schedule_seed,
+            benchmark.scheduler.get("type", "blocked"),
+        )
+        if benchmark.schedule_seed is not None:
+            print(f"Request plan seed: {benchmark.schedule_seed}")
+
+        limiters = [
+            get_rate_limiter(benchmark.rate_limits, provider)
+            for provider in benchmark.providers
+        ]
+        if benchmark.warmup is not None:
+            for provider, limiter in zip(benchmark.providers, limiters):
+                for model in benchmark.models:
+                    warm_up(self, provider, model, limiter)
+        before = {
+            (index, model): completed_counts(provider, model)
+            for index, provider in enumerate(benchmark.providers)
+            for model in benchmark.models
+        }
+        start = time.perf_counter()
+        for i, (index, model) in enumerate(benchmark.request_plan):
+            provider = benchmark.providers[index]
+            if benchmark.verbosity:
+                print(
+                    f"Request {i + 1}/{len(benchmark.request_plan)}: "
+                    f"{provider.__class__.__name__} - {provider.get_model_name(model)}"
+                )
+            self.dispatch(provider, model, limiters[index])
+        wall_time = time.perf_counter() - start
+        for (index, model), counts in before.items():
+            record_throughput(benchmark.providers[index], model, counts, wall_time)
+
+    def run(self):
+        """
+        Sends the requests sequentially for each provider.
+
+        With parallel_providers set, every provider runs in its own worker thread
+        so the providers are measured over the same period of time, and the run
+        takes as long as the slowest provider instead of the sum of all of them.
+        Each provider logs into its own metrics, so no merging is needed.
+        With a scheduler configured, the requests follow its plan instead.
+        """
+        benchmark = self.benchmark
+        if benchmark.scheduler is not None:
+            self.run_plan()
+            return
+        if not benchmark.parallel_providers:
+            for provider in benchmark.providers:
+                self.run_provider(provider)
+            return
+
+        with ThreadPoolExecutor(max_workers=len(benchmark.providers)) as executor:
+            futures = [
+                executor.submit(self.run_provider, provider) for provider in benchmark.providers
+            ]
+            for future in futures:
+                future.result()
+
+
+def run_benchmark_requests(benchmark):
+    """
+    Sends the requests of a benchmark with the runner its settings call for.
+
+    Requests are sent sequentially unless a concurrency level, an arrival
+    process or a trace is configured, in which case the asyncio engine sends them.
+
+    Args:
+        benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+
+    Raises:
+        ValueError: If a scheduler plan is combined with the asyncio engine,
+            which cannot keep the plan's order.
+    """
+    open_loop = benchmark.arrival is not None or benchmark.trace is not None
+    if benchmark.concurrency is not None or open_loop:
+        if benchmark.scheduler is not None:
+            raise ValueError(
+                "A scheduler plan is sent serially; remove concurrency, arrival and trace."
+            )
+        AsyncEngine(benchmark).run()
+    else:
+        SequentialRunner(benchmark).run()
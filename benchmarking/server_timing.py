@@ -0,0 +1,80 @@
+"""
+Server processing time versus network and client overhead, from response headers.
+"""
+import json
+import os
+from datetime import datetime
+import numpy as np
+
+
+def server_timing_summary(providers):
+    """
+    Splits the client-side latency of every provider and model.
+
+    Only requests whose headers reported the server's processing time are
+    included; the client-side time is the response time, or the time to
+    first token of streams.
+
+    Returns:
+        dict: {provider name: {model name: {"requests": ..., "client_time_p50": ...,
+        "server_time_p50": ..., "overhead_p50": ..., "server_share": ...}}}
+    """
+    summary = {}
+    for provider in providers:
+        provider_name = provider.__class__.__name__
+        for model, records in getattr(provider, "response_headers", {}).items():
+            timed = [record for record in records if "server_time" in record]
+            if not timed:
+                continue
+            client_times = np.array([record["client_time"] for record in timed])
+            server_times = np.array([record["server_time"] for record in timed])
+            summary.setdefault(provider_name, {})[provider.get_model_name(model)] = {
+                "requests": len(timed),
+                "client_time_p50": float(np.median(client_times)),
+                "server_time_p50": float(np.median(server_times)),
+                "overhead_p50": float(np.median(client_times - server_times)),
+                "server_share": float(server_times.sum() / client_times.sum()),
+            }
+    return summary
+
+
+def report_server_timing(providers, graph_dir):
+    """
+    Prints the server/overhead split and saves it with the captured headers.
+
+    The file also holds every request's allow-listed headers, so request IDs
+    can be matched with the provider's logs. Nothing is saved when no provider
+    returned any of the headers.
+
+    Args:
+        providers (list): Provider instances of the run.
+        graph_dir (str): Directory the plots are saved in.
+
+    Returns:
+        dict: The summary from server_timing_summary().
+    """
+    requests = {
+        provider.__class__.__name__: {
+            provider.get_model_name(model): records
+            for model, records in provider.response_headers.items()
+        }
+        for provider in providers
+        if getattr(provider, "response_headers", None)
+    }
+    if not requests:
+        return {}
+
+    summary = server_timing_summary(providers)
+    for provider_name, models in summary.items():
+        for model_name, split in models.items():
+            print(
+                f"{provider_name} - {model_name}: server {split['server_time_p50']:.3f}s, "
+                f"network + client {split['overhead_p50']:.3f}s (p50 of {split['requests']})"
+            )
+
+    current_time = datetime.now().strftime("%y%m%d_%H%M")
+    filepath = os.path.join(graph_dir, f"server_timing_{current_time}.json")
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "requests": requests}, f, indent=2)
+    print(f"Saved server timing: {filepath}")
+    return summary
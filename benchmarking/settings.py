@@ -0,0 +1,27 @@
+"""
+Helpers for reading per-provider settings from an experiment config.
+"""
+
+
+def provider_setting(settings, provider, default=None):
+    """
+    Looks up the entry for a provider in a per-provider settings mapping.
+
+    Entries may be keyed by the provider's config name (e.g. "OpenAI", as used
+    in the "providers" list) or by its class name (e.g. "Open_AI"). A "default"
+    entry applies to providers without their own entry.
+
+    Args:
+        settings (dict | None): Mapping of provider name to setting.
+        provider: The provider instance.
+        default: Value returned when nothing matches.
+
+    Returns:
+        The matching setting, the "default" entry, or default.
+    """
+    if not settings:
+        return default
+    for key in (getattr(provider, "config_name", None), provider.__class__.__name__):
+        if key is not None and key in settings:
+            return settings[key]
+    return settings.get("default", default)
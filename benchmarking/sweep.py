@@ -0,0 +1,220 @@
+"""
+Stepped load sweep that locates the saturation knee of an endpoint.
+"""
+import os
+from datetime import datetime
+import matplotlib.pyplot as plt
+import numpy as np
+from benchmarking.engine import AsyncEngine
+
+SWEEP_MODES = ("concurrency", "qps")
+DEFAULT_STEPS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def find_knee(results):
+    """
+    Finds the first step where p99 latency grows faster than throughput.
+
+    A step where every request failed (no latency, or no throughput) is a
+    collapse and counts as the knee.
+
+    Args:
+        results (list): Step results ordered by load, each with "level",
+            "throughput" and "latency_p99" entries.
+
+    Returns:
+        dict | None: The step result at the knee, or None if latency never
+        outgrows throughput.
+    """
+    for i, current in enumerate(results):
+        if current["latency_p99"] is None or not current["throughput"]:
+            return current
+        previous = results[i - 1] if i else None
+        if previous is None or not previous["latency_p99"]:
+            continue
+        throughput_growth = current["throughput"] / previous["throughput"]
+        latency_growth = current["latency_p99"] / previous["latency_p99"]
+        if latency_growth > throughput_growth:
+            return current
+    return None
+
+
+def percentile(values, q):
+    """Returns the q-th percentile of values, or None when there are none."""
+    return float(np.percentile(values, q)) if len(values) else None
+
+
+class LoadSweep:
+    """
+    Raises the load on a Benchmark step by step and reports where latency collapses.
+
+    Each step runs the benchmark's providers and models through the asyncio
+    engine at a fixed concurrency (closed loop) or request rate (open-loop
+    Poisson arrivals), then summarizes only the requests of that step.
+
+    Attributes:
+        benchmark: The Benchmark instance providing providers, models and settings.
+        mode (str): "concurrency" or "qps".
+        steps (list): Load levels to run, in increasing order.
+        requests_per_step (int): Requests sent per provider and model at each step.
+        results (dict): Step results keyed by (provider name, model).
+    """
+
+    def __init__(self, benchmark, mode="concurrency", steps=None, requests_per_step=None):
+        """
+        Initializes the sweep.
+
+        Args:
+            benchmark: A Benchmark instance (benchmark_main or dynamo_bench).
+            mode (str, optional): "concurrency" or "qps". Defaults to "concurrency".
+            steps (list, optional): Load levels. Defaults to 1, 2, 4, ... 256.
+            requests_per_step (int, optional): Requests per provider and model at
+                each step. Defaults to the benchmark's num_requests.
+        """
+        if mode not in SWEEP_MODES:
+            raise ValueError(f"Sweep mode '{mode}' is not supported. Choose from {SWEEP_MODES}.")
+        self.benchmark = benchmark
+        self.mode = mode
+        self.steps = sorted(steps or DEFAULT_STEPS)
+        self.requests_per_step = requests_per_step or benchmark.num_requests
+        self.results = {}
+
+    def latency_metric(self):
+        """Returns the metric used for the latency side of the knee."""
+        return "timetofirsttoken" if self.benchmark.streaming else "response_times"
+
+    def snapshot(self):
+        """Records how many values every provider metric holds before a step."""
+        return {
+            (id(provider), metric, model): len(values)
+            for provider in self.benchmark.providers
+            for metric, per_model in provider.metrics.items()
+            for model, values in per_model.items()
+        }
+
+    def step_values(self, before, provider, metric, model):
+        """Returns the values a provider logged for a metric during the last step."""
+        values = provider.metrics.get(metric, {}).get(model, [])
+        return values[before.get((id(provider), metric, model), 0):]
+
+    def run_step(self, level):
+        """
+        Runs one load step and appends its summary to the results.
+
+        Args:
+            level (int | float): Concurrency level or request rate of the step.
+        """
+        benchmark = self.benchmark
+        benchmark.num_requests = self.requests_per_step
+        if self.mode == "concurrency":
+            benchmark.concurrency, benchmark.arrival = level, None
+        else:
+            benchmark.concurrency = None
+            benchmark.arrival = {"type": "poisson", "rate_qps": level}
+
+        before = self.snapshot()
+        AsyncEngine(benchmark).run()
+
+        for provider in benchmark.providers:
+            for model in benchmark.models:
+                completed = self.step_values(before, provider, "response_times", model)
+                # the engine logs one throttled_time per request it sent
+                sent = len(self.step_values(before, provider, "throttled_time", model))
+                # rates the engine recorded over this pair's own run
+                rates = self.step_values(
+                    before,
+                    provider,
+                    "token_throughput" if benchmark.streaming else "request_rate",
+                    model,
+                )
+                ttft = self.step_values(before, provider, "timetofirsttoken", model)
+                tbt = self.step_values(before, provider, "timebetweentokens", model)
+                latency = self.step_values(before, provider, self.latency_metric(), model)
+                result = {
+                    "level": level,
+                    "requests": sent,
+                    "error_rate": 1 - len(completed) / sent if sent else 0.0,
+                    "throughput": rates[-1] if rates else 0.0,
+                    "ttft_p50": percentile(ttft, 50),
+                    "ttft_p99": percentile(ttft, 99),
+                    "tbt_p50": percentile(tbt, 50),
+                    "tbt_p99": percentile(tbt, 99),
+                    "latency_p99": percentile(latency, 99),
+                }
+                key = (provider.__class__.__name__, model)
+                self.results.setdefault(key, []).append(result)
+                print(
+                    f"{key[0]} - {model} @ {self.mode}={level}: "
+                    f"throughput {result['throughput']:.2f}, "
+                    f"p99 latency {result['latency_p99']}, "
+                    f"error rate {result['error_rate']:.2%}"
+                )
+
+    def plot(self):
+        """
+        Saves a throughput-vs-p99-latency plot next to the benchmark's CDF plots.
+        """
+        plt.figure(figsize=(8, 8))
+        for (provider_name, model), results in self.results.items():
+            points = [r for r in results if r["latency_p99"] is not None]
+            plt.plot(
+                [r["throughput"] for r in points],
+                [r["latency_p99"] * 1000 for r in points],
+                marker="o",
+                linestyle="-",
+                markersize=5,
+                label=f"{provider_name} - {model}",
+            )
+            for r in points:
+                plt.annotate(str(r["level"]), (r["throughput"], r["latency_p99"] * 1000))
+            knee = find_knee(results)
+            if knee is not None and knee["latency_p99"] is not None:
+                plt.scatter(
+                    knee["throughput"], knee["latency_p99"] * 1000, s=150, c="red", marker="x"
+                )
+
+        unit = "output tokens/s" if self.benchmark.streaming else "requests/s"
+        plt.xlabel(f"Throughput ({unit})", fontsize=12)
+        plt.ylabel(f"p99 {self.latency_metric()} (ms)", fontsize=12)
+        plt.yscale("log")
+        plt.grid(True)
+        plt.legend(loc="best")
+        plt.tight_layout()
+
+        current_time = datetime.now().strftime("%y%m%d_%H%M")
+        filename = f"sweep_{self.mode}_{current_time}.png"
+        filepath = os.path.join(self.benchmark.graph_dir, filename)
+        plt.savefig(filepath)
+        plt.close()
+
+        print(f"Saved graph: {filepath}")
+
+    def run(self):
+        """
+        Runs every step, reports the knee per provider and model, and plots the sweep.
+
+        Returns:
+            dict: The knee step result (or None) keyed by (provider name, model).
+        """
+        for level in self.steps:
+            self.run_step(level)
+
+        knees = {}
+        for (provider_name, model), results in self.results.items():
+            knee = find_knee(results)
+            knees[(provider_name, model)] = knee
+            if knee is None:
+                print(f"{provider_name} - {model}: no knee found up to {self.steps[-1]}")
+            elif knee["latency_p99"] is None:
+                print(
+                    f"{provider_name} - {model}: knee at {self.mode}={knee['level']} "
+                    f"(every request failed)"
+                )
+            else:
+                print(
+                    f"{provider_name} - {model}: knee at {self.mode}={knee['level']} "
+                    f"(throughput {knee['throughput']:.2f}, p99 latency {knee['latency_p99']:.4f}s)"
+                )
+
+        self.plot()
+        return knees
@@ -0,0 +1,93 @@
+"""
+Achieved request rate, token throughput and transport of benchmark runs.
+"""
+import json
+import os
+from datetime import datetime
+
+
+def completed_counts(provider, model):
+    """
+    Returns how many requests and output tokens a provider has logged for a model.
+    """
+    requests = len(provider.metrics.get("response_times", {}).get(model, []))
+    tokens = sum(provider.metrics.get("totaltokens", {}).get(model, []))
+    return requests, tokens
+
+
+def record_throughput(provider, model, before, wall_time):
+    """
+    Records the rates achieved since the counts in before were taken.
+
+    Adds "request_rate" (completed requests per second) and, when the provider
+    counts output tokens, "token_throughput" (tokens per second) to the
+    provider's metrics.
+
+    Args:
+        provider: The provider instance.
+        model (str): The model key.
+        before (tuple): completed_counts() taken when the run started.
+        wall_time (float): Seconds the run took.
+    """
+    requests, tokens = completed_counts(provider, model)
+    wall_time = max(wall_time, 1e-9)
+    rates = {"request_rate": (requests - before[0]) / wall_time}
+    if tokens > before[1]:
+        rates["token_throughput"] = (tokens - before[1]) / wall_time
+    for metric, value in rates.items():
+        provider.metrics.setdefault(metric, {}).setdefault(model, []).append(value)
+
+
+def throughput_summary(providers):
+    """
+    Collects the latest achieved rates of every provider and model.
+
+    The HTTP transport each provider used is included, so runs can be compared
+    by how their streams were multiplexed.
+
+    Returns:
+        dict: {provider name: {model name: {"request_rate": ..., "token_throughput": ...,
+        "transport": ...}}}
+    """
+    summary = {}
+    for provider in providers:
+        provider_name = provider.__class__.__name__
+        for metric in ("request_rate", "token_throughput"):
+            for model, values in provider.metrics.get(metric, {}).items():
+                if values:
+                    rates = summary.setdefault(provider_name, {}).setdefault(
+                        provider.get_model_name(model), {}
+                    )
+                    rates[metric] = values[-1]
+                    if hasattr(provider, "transport"):
+                        rates["transport"] = provider.transport()
+    return summary
+
+
+def report_throughput(providers, graph_dir):
+    """
+    Prints the achieved rates and saves them next to the latency CDF plots.
+
+    Args:
+        providers (list): Provider instances of the run.
+        graph_dir (str): Directory the plots are saved in.
+
+    Returns:
+        dict: The summary from throughput_summary().
+    """
+    summary = throughput_summary(providers)
+    for provider_name, models in summary.items():
+        for model_name, rates in models.items():
+            line = f"{provider_name} - {model_name}: {rates['request_rate']:.2f} req/s"
+            if "token_throughput" in rates:
+                line += f", {rates['token_throughput']:.2f} tokens/s"
+            if "transport" in rates:
+                line += f" over {rates['transport']}"
+            print(line)
+
+    current_time = datetime.now().strftime("%y%m%d_%H%M")
+    filepath = os.path.join(graph_dir, f"throughput_{current_time}.json")
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Saved throughput: {filepath}")
+    return summary
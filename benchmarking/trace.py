@@ -0,0 +1,64 @@
+"""
+Lazy reading of JSONL request traces for replay with their original timing.
+"""
+import json
+from utils.prompt_generator import get_prompt_of_length
+
+
+def read_trace(path):
+    """
+    Yields the records of a JSONL trace one line at a time.
+
+    Each record needs a "timestamp" in seconds and either a "prompt" or an
+    "input_tokens" count; "max_output" and "model" are optional. The file is
+    never loaded as a whole, so arbitrarily large traces replay in constant memory.
+
+    Args:
+        path (str): Path of the JSONL trace file.
+
+    Yields:
+        dict: One trace record.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "timestamp" not in record or (
+                "prompt" not in record and "input_tokens" not in record
+            ):
+                raise ValueError(
+                    f"Trace record on line {line_number} needs a 'timestamp' and "
+                    "a 'prompt' or 'input_tokens'."
+                )
+            yield record
+
+
+def trace_schedule(records, time_scale=1.0):
+    """
+    Converts trace timestamps into dispatch offsets from the first record.
+
+    Args:
+        records (iterable): Trace records in timestamp order.
+        time_scale (float, optional): Replay speed; 2.0 replays the trace twice as
+            fast, 0.5 at half speed. Defaults to 1.0.
+
+    Yields:
+        tuple: The offset in seconds and the record.
+    """
+    if time_scale <= 0:
+        raise ValueError("Trace 'time_scale' must be a positive number.")
+    first = None
+    for record in records:
+        timestamp = float(record["timestamp"])
+        if first is None:
+            first = timestamp
+        yield max(0.0, timestamp - first) / time_scale, record
+
+
+def record_prompt(record):
+    """Returns the prompt of a trace record, generating one from input_tokens if needed."""
+    if "prompt" in record:
+        return record["prompt"]
+    return get_prompt_of_length(int(record["input_tokens"]))
@@ -0,0 +1,221 @@
+"""
+Unmeasured warm-up requests sent before the measured window of each provider and model.
+"""
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+
+WARMUP_MODES = ("requests", "connect")
+
+# metrics compared between the first warm-up request and the measured run
+COLD_START_METRICS = ("connection_setup", "timetofirsttoken", "response_times")
+
+
+def warmup_plan(warmup):
+    """
+    Validates a warm-up configuration.
+
+    Args:
+        warmup (dict): {"mode": "requests", "requests": 2} sends two unmeasured
+            requests; {"mode": "connect"} only opens the provider's connection.
+
+    Returns:
+        tuple: The mode and the number of warm-up requests.
+    """
+    mode = warmup.get("mode", "requests")
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown warm-up mode '{mode}'. Choose from {WARMUP_MODES}.")
+    requests = int(warmup.get("requests", 1))
+    if requests < 0:
+        raise ValueError("Warm-up 'requests' must not be negative.")
+    return mode, requests
+
+
+def logged_samples(provider):
+    """Returns the provider's metrics and its per-request header records, by name."""
+    samples = dict(provider.metrics)
+    if getattr(provider, "response_headers", None) is not None:
+        samples["response_headers"] = provider.response_headers
+    return samples
+
+
+def metric_counts(provider, model):
+    """
+    Returns how many samples of each metric a provider has logged for a model,
+    header records under "response_headers" included.
+    """
+    return {
+        metric: len(values.get(model, []))
+        for metric, values in logged_samples(provider).items()
+    }
+
+
+def warmup_bucket(provider):
+    """
+    Returns the provider's warm-up metrics, created on first use like record_metric's.
+    """
+    if not hasattr(provider, "warmup_metrics"):
+        provider.warmup_metrics = {}
+    return provider.warmup_metrics
+
+
+def move_to_warmup(provider, model, counts):
+    """
+    Moves the samples logged since counts were taken into the warm-up bucket.
+
+    The header records of the warm-up requests move too, under
+    "response_headers", so they do not count toward the server timing report.
+
+    Args:
+        provider: The provider instance.
+        model (str): The model key.
+        counts (dict): metric_counts() taken before the warm-up.
+    """
+    for metric, values in logged_samples(provider).items():
+        samples = values.get(model)
+        start = counts.get(metric, 0)
+        if samples and len(samples) > start:
+            warmup_bucket(provider).setdefault(metric, {}).setdefault(model, []).extend(
+                samples[start:]
+            )
+            del samples[start:]
+
+
+def record_connection_setup(provider, model, seconds):
+    """Adds the time a warm-up connection took to the warm-up bucket."""
+    warmup_bucket(provider).setdefault("connection_setup", {}).setdefault(
+        model, []
+    ).append(seconds)
+
+
+def warm_up(runner, provider, model, limiter):
+    """
+    Sends the warm-up of one provider and model before its measured requests.
+
+    In "connect" mode only the connection is opened; providers whose
+    connections are managed by an SDK get one request instead, which also
+    covers the SDK's lazy initialization.
+
+    Args:
+        runner: The SequentialRunner running the benchmark.
+        provider: The provider instance.
+        model (str): The model key.
+        limiter: The provider's rate limiter.
+    """
+    warmup = runner.benchmark.warmup
+    if warmup is None:
+        return
+    mode, requests = warmup_plan(warmup)
+    if mode == "connect":
+        start = time.perf_counter()
+        warm_connection = getattr(provider, "warm_connection", None)
+        if warm_connection is not None and warm_connection(model):
+            record_connection_setup(provider, model, time.perf_counter() - start)
+            return
+        requests = 1
+
+    counts = metric_counts(provider, model)
+    for _ in range(requests):
+        runner.dispatch(provider, model, limiter)
+    move_to_warmup(provider, model, counts)
+
+
+async def warm_up_async(engine, provider, model, limiter):
+    """
+    Async version of warm_up, sending the warm-up requests through the engine.
+
+    Args:
+        engine: The AsyncEngine running the benchmark.
+        provider: The provider instance.
+        model (str): The model key.
+        limiter: The provider's rate limiter.
+    """
+    warmup = engine.benchmark.warmup
+    if warmup is None:
+        return
+    mode, requests = warmup_plan(warmup)
+    if mode == "connect":
+        start = time.perf_counter()
+        warm_connection = getattr(provider, "warm_connection_async", None)
+        if warm_connection is not None and await warm_connection(model):
+            record_connection_setup(provider, model, time.perf_counter() - start)
+            return
+        requests = 1
+
+    counts = metric_counts(provider, model)
+    for _ in range(requests):
+        await engine.dispatch(provider, model, None, limiter)
+    move_to_warmup(provider, model, counts)
+
+
+def warmup_summary(providers):
+    """
+    Compares the first warm-up sample with the median of the measured run.
+
+    Returns:
+        dict: {provider name: {model name: {"<metric>_cold": ..., "<metric>_warm_p50": ...}}}
+    """
+    summary = {}
+    for provider in providers:
+        provider_name = provider.__class__.__name__
+        for metric in COLD_START_METRICS:
+            for model, samples in warmup_bucket(provider).get(metric, {}).items():
+                if not samples:
+                    continue
+                entry = summary.setdefault(provider_name, {}).setdefault(
+                    provider.get_model_name(model), {}
+                )
+                entry[f"{metric}_cold"] = samples[0]
+                measured = provider.metrics.get(metric, {}).get(model)
+                if measured:
+                    entry[f"{metric}_warm_p50"] = float(np.median(measured))
+    return summary
+
+
+def report_warmup(providers, graph_dir):
+    """
+    Prints the cold-start cost and saves the warm-up bucket next to the plots.
+
+    Nothing is saved when no warm-up ran.
+
+    Args:
+        providers (list): Provider instances of the run.
+        graph_dir (str): Directory the plots are saved in.
+
+    Returns:
+        dict: The summary from warmup_summary().
+    """
+    bucket = {
+        provider.__class__.__name__: {
+            metric: {
+                provider.get_model_name(model): samples
+                for model, samples in models.items()
+            }
+            for metric, models in warmup_bucket(provider).items()
+        }
+        for provider in providers
+        if warmup_bucket(provider)
+    }
+    if not bucket:
+        return {}
+
+    summary = warmup_summary(providers)
+    for provider_name, models in summary.items():
+        for model_name, entry in models.items():
+            parts = []
+            for metric in COLD_START_METRICS:
+                if f"{metric}_cold" in entry:
+                    part = f"{metric} {entry[f'{metric}_cold']:.3f}s cold"
+                    if f"{metric}_warm_p50" in entry:
+                        part += f" vs {entry[f'{metric}_warm_p50']:.3f}s warm p50"
+                    parts.append(part)
+            print(f"{provider_name} - {model_name} warm-up: {', '.join(parts)}")
+
+    current_time = datetime.now().strftime("%y%m%d_%H%M")
+    filepath = os.path.join(graph_dir, f"warmup_{current_time}.json")
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "warmup": bucket}, f, indent=2)
+    print(f"Saved warm-up: {filepath}")
+    return summary
@@ -3,19 +3,7 @@
 import argparse
 import json
 from dotenv import load_dotenv
-from providers import (
-    TogetherAI,
-    Cloudflare,
-    Open_AI,
-    GoogleGemini,
-    GroqProvider,
-    Anthropic,
-    PerplexityAI,
-    Hyperbolic,
-    Azure,
-    AWSBedrock,
-    vLLM
-)
+from providers.registry import get_provider, provider_names, register_endpoint
 from utils.prompt_generator import get_prompt
 
 # Load environment variables
@@ -36,6 +24,11 @@ parser.add_argument(
 parser.add_argument(
     "--vllm_ip", type=str, default=None, help="IP address of vLLM provider"
 )
+parser.add_argument(
+    "--calibrate",
+    action="store_true",
+    help="Measure the harness overhead of the configured providers against a local server",
+)
 
 # Define possible input sizes
 input_sizes = [10, 100, 1000, 10000, 100000]
@@ -45,23 +38,18 @@ OUTPUT_SIZE_UPPER_LIMIT = 5000
 OUTPUT_SIZE_LOWER_LIMIT = 100
 
 
-def get_available_providers():
-    """Returns a dictionary of available providers and their instances."""
-    available_providers = {
-        "TogetherAI": TogetherAI(),
-        "Cloudflare": Cloudflare(),
-        "OpenAI": Open_AI(),
-        "PerplexityAI": PerplexityAI(),
-        "Hyperbolic": Hyperbolic(),
-        "Google": GoogleGemini(),
-        "Anthropic": Anthropic(),
-        "Groq": GroqProvider(),
-        "Azure": Azure(),
-        "AWSBedrock": AWSBedrock(),
-        "vLLM": vLLM()
-    }
+def load_provider(provider_name):
+    """
+    Returns the provider instance for a name, or None if it cannot be constructed.
 
-    return available_providers
+    Only the selected provider's module and SDK are imported, so a missing API
+    key or package only affects that provider.
+    """
+    try:
+        return get_provider(provider_name)
+    except Exception as e:
+        print(f"Warning: Could not initialize {provider_name}: {e}")
+        return None
 
 
 # Function to load JSON configuration
@@ -85,8 +73,9 @@ def load_config(file_path):
 def display_available_providers():
     """Displays available providers and their models."""
     print("\nAvailable Providers and Models:")
-    for provider_name, provider_instance in get_available_providers().items():
+    for provider_name in provider_names():
         print(f"\n{provider_name}")
+        provider_instance = load_provider(provider_name)
         if hasattr(provider_instance, "model_map"):
             for common_name, model_name in provider_instance.model_map.items():
                 print(f"  - {common_name}: {model_name}")
@@ -100,8 +89,10 @@ def validate_providers(selected_providers):
     """Validates selected providers and returns a list of provider instances."""
     valid_providers = []
     for provider_name in selected_providers:
-        if provider_name in get_available_providers():
-            valid_providers.append(get_available_providers()[provider_name])
+        if provider_name in provider_names():
+            provider = load_provider(provider_name)
+            if provider is not None:
+                valid_providers.append(provider)
         else:
             # logging.warning(f"Warning: {provider_name} is not a valid provider name.")
             print(f"Warning: {provider_name} is not a valid provider name.")
@@ -148,8 +139,12 @@ def validate_selected_models(selected_models, common_models, selected_providers)
 
 
 # Main function to run the benchmark
-def run_benchmark(config, vllm_ip=None):
-    """Runs the benchmark based on the given configuration."""
+def run_benchmark(config, vllm_ip=None, calibrate=False):
+    """
+    Runs the benchmark based on the given configuration.
+
+    With calibrate set, only the harness overhead of the providers is measured.
+    """
     providers = config.get("providers", [])
     num_requests = config.get("num_requests", 1)
     models = config.get("models", [])
@@ -160,13 +155,40 @@ def run_benchmark(config, vllm_ip=None):
     # max_output = config.get("max_output", [100])
     verbose = config.get("verbose", False)
     backend = config.get("backend", False)
+    concurrency = config.get("concurrency", None)
+    arrival = config.get("arrival", None)
+    sweep = config.get("sweep", None)
+    cold_start = config.get("cold_start", None)
+    burst = config.get("burst", None)
+    rate_limits = config.get("rate_limits", None)
+    retry = config.get("retry", None)
+    parallel_providers = config.get("parallel_providers", False)
+    scheduler = config.get("scheduler", None)
+    trace = config.get("trace", None)
+    duration_s = config.get("duration_s", None)
+    min_requests = config.get("min_requests", None)
+    precision = config.get("precision", None)
+    connection = config.get("connection", None)
+    capture_headers = config.get("capture_headers", None)
+    warmup = config.get("warmup", None)
+    calibration = config.get("calibration", None)
+    mock_server = config.get("mock_server", None)
     # Select Benchmark class based on backend flag
     if backend:
         from benchmarking.dynamo_bench import Benchmark
     else:
         from benchmarking.benchmark_main import Benchmark
     # Validate and initialize providers
+    for name, settings in config.get("endpoints", {}).items():
+        register_endpoint(name, settings)
     selected_providers = validate_providers(providers)
+    for provider in selected_providers:
+        if vllm_ip and hasattr(provider, "set_host"):
+            provider.set_host(vllm_ip)
+    if mock_server is not None:
+        from benchmarking.mock_server import use_mock_server
+
+        use_mock_server(selected_providers, mock_server)
     print(
         f"Selected Providers: {[provider.__class__.__name__ for provider in selected_providers]}"
     )
@@ -216,9 +238,55 @@ def run_benchmark(config, vllm_ip=None):
         prompt=prompt,
         streaming=streaming,
         verbosity=verbose,
-        vllm_ip=vllm_ip,
+        concurrency=concurrency,
+        arrival=arrival,
+        rate_limits=rate_limits,
+        retry=retry,
+        parallel_providers=parallel_providers,
+        scheduler=scheduler,
+        trace=trace,
+        duration_s=duration_s,
+        min_requests=min_requests,
+        precision=precision,
+        connection=connection,
+        capture_headers=capture_headers,
+        warmup=warmup,
+        calibration=None if calibrate else calibration,
     )
-    benchmark.run()
+    if calibrate:
+        from benchmarking.calibration import OverheadCalibration
+
+        OverheadCalibration(benchmark, **(calibration or {})).run()
+    elif sweep:
+        from benchmarking.sweep import LoadSweep
+
+        LoadSweep(
+            benchmark,
+            mode=sweep.get("mode", "concurrency"),
+            steps=sweep.get("steps"),
+            requests_per_step=sweep.get("requests_per_step"),
+        ).run()
+    elif cold_start:
+        from benchmarking.cold_start import ColdStartProbe
+
+        ColdStartProbe(
+            benchmark,
+            gaps_s=cold_start.get("gaps_s"),
+            repeats=cold_start.get("repeats", 1),
+            penalty_ratio=cold_start.get("penalty_ratio", 1.5),
+            seed=cold_start.get("seed"),
+        ).run()
+    elif burst:
+        from benchmarking.burst import BurstWorkload
+
+        BurstWorkload(
+            benchmark,
+            size=burst.get("size", 8),
+            interval_s=burst.get("interval_s", 10.0),
+            bursts=burst.get("bursts", 5),
+        ).run()
+    else:
+        benchmark.run()
 
 
 def main():
@@ -231,12 +299,17 @@ def main():
     elif args.config:
         config = load_config(args.config)
         if config:
-            if "vLLM" in config.get("providers", []) and not vllm_ip:
+            if (
+                "vLLM" in config.get("providers", [])
+                and "vLLM" not in config.get("endpoints", {})
+                and not vllm_ip
+            ):
                 print("\n[ERROR] vLLM provider is selected, but `vllm_ip` is missing!")
-                print("   ➜ Please add `vllm_ip' via CLI using `--vllm_ip <ip-addr>`.")
+                print("   ➜ Please add `vllm_ip' via CLI using `--vllm_ip <ip-addr>`,")
+                print("     or define a `vLLM` entry with a `base_url` under `endpoints`.")
                 return  # Stop execution
         
-            run_benchmark(config, vllm_ip)
+            run_benchmark(config, vllm_ip, args.calibrate)
     else:
         parser.print_help()
 
@@ -1,17 +1,31 @@
 # providers/__init__.py
-from .base_provider import BaseProvider
-from .perplexity_ai_provider import PerplexityAI
-from .open_ai_provider import Open_AI
-from .cloudflare_provider import Cloudflare
-from .together_ai_provider import TogetherAI
-from .provider_interface import ProviderInterface
-from .anthropic_provider import Anthropic
-from .groq_provider import GroqProvider
-from .hyperbolic_provider import Hyperbolic
-from .google_provider import GoogleGemini
-from .azure_provider import Azure
-from .aws_provider import AWSBedrock
-from .vllm_provider import vLLM
+from importlib import import_module
+from .throttling import ThrottledError
+
+# provider modules import their SDKs, so they are only imported when accessed
+_LAZY_IMPORTS = {
+    "BaseProvider": ".base_provider",
+    "PerplexityAI": ".perplexity_ai_provider",
+    "Open_AI": ".open_ai_provider",
+    "Cloudflare": ".cloudflare_provider",
+    "TogetherAI": ".together_ai_provider",
+    "ProviderInterface": ".provider_interface",
+    "Anthropic": ".anthropic_provider",
+    "GroqProvider": ".groq_provider",
+    "Hyperbolic": ".hyperbolic_provider",
+    "GoogleGemini": ".google_provider",
+    "Azure": ".azure_provider",
+    "AWSBedrock": ".aws_provider",
+    "vLLM": ".vllm_provider",
+    "OpenAICompatible": ".openai_compatible_provider",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseProvider",
@@ -26,5 +40,7 @@ __all__ = [
     "GoogleGemini",
     "Azure",
     "AWSBedrock",
-    "vLLM"
+    "vLLM",
+    "OpenAICompatible",
+    "ThrottledError",
 ]
@@ -1,8 +1,8 @@
 # anthropic_provider.py
 import os
 import anthropic
-import numpy as np
 from timeit import default_timer as timer
+from providers.stream_capture import StreamCapture
 from providers.provider_interface import ProviderInterface
 
 
@@ -19,7 +19,7 @@ class Anthropic(ProviderInterface):
             raise ValueError("API key must be provided as an environment variable.")
 
         # Initialize the Anthropic client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.set_base_url(None)
 
         # Model mapping for Anthropic models
         self.model_map = {
@@ -59,7 +59,8 @@ class Anthropic(ProviderInterface):
                 raise ValueError(f"Model {model} not available for Anthropic.")
 
             start = timer()
-            response = self.client.messages.create(
+            response, headers = self.create_with_headers(
+                self.client.messages,
                 model=model_id,
                 max_tokens=max_output,
                 messages=[{"role": "user", "content": prompt}],
@@ -69,12 +70,14 @@ class Anthropic(ProviderInterface):
             )
             elapsed = timer() - start
             self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, headers, elapsed)
             # Process and display the response
             if verbosity:
                 self.display_response(response, elapsed)
             return elapsed
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed for model '{model}': {e}")
             return None, None
 
@@ -93,8 +96,8 @@ class Anthropic(ProviderInterface):
             if model_id is None:
                 raise ValueError(f"Model {model} not available for Anthropic.")
 
-            first_token_time = None
-            inter_token_latencies = []
+            capture = StreamCapture(timer, 1)
+            add = capture.add
 
             start = timer()
             with self.client.messages.stream(
@@ -106,53 +109,146 @@ class Anthropic(ProviderInterface):
                 timeout=500,
             ) as stream:
                 for chunk in stream.text_stream:
-                    if first_token_time is None:
-                        first_token_time = timer()
-                        TTFT = first_token_time - start
-                        prev_token_time = first_token_time
-                        self.log_metrics(model, "timetofirsttoken", TTFT)
-                        if verbosity:
-                            print(f"\nTime to First Token (TTFT): {TTFT:.4f} seconds\n")
-
-                    # Calculate inter-token latencies
-                    time_to_next_token = timer()
-                    inter_token_latency = time_to_next_token - prev_token_time
-                    prev_token_time = time_to_next_token
-
-                    inter_token_latencies.append(inter_token_latency)
-                    if verbosity:
-                        if len(inter_token_latencies) < 20:
-                            print(chunk, end="", flush=True)
-                        elif len(inter_token_latencies) == 20:
-                            print("...")
-
+                    add(chunk)
                 elapsed = timer() - start
-                if verbosity:
-                    print(f"\nTotal Response Time: {elapsed:.4f} seconds")
-                    print(f"Total tokens: {len(inter_token_latencies)}")
-                    # print(
-                    #     f"\nNumber of output tokens/chunks: {len(inter_token_latencies) + 1}, Avg TBT: {avg_tbt:.4f}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {elapsed:.4f} seconds"
-                    # )
+                message = stream.get_final_message()
 
-            # Log remaining metrics
-            # avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-            avg_tbt = sum(inter_token_latencies) / max_output
+            self.finish_stream(model, capture, start, elapsed, stream, message, verbosity)
 
-            self.log_metrics(model, "response_times", elapsed)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-            self.log_metrics(model, "totaltokens", len(inter_token_latencies) + 1)
-            self.log_metrics(model, "tps", (len(inter_token_latencies) + 1) / elapsed)
-            self.log_metrics(
-                model, "timebetweentokens_median", np.percentile(inter_token_latencies, 50)
-            )
-            self.log_metrics(
-                model, "timebetweentokens_p95", np.percentile(inter_token_latencies, 95)
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
+            return None, None
+            
+    def set_base_url(self, base_url):
+        """
+        Recreates the client for another base URL; None uses the API's.
+        """
+        self.base_url = base_url
+        # no SDK retries, so throttles reach the benchmark's retry layer
+        self.client = anthropic.Anthropic(
+            api_key=self.api_key, base_url=base_url, max_retries=0
+        )
+        self._async_client = None
+        return True
+
+    def create_async_client(self):
+        kwargs = {"api_key": self.api_key, "base_url": self.base_url, "max_retries": 0}
+        if self.http2:
+            kwargs["http_client"] = self.create_http_client()
+        return anthropic.AsyncAnthropic(**kwargs)
+
+    async def perform_inference_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        """
+        Performs an asynchronous inference call to the Anthropic API.
+
+        Args:
+            model (str): The model name to use for inference.
+            prompt (str): The user prompt for the chat completion.
+
+        Returns:
+            float: The elapsed time in seconds for the inference request.
+        """
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                raise ValueError(f"Model {model} not available for Anthropic.")
+            client = self.get_async_client()
+
+            start = timer()
+            response, headers = await self.create_with_headers_async(
+                client.messages,
+                model=model_id,
+                max_tokens=max_output,
+                messages=[{"role": "user", "content": prompt}],
+                stop_sequences=["\nUser:"],
+                timeout=500,
             )
+            elapsed = timer() - start
+            self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, headers, elapsed)
+            if verbosity:
+                self.display_response(response, elapsed)
+            return elapsed
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Inference failed for model '{model}': {e}")
+            return None, None
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        """
+        Performs an asynchronous streaming inference call to the Anthropic API.
+
+        Args:
+            model (str): The model name to use for inference.
+            prompt (str): The user prompt for the chat completion.
+        """
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                raise ValueError(f"Model {model} not available for Anthropic.")
+            client = self.get_async_client()
+
+            capture = StreamCapture(timer, 1)
+            add = capture.add
+
+            start = timer()
+            async with client.messages.stream(
+                model=model_id,
+                max_tokens=max_output,
+                messages=[{"role": "user", "content": prompt}],
+                stop_sequences=["\nUser:"],
+                timeout=500,
+            ) as stream:
+                async for chunk in stream.text_stream:
+                    add(chunk)
+                elapsed = timer() - start
+                message = await stream.get_final_message()
+
+            self.finish_stream(model, capture, start, elapsed, stream, message, verbosity)
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
             return None, None
-            
+
+    def finish_stream(self, model, capture, start, elapsed, stream, message, verbosity):
+        """
+        Logs the metrics of a closed message stream and prints its text.
+
+        Args:
+            model (str): The model alias the request was sent to.
+            capture (StreamCapture): The text chunks of the stream.
+            start (float): timer() value taken when the request was sent.
+            elapsed (float): Total response time in seconds.
+            stream: The SDK's message stream, whose response headers are kept.
+            message: The stream's final message, whose usage reports the
+                output tokens generated.
+            verbosity (bool): Whether to print the response.
+        """
+        ttft, inter_token_latencies, _ = capture.timings(start)
+        chunk_texts = capture.captured()
+        if verbosity:
+            print(f"\nTime to First Token (TTFT): {ttft:.4f} seconds\n")
+            print("".join(chunk_texts))
+            print(f"\nTotal Response Time: {elapsed:.4f} seconds")
+            print(f"Total chunks: {len(chunk_texts)}")
+        reported = getattr(getattr(message, "usage", None), "output_tokens", None)
+        self.log_streaming_metrics(
+            model,
+            ttft,
+            elapsed,
+            inter_token_latencies,
+            reported if isinstance(reported, int) else None,
+            chunk_texts=chunk_texts,
+        )
+        self.log_response_headers(model, stream.response.headers, ttft)
+
     def display_response(self, response, elapsed):
         """
         Prints the response content and the time taken to generate it.
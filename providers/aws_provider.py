@@ -2,9 +2,9 @@ import boto3
 import os
 import time
 import json
-import numpy as np
 from dotenv import load_dotenv
 from providers.provider_interface import ProviderInterface
+from providers.stream_capture import StreamCapture
 
 
 class AWSBedrock(ProviderInterface):
@@ -15,12 +15,7 @@ class AWSBedrock(ProviderInterface):
         load_dotenv()
         super().__init__()
 
-        self.bedrock_client = boto3.client(
-            "bedrock-runtime",
-            aws_access_key_id=os.getenv("AWS_BEDROCK_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_BEDROCK_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_BEDROCK_REGION"),
-        )
+        self.set_base_url(None)
 
         # model names
         self.model_map = {
@@ -31,6 +26,20 @@ class AWSBedrock(ProviderInterface):
     def get_model_name(self, model):
         return self.model_map.get(model, None)  # or model
 
+    def set_base_url(self, base_url):
+        """
+        Recreates the Bedrock client for another endpoint; None uses the region's.
+        """
+        self.base_url = base_url
+        self.bedrock_client = boto3.client(
+            "bedrock-runtime",
+            aws_access_key_id=os.getenv("AWS_BEDROCK_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_BEDROCK_SECRET_ACCESS_KEY"),
+            region_name=os.getenv("AWS_BEDROCK_REGION"),
+            endpoint_url=base_url,
+        )
+        return True
+
     def format_prompt(self, user_prompt):
         """
         Combines the system prompt and user prompt into a single formatted prompt.
@@ -68,6 +77,9 @@ class AWSBedrock(ProviderInterface):
             end_time = time.perf_counter()
             total_time = end_time - start_time
             self.log_metrics(model, "response_times", total_time)
+            self.log_response_headers(
+                model, response["ResponseMetadata"]["HTTPHeaders"], total_time
+            )
 
             model_response = json.loads(response["body"].read())
             generated_text = model_response.get("generation", "")
@@ -80,6 +92,7 @@ class AWSBedrock(ProviderInterface):
             return generated_text, total_time
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed: {e}")
             return None, None
 
@@ -102,79 +115,58 @@ class AWSBedrock(ProviderInterface):
         }
         request_body = json.dumps(native_request)
 
-        inter_token_latencies = []
-        first_token_time = None
-        ttft = None
+        capture = StreamCapture(time.perf_counter, 1)
+        add = capture.add
         start_time = time.perf_counter()
         try:
             streaming_response = self.bedrock_client.invoke_model_with_response_stream(
                 modelId=model_id, body=request_body
             )
 
-            # Process the streaming response
+            # Capture the streaming response; events are decoded once it has ended
             for event in streaming_response["body"]:
-                if event:
-                    try:
-                        # print(f"[DEBUG] {event}")
-                        chunk = json.loads(event["chunk"]["bytes"].decode("utf-8"))
-                        # print(chunk)
-                    except Exception:
-                        # print(f"[DEBUG] Failed to decode chunk: {e}")
-                        continue
-                    
-                    if chunk["stop_reason"] == 'length':
-                        total_time = time.perf_counter() - start_time
-                        print(chunk)
-                        break
-
-                    if "generation" in chunk:
-                        current_token = chunk["generation"]
-
-                        # Calculate timing
-                        current_time = time.perf_counter()
-                        if first_token_time is None:
-                            first_token_time = current_time
-                            ttft = first_token_time - start_time
-                            prev_token_time = first_token_time
-                            print(
-                                f"\n##### Time to First Token (TTFT): {ttft:.4f} seconds"
-                            )
-                            continue
-
-                        # Capture token timing
-                        time_to_next_token = time.perf_counter()
-                        inter_token_latency = time_to_next_token - prev_token_time
-                        prev_token_time = time_to_next_token
-                        inter_token_latencies.append(inter_token_latency)
-                        if verbosity:
-                            if len(inter_token_latencies) < 20:
-                                print(current_token, end="")  # Print the token
-                            elif len(inter_token_latencies) == 21:
-                                print("...")
-
-            # Measure total response time
+                add(event)
             total_time = time.perf_counter() - start_time
+
+            capture_times = []
+            chunk_texts = []
+            output_tokens = None
+            for stamp, event in capture:
+                try:
+                    chunk = json.loads(event["chunk"]["bytes"].decode("utf-8"))
+                except Exception:
+                    continue
+                # the last chunk reports the output tokens of the response
+                metrics = chunk.get("amazon-bedrock-invocationMetrics")
+                if metrics:
+                    output_tokens = metrics.get("outputTokenCount")
+                if chunk.get("generation"):
+                    capture_times.append(stamp)
+                    chunk_texts.append(chunk["generation"])
+
+            ttft = capture_times[0] - start_time
+            inter_token_latencies = [b - a for a, b in zip(capture_times, capture_times[1:])]
             if verbosity:
+                print(f"\n##### Time to First Token (TTFT): {ttft:.4f} seconds")
+                print("".join(chunk_texts))
                 print(f"\n##### Total Response Time: {total_time:.4f} seconds")
-                print(f"##### Tokens: {len(inter_token_latencies)}")
-                avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-                median = np.percentile(inter_token_latencies, 50)
-                p95 = np.percentile(inter_token_latencies, 95)
-                print("[INFO] avg_tbt - ", avg_tbt, median, p95)
-            self.log_metrics(model, "timetofirsttoken", ttft)
-            self.log_metrics(model, "response_times", total_time)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-            # print(median, p95)
-            self.log_metrics(model, "timebetweentokens_median", median)
-            self.log_metrics(model, "timebetweentokens_p95", p95)
-            self.log_metrics(model, "totaltokens", len(inter_token_latencies) + 1)
-            self.log_metrics(
-                model, "tps", (len(inter_token_latencies) + 1) / total_time
+                print(f"##### Chunks: {len(chunk_texts)}")
+            self.log_streaming_metrics(
+                model,
+                ttft,
+                total_time,
+                inter_token_latencies,
+                output_tokens,
+                chunk_texts=chunk_texts,
+            )
+            self.log_response_headers(
+                model, streaming_response["ResponseMetadata"]["HTTPHeaders"], ttft
             )
 
             return total_time, inter_token_latencies
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed: {e}")
             return None, None
 
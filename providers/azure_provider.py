@@ -1,15 +1,18 @@
 import os
-import requests
-import numpy as np
 from providers.base_provider import ProviderInterface
-from time import perf_counter as timer
-import re
+from time import perf_counter as timer, perf_counter_ns
+from providers.network_timing import PhaseTimer
+from providers.sse import SSEParser
+from providers.stream_capture import StreamCapture
 
 
 class Azure(ProviderInterface):
     def __init__(self):
         """Initialize AzureProvider with required API information."""
         super().__init__()
+        # pooled session, so connections are reused across requests
+        self.session = self.create_session()
+        self.base_url = None
 
         # Map model names to Azure model IDs
         self.model_map = {
@@ -33,6 +36,24 @@ class Azure(ProviderInterface):
         """Retrieve the model name based on the input key."""
         return self.model_map.get(model, None)
 
+    def connection_url(self, model):
+        """Each Azure model is served from its own endpoint host."""
+        model_id = self.get_model_name(model)
+        if model_id is None:
+            return None
+        return self.base_url or f"https://{model_id}.eastus.models.ai.azure.com/"
+
+    def set_base_url(self, base_url):
+        """Serves every model from one server; None uses each model's Azure host."""
+        self.base_url = base_url.rstrip("/") if base_url else None
+        return True
+
+    def endpoint(self, model_id):
+        """Returns the chat completions URL of a model."""
+        if self.base_url:
+            return f"{self.base_url}/chat/completions"
+        return f"https://{model_id}.eastus.models.ai.azure.com/chat/completions"
+
     def get_model_api_key(self, model):
         """Retrieve the API key for a specific model."""
         api_key = self.model_api_keys.get(model)
@@ -51,9 +72,133 @@ class Azure(ProviderInterface):
                 print(f"Model {model} not available.")
                 return None
             start_time = timer()
-            endpoint = f"https://{model_id}.eastus.models.ai.azure.com/chat/completions"
-            response = requests.post(
-                f"{endpoint}",
+            endpoint = self.endpoint(model_id)
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    f"{endpoint}",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "messages": [
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt},
+                        ],
+                        "max_tokens": max_output,
+                    },
+                    timeout=500,
+                )
+            self.check_throttled(response)
+            elapsed = timer() - start_time
+            if response.status_code != 200:
+                print(f"Error: {response.status_code} - {response.text}")
+                return None
+
+            # Parse and display response
+            inference = response.json()
+            self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
+            if verbosity:
+                print(f"Response: {inference['choices'][0]['message']['content']}")
+            return inference
+        
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Inference failed for model '{model}': {e}")
+            return None, None
+
+    def perform_inference_streaming(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        """Performs streaming inference request to Azure."""
+        model_id = self.get_model_name(model)
+        api_key = self.get_model_api_key(model)
+        if model_id is None:
+            print(f"Model {model} not available.")
+            return None
+
+        endpoint = self.endpoint(model_id)
+        parser = SSEParser()
+        start_ns = perf_counter_ns()
+        try:
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    f"{endpoint}",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "messages": [
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt},
+                        ],
+                        "max_tokens": max_output,
+                        "stream": True,
+                    },
+                    stream=True,
+                    timeout=500,
+                )
+            self.check_throttled(response)
+
+            capture = StreamCapture()
+            add = capture.add
+            for chunk in response.iter_content(chunk_size=None):
+                add(chunk)
+            parser.replay(capture)
+
+            ttft, inter_token_latencies, total_time = parser.timings(start_ns)
+            self.display_stream(parser, ttft, total_time, verbosity)
+            self.log_streaming_metrics(
+                model,
+                ttft,
+                total_time,
+                inter_token_latencies,
+                chunk_texts=parser.texts(self.chunk_text),
+            )
+            self.log_response_headers(model, response.headers, ttft)
+            self.log_network_phases(model, phases, parser.arrivals[0])
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
+            return None, None
+
+    @staticmethod
+    def chunk_text(event):
+        """Returns the text of one streamed chat completion event."""
+        return (event.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
+
+    def display_stream(self, parser, ttft, total_time, verbosity):
+        """Prints the streamed response once the stream is closed."""
+        if not verbosity:
+            return
+        text = "".join(parser.texts(self.chunk_text))
+        print(text)
+        print(
+            f"\nNumber of output tokens/chunks: {len(parser.payloads)}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {total_time:.4f} seconds"
+        )
+
+    async def perform_inference_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        """Performs non-streaming inference request to Azure asynchronously."""
+        try:
+            model_id = self.get_model_name(model)
+            api_key = self.get_model_api_key(model)
+            if model_id is None:
+                print(f"Model {model} not available.")
+                return None
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            start_time = timer()
+            endpoint = self.endpoint(model_id)
+            response = await client.post(
+                endpoint,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json",
@@ -65,114 +210,80 @@ class Azure(ProviderInterface):
                     ],
                     "max_tokens": max_output,
                 },
-                timeout=500,
+                extensions={"trace": phases.trace},
             )
+            self.check_throttled(response)
             elapsed = timer() - start_time
             if response.status_code != 200:
                 print(f"Error: {response.status_code} - {response.text}")
                 return None
 
-            # Parse and display response
             inference = response.json()
             self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
             if verbosity:
                 print(f"Response: {inference['choices'][0]['message']['content']}")
             return inference
-        
+
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed for model '{model}': {e}")
             return None, None
 
-    def perform_inference_streaming(
+    async def perform_inference_streaming_async(
         self, model, prompt, max_output=100, verbosity=True
     ):
-        """Performs streaming inference request to Azure."""
+        """Performs streaming inference request to Azure asynchronously."""
         model_id = self.get_model_name(model)
         api_key = self.get_model_api_key(model)
         if model_id is None:
             print(f"Model {model} not available.")
             return None
 
-        inter_token_latencies = []
-        endpoint = f"https://{model_id}.eastus.models.ai.azure.com/chat/completions"
-        start_time = timer()
+        endpoint = self.endpoint(model_id)
+        parser = SSEParser()
         try:
-            response = requests.post(
-                f"{endpoint}",
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            start_ns = perf_counter_ns()
+            async with client.stream(
+                "POST",
+                endpoint,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json",
                 },
                 json={
                     "messages": [
-                        # {"role": "system", "content": self.system_prompt + "\nThe number appended at the end is not important."},
-                        # {"role": "user", "content": prompt + " " + str(timer())},
                         {"role": "system", "content": self.system_prompt},
                         {"role": "user", "content": prompt},
                     ],
                     "max_tokens": max_output,
                     "stream": True,
                 },
-                stream=True,
-                timeout=500,
-            )
+                extensions={"trace": phases.trace},
+            ) as response:
+                self.check_throttled(response)
+                capture = StreamCapture()
+                add = capture.add
+                async for chunk in response.aiter_bytes():
+                    add(chunk)
+            parser.replay(capture)
 
-            first_token_time = None
-            for line in response.iter_lines():
-                if line:
-                    # print(line)
-                    if first_token_time is None:
-                        # print(line)
-                        first_token_time = timer()
-                        ttft = first_token_time - start_time
-                        prev_token_time = first_token_time
-                        if verbosity:
-                            print(f"##### Time to First Token (TTFT): {ttft:.4f} seconds\n")
-
-                    line_str = line.decode("utf-8").strip()
-                    
-                    if line_str == "data: [DONE]":
-                        # print(line_str)
-                        # print("here")
-                        total_time = timer() - start_time
-                        break
-
-                    # Capture token timing
-                    time_to_next_token = timer()
-                    inter_token_latency = time_to_next_token - prev_token_time
-                    prev_token_time = time_to_next_token
-                    inter_token_latencies.append(inter_token_latency)
-
-                    # Display token if verbosity is enabled
-                    match = re.search(r'"content"\s*:\s*"(.*?)"', line_str)
-                    if match:
-                        print(match.group(1), end="")
-                    # if verbosity:
-                    #     if len(inter_token_latencies) < 20:
-                    #         print(line_str[19:].split('"')[5], end="")
-                    #     elif len(inter_token_latencies) == 20:
-                    #         print("...")
-
-            # Calculate total metrics
-
-            if verbosity:
-                print(f"\nTotal Response Time: {total_time:.4f} seconds")
-                print(len(inter_token_latencies))
-
-            # Log metrics
-            avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-            print(f"{avg_tbt:.4f}, {len(inter_token_latencies)}")
-            self.log_metrics(model, "timetofirsttoken", ttft)
-            self.log_metrics(model, "response_times", total_time)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-            self.log_metrics(
-                model, "timebetweentokens_median", np.median(inter_token_latencies)
-            )
-            self.log_metrics(
-                model, "timebetweentokens_p95", np.percentile(inter_token_latencies, 95)
+            ttft, inter_token_latencies, total_time = parser.timings(start_ns)
+            self.display_stream(parser, ttft, total_time, verbosity)
+            self.log_streaming_metrics(
+                model,
+                ttft,
+                total_time,
+                inter_token_latencies,
+                chunk_texts=parser.texts(self.chunk_text),
             )
-            self.log_metrics(model, "totaltokens", len(inter_token_latencies) + 1)
+            self.log_response_headers(model, response.headers, ttft)
+            self.log_network_phases(model, phases, parser.arrivals[0])
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
             return None, None
@@ -1,22 +1,51 @@
 # base_provider.py for chat completions api
+from inspect import signature
 from timeit import default_timer as timer
-import numpy as np
 from providers.provider_interface import ProviderInterface
+from providers.stream_capture import StreamCapture
 
 
 class BaseProvider(ProviderInterface):
-    def __init__(self, api_key, client_class, base_url=None):
+    def __init__(self, api_key, client_class, base_url=None, async_client_class=None):
         super().__init__()
 
         if not api_key:
             raise ValueError("API key must be provided as an environment variable.")
-        if base_url:
-            self.client = client_class(api_key=api_key, base_url=base_url)
-        else:
-            self.client = client_class(api_key=api_key)
+        self.api_key = api_key
+        self.client_class = client_class
+        self.async_client_class = async_client_class
+        self.set_base_url(base_url)
 
         self.model_map = {}
 
+    def set_base_url(self, base_url):
+        """
+        Recreates the SDK clients for another base URL; None uses the SDK default.
+        """
+        self.base_url = base_url
+        self.client = self.client_class(**self.client_kwargs())
+        self._async_client = None
+        return True
+
+    def client_kwargs(self):
+        """
+        Returns the SDK client arguments.
+
+        The SDK's own retries are turned off: they would back off inside the
+        timed window, so throttles are left to the benchmark's retry layer.
+        """
+        kwargs = {"api_key": self.api_key, "max_retries": 0}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return kwargs
+
+    def create_async_client(self):
+        kwargs = self.client_kwargs()
+        # the SDK's own client speaks HTTP/1.1; hand it ours for HTTP/2
+        if self.http2 and "http_client" in signature(self.async_client_class).parameters:
+            kwargs["http_client"] = self.create_http_client()
+        return self.async_client_class(**kwargs)
+
     def get_model_name(self, model):
         return self.model_map.get(model, None)
 
@@ -27,7 +56,8 @@ class BaseProvider(ProviderInterface):
             if model_id is None:
                 raise ValueError(f"Model {model} not available for provider.")
             start = timer()
-            response = self.client.chat.completions.create(
+            response, headers = self.create_with_headers(
+                self.client.chat.completions,
                 model=model_id,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -38,11 +68,15 @@ class BaseProvider(ProviderInterface):
             )
             elapsed = timer() - start
             self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(
+                model, headers, elapsed, self.server_timing(response, streaming=False)
+            )
             if verbosity:
                 self.display_response(response, elapsed)
             return elapsed
             
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed for model '{model}': {e}")
             return None
 
@@ -53,11 +87,12 @@ class BaseProvider(ProviderInterface):
             model_id = self.get_model_name(model)
             if model_id is None:
                 raise ValueError(f"Model {model} not available for provider.")
-            first_token_time = None
-            inter_token_latencies = []
+            capture = StreamCapture(timer, 1)
+            add = capture.add
 
             start = timer()
-            response = self.client.chat.completions.create(
+            response, headers = self.create_with_headers(
+                self.client.chat.completions,
                 model=model_id,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -69,51 +104,148 @@ class BaseProvider(ProviderInterface):
             )
 
             for chunk in response:
-                if first_token_time is None:
-                    first_token_time = timer()
-                    ttft = first_token_time - start
-                    prev_token_time = first_token_time
-                    if verbosity:
-                        print(f"\nTime to First Token (TTFT): {ttft:.4f} seconds\n")
-
-                if chunk.choices[0].finish_reason:
-                    elapsed = timer() - start
-                    if verbosity:
-                        print(f"\nTotal Response Time: {elapsed:.4f} seconds")
-                    break
-
-                time_to_next_token = timer()
-                inter_token_latency = time_to_next_token - prev_token_time
-                prev_token_time = time_to_next_token
-
-                inter_token_latencies.append(inter_token_latency)
-                if verbosity:
-                    # print(chunk.choices[0].delta.content or "", end="", flush=True)
-                    if len(inter_token_latencies) < 20:
-                        print(chunk.choices[0].delta.content or "", end="", flush=True)
-                    elif len(inter_token_latencies) == 20:
-                        print("...")
-
-            avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-            if verbosity:
+                add(chunk)
+
+            self.finish_stream(model, capture, start, headers, verbosity)
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
+            return None, None
 
-                print(
-                    f"\nNumber of output tokens/chunks: {len(inter_token_latencies) + 1}, Avg TBT: {avg_tbt:.4f}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {elapsed:.4f} seconds"
-                )
-            self.log_metrics(model, "timetofirsttoken", ttft)
+    async def perform_inference_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        if self.async_client_class is None:
+            return await super().perform_inference_async(
+                model, prompt, max_output, verbosity
+            )
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                raise ValueError(f"Model {model} not available for provider.")
+            client = self.get_async_client()
+            start = timer()
+            response, headers = await self.create_with_headers_async(
+                client.chat.completions,
+                model=model_id,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=max_output,
+                timeout=(1, 2)
+            )
+            elapsed = timer() - start
             self.log_metrics(model, "response_times", elapsed)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-            median = np.percentile(inter_token_latencies, 50)
-            p95 = np.percentile(inter_token_latencies, 95)
-            self.log_metrics(model, "timebetweentokens_median", median)
-            self.log_metrics(model, "timebetweentokens_p95", p95)
-            self.log_metrics(model, "totaltokens", len(inter_token_latencies) + 1)
-            self.log_metrics(model, "tps", (len(inter_token_latencies) + 1) / elapsed)
+            self.log_response_headers(
+                model, headers, elapsed, self.server_timing(response, streaming=False)
+            )
+            if verbosity:
+                self.display_response(response, elapsed)
+            return elapsed
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Inference failed for model '{model}': {e}")
+            return None
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        if self.async_client_class is None:
+            return await super().perform_inference_streaming_async(
+                model, prompt, max_output, verbosity
+            )
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                raise ValueError(f"Model {model} not available for provider.")
+            client = self.get_async_client()
+            capture = StreamCapture(timer, 1)
+            add = capture.add
+
+            start = timer()
+            response, headers = await self.create_with_headers_async(
+                client.chat.completions,
+                model=model_id,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+                max_tokens=max_output,
+                timeout=(1, 2)
+            )
+
+            async for chunk in response:
+                add(chunk)
+
+            self.finish_stream(model, capture, start, headers, verbosity)
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
             return None, None
 
+    def reported_tokens(self, chunks):
+        """Returns the output tokens the stream reported, or None if it did not."""
+        return None
+
+    def server_timing(self, result, streaming):  # pylint: disable=unused-argument
+        """
+        Returns the server timing the response body reported, or None if it did not.
+
+        Args:
+            result: The parsed response, or the chunks of a stream.
+            streaming (bool): Whether result holds the chunks of a stream.
+        """
+        return None
+
+    def finish_stream(self, model, capture, start, headers, verbosity):
+        """
+        Decodes a closed chat completion stream and logs its metrics.
+
+        The chunk with a finish reason ends the response; it and the chunks
+        after it (such as a usage chunk) carry no text.
+
+        Args:
+            model (str): The model alias the request was sent to.
+            capture (StreamCapture): The chunks of the stream.
+            start (float): timer() value taken when the request was sent.
+            headers (Mapping): The response headers.
+            verbosity (bool): Whether to print the response.
+        """
+        chunks = capture.captured()
+        finish = next(
+            (
+                i
+                for i, chunk in enumerate(chunks)
+                if chunk.choices and chunk.choices[0].finish_reason
+            ),
+            len(chunks),
+        )
+        end = None if finish < len(chunks) else timer()
+        ttft, inter_token_latencies, elapsed = capture.timings(start, finish, end)
+        chunk_texts = [chunk.choices[0].delta.content or "" for chunk in chunks[:finish]]
+        if verbosity:
+            print(f"\nTime to First Token (TTFT): {ttft:.4f} seconds\n")
+            print("".join(chunk_texts))
+            print(
+                f"\nNumber of output chunks: {len(chunk_texts)}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {elapsed:.4f} seconds"
+            )
+        self.log_streaming_metrics(
+            model,
+            ttft,
+            elapsed,
+            inter_token_latencies,
+            self.reported_tokens(chunks),
+            chunk_texts=chunk_texts,
+        )
+        self.log_response_headers(
+            model, headers, ttft, self.server_timing(chunks, streaming=True)
+        )
+
     def display_response(self, response, elapsed):
         """Display response."""
         print(response.choices[0].message.content)  # [:100] + "...")
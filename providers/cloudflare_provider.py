@@ -1,9 +1,12 @@
 import os
 import time
-import requests
-import numpy as np
 from timeit import default_timer as timer
 from providers.provider_interface import ProviderInterface
+from providers.network_timing import PhaseTimer
+from providers.sse import SSEParser
+from providers.stream_capture import StreamCapture
+
+CLOUDFLARE_API = "https://api.cloudflare.com/client/v4"
 
 # from IPython.display import display, Image, Markdown, Audio
 # import logging
@@ -15,6 +18,8 @@ class Cloudflare(ProviderInterface):
         Initializes the Cloudflare with the necessary API key and client.
         """
         super().__init__()
+        # pooled session, so connections are reused across requests
+        self.session = self.create_session()
 
         cloudflare_account_id = os.environ.get("CLOUDFLARE_ACCOUNT_ID")
         cloudflare_api_token = os.environ.get("CLOUDFLARE_AI_TOKEN")
@@ -26,6 +31,7 @@ class Cloudflare(ProviderInterface):
 
         self.cloudflare_account_id = cloudflare_account_id
         self.cloudflare_api_token = cloudflare_api_token
+        self.base_url = None
 
         # model names
         self.model_map = {
@@ -40,30 +46,48 @@ class Cloudflare(ProviderInterface):
     def get_model_name(self, model):
         return self.model_map.get(model, None)  # or model
 
+    def connection_url(self, model):  # pylint: disable=unused-argument
+        return self.base_url or "https://api.cloudflare.com/"
+
+    def set_base_url(self, base_url):
+        """Points the provider at another server; None uses the Cloudflare API."""
+        self.base_url = base_url.rstrip("/") if base_url else None
+        return True
+
+    def run_url(self, model_id):
+        """Returns the ai/run URL of a model."""
+        api = self.base_url or CLOUDFLARE_API
+        return f"{api}/accounts/{self.cloudflare_account_id}/ai/run/{model_id}"
+
     def perform_inference(self, model, prompt, max_output=100, verbosity=True):
         try:
             model_id = self.get_model_name(model)
             if model_id is None:
                 print(f"Model {model} not available for provider {model_id}")
             start_time = timer()
-            response = requests.post(
-                f"https://api.cloudflare.com/client/v4/accounts/{self.cloudflare_account_id}/ai/run/{model_id}",
-                headers={"Authorization": f"Bearer {self.cloudflare_api_token}"},
-                json={
-                    "messages": [
-                        # {"role": "system", "content": "Explain your answer step-by-step."},
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "user", "content": prompt},
-                    ],
-                    "max_tokens": max_output,  # self.max_tokens
-                },
-                timeout=500,
-            )
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    self.run_url(model_id),
+                    headers={"Authorization": f"Bearer {self.cloudflare_api_token}"},
+                    json={
+                        "messages": [
+                            # {"role": "system", "content": "Explain your answer step-by-step."},
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt},
+                        ],
+                        "max_tokens": max_output,  # self.max_tokens
+                    },
+                    timeout=500,
+                )
+            self.check_throttled(response)
 
             elapsed = timer() - start_time
             # print("request sucess")
             # log response times metric
             self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
 
             inference = response.json()
             print(inference)
@@ -75,6 +99,7 @@ class Cloudflare(ProviderInterface):
             return elapsed
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed for model '{model}': {e}")
             return None, None
             
@@ -83,12 +108,122 @@ class Cloudflare(ProviderInterface):
     ):
 
         try:
-            inter_token_latencies = []
             model_id = self.get_model_name(model)
-            start_time = time.perf_counter()
+            parser = SSEParser()
+            start_ns = time.perf_counter_ns()
+
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    self.run_url(model_id),
+                    headers={
+                        "Authorization": f"Bearer {self.cloudflare_api_token}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "stream": True,
+                        "messages": [
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt},
+                        ],
+                        "max_tokens": max_output,
+                    },
+                    stream=True,
+                    timeout=500,
+                )
+            self.check_throttled(response)
+
+            capture = StreamCapture()
+            add = capture.add
+            for chunk in response.iter_content(chunk_size=None):
+                add(chunk)
+            parser.replay(capture)
 
-            response = requests.post(
-                f"https://api.cloudflare.com/client/v4/accounts/{self.cloudflare_account_id}/ai/run/{model_id}",
+            ttft, inter_token_latencies, total_time = parser.timings(start_ns)
+            self.display_stream(parser, ttft, total_time, verbosity)
+            self.log_streaming_metrics(
+                model,
+                ttft,
+                total_time,
+                inter_token_latencies,
+                chunk_texts=parser.texts(self.chunk_text),
+            )
+            self.log_response_headers(model, response.headers, ttft)
+            self.log_network_phases(model, phases, parser.arrivals[0])
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
+            return None, None
+
+    @staticmethod
+    def chunk_text(event):
+        """Returns the text of one streamed event."""
+        return event.get("response", "")
+
+    def display_stream(self, parser, ttft, total_time, verbosity):
+        """
+        Prints the streamed response once the stream is closed.
+        """
+        if not verbosity:
+            return
+        text = "".join(parser.texts(self.chunk_text))
+        print(text)
+        print(
+            f"\nNumber of output tokens/chunks: {len(parser.payloads)}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {total_time:.4f} seconds"
+        )
+
+    async def perform_inference_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                print(f"Model {model} not available for provider {model_id}")
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            start_time = timer()
+            response = await client.post(
+                self.run_url(model_id),
+                headers={"Authorization": f"Bearer {self.cloudflare_api_token}"},
+                json={
+                    "messages": [
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "max_tokens": max_output,
+                },
+                extensions={"trace": phases.trace},
+            )
+            self.check_throttled(response)
+            elapsed = timer() - start_time
+            self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
+
+            if verbosity:
+                print(response.json()["result"]["response"][:50])
+                print(f"#### _Generated in *{elapsed:.2f}* seconds_")
+            return elapsed
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Inference failed for model '{model}': {e}")
+            return None, None
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        try:
+            model_id = self.get_model_name(model)
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            parser = SSEParser()
+            start_ns = time.perf_counter_ns()
+
+            async with client.stream(
+                "POST",
+                self.run_url(model_id),
                 headers={
                     "Authorization": f"Bearer {self.cloudflare_api_token}",
                     "Content-Type": "application/json",
@@ -101,53 +236,28 @@ class Cloudflare(ProviderInterface):
                     ],
                     "max_tokens": max_output,
                 },
-                stream=True,
-                timeout=500,
-            )
-
-            first_token_time = None
-            for line in response.iter_lines():
-                if line:
-                    if first_token_time is None:
-                        first_token_time = time.perf_counter()
-                        ttft = first_token_time - start_time
-                        prev_token_time = first_token_time
-                        if verbosity:
-                            print(f"##### Time to First Token (TTFT): {ttft:.4f} seconds\n")
-
-                    line_str = line.decode("utf-8").strip()
-
-                    # Check if the stream is done
-                    if line_str == "data: [DONE]":
-                        end_time = time.perf_counter()
-                        total_time = end_time - start_time
-                        if verbosity:
-                            print(f"##### Total Response Time: {total_time:.4f} seconds")
-                        break
-                    time_to_next_token = time.perf_counter()
-                    inter_token_latency = time_to_next_token - prev_token_time
-                    prev_token_time = time_to_next_token
-
-                    inter_token_latencies.append(inter_token_latency)
-                    print(line_str[19:].split('"')[0], end='')
+                extensions={"trace": phases.trace},
+            ) as response:
+                self.check_throttled(response)
+                capture = StreamCapture()
+                add = capture.add
+                async for chunk in response.aiter_bytes():
+                    add(chunk)
+            parser.replay(capture)
 
-            if verbosity:
-                print(
-                    f"\nNumber of output tokens/chunks: {len(inter_token_latencies) + 1}, Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {total_time:.4f} seconds"
-                )
+            ttft, inter_token_latencies, total_time = parser.timings(start_ns)
+            self.display_stream(parser, ttft, total_time, verbosity)
+            self.log_streaming_metrics(
+                model,
+                ttft,
+                total_time,
+                inter_token_latencies,
+                chunk_texts=parser.texts(self.chunk_text),
+            )
+            self.log_response_headers(model, response.headers, ttft)
+            self.log_network_phases(model, phases, parser.arrivals[0])
 
-            avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-            print(f"\nAvg TBT: {avg_tbt:.4f}, {len(inter_token_latencies)}")
-            self.log_metrics(model, "timetofirsttoken", ttft)
-            self.log_metrics(model, "response_times", total_time)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-            median = np.percentile(inter_token_latencies, 50)
-            p95 = np.percentile(inter_token_latencies, 95)
-            self.log_metrics(model, "timebetweentokens_median", median)
-            self.log_metrics(model, "timebetweentokens_p95", p95)
-            self.log_metrics(model, "totaltokens", len(inter_token_latencies) + 1)
-            self.log_metrics(model, "tps", (len(inter_token_latencies) + 1) / total_time)
-        
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
             return None, None
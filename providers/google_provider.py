@@ -2,7 +2,7 @@ import os
 from providers.provider_interface import ProviderInterface
 import google.generativeai as genai
 from timeit import default_timer as timer
-import numpy as np
+from providers.stream_capture import StreamCapture
 
 
 class GoogleGemini(ProviderInterface):
@@ -26,7 +26,8 @@ class GoogleGemini(ProviderInterface):
             raise EnvironmentError("GEMINI_API_KEY is not set in the environment.")
 
         genai.configure(api_key=api_key)
-        self.model = None
+        # GenerativeModel instances per model_id, reused across requests
+        self.models = {}
 
     def get_model_name(self, model):
         """
@@ -36,9 +37,15 @@ class GoogleGemini(ProviderInterface):
 
     def _initialize_model(self, model_id):
         """
-        Initializes the generative model instance for the specified model_id.
+        Returns the generative model instance for the specified model_id,
+        creating it on first use.
+
+        The instance is returned rather than stored on the provider, so
+        requests to different models from several threads cannot swap it.
         """
-        self.model = genai.GenerativeModel(model_id)
+        if model_id not in self.models:
+            self.models[model_id] = genai.GenerativeModel(model_id)
+        return self.models[model_id]
 
     def perform_inference(self, model, prompt, max_output=100, verbosity=True):
         """
@@ -49,10 +56,10 @@ class GoogleGemini(ProviderInterface):
             if model_id is None:
                 raise ValueError(f"Model {model} is not supported by GoogleGeminiProvider.")
 
-            self._initialize_model(model_id)
+            generative_model = self._initialize_model(model_id)
 
             start_time = timer()
-            response = self.model.generate_content(
+            response = generative_model.generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=max_output
@@ -67,6 +74,7 @@ class GoogleGemini(ProviderInterface):
             return elapsed
         
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Inference failed for model '{model}': {e}")
             return None, None
 
@@ -80,11 +88,10 @@ class GoogleGemini(ProviderInterface):
         if model_id is None:
             raise ValueError(f"Model {model} is not supported by GoogleGeminiProvider.")
 
-        self._initialize_model(model_id)
+        generative_model = self._initialize_model(model_id)
 
-        inter_token_latencies = []
         start_time = timer()
-        response = self.model.generate_content(
+        response = generative_model.generate_content(
             prompt,
             generation_config=genai.types.GenerationConfig(
                 max_output_tokens=max_output
@@ -92,59 +99,36 @@ class GoogleGemini(ProviderInterface):
             stream=True,
         )
 
-        first_token_time = None
-        prev_token_time = start_time
-        streamed_output = []
-        total_tokens = 0
-
+        # only the arrival time of each chunk is taken in the timed loop; the
+        # text is read and tokens attributed once the stream has ended
+        capture = StreamCapture(timer, 1)
+        add = capture.add
         for chunk in response:
-            current_time = timer()
-
-            if first_token_time is None:
-                first_token_time = current_time
-                TTFT = first_token_time - start_time
-                prev_token_time = first_token_time
-                if verbosity:
-                    print(f"Time to First Token (TTFT): {TTFT:.4f} seconds")
-
-            # Estimate the number of tokens in the current chunk
-            num_tokens = int(self.model.count_tokens(chunk.text).total_tokens)
-            total_tokens += num_tokens
-
-            # Calculate inter-token latency per token in the chunk
-            if num_tokens > 0:
-                inter_token_latency = (current_time - prev_token_time) / num_tokens
-                for _ in range(num_tokens):
-                    inter_token_latencies.append(inter_token_latency)
-
-            prev_token_time = current_time
-            if verbosity and chunk.text:
-                print(chunk.text, end="", flush=True)
-            streamed_output.append(chunk.text)
+            add(chunk)
 
         total_time = timer() - start_time
+        TTFT, inter_token_latencies, _ = capture.timings(start_time)
+        chunks = capture.captured()
+        streamed_output = [chunk.text for chunk in chunks]
+        last_chunk = chunks[-1]
         if verbosity:
-            print(f"\nTotal Response Time: {total_time:.4f} seconds")
-            print(f"total tokens {len(inter_token_latencies)}")
-
-        avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-        self.log_metrics(model, "timetofirsttoken", TTFT)
-        self.log_metrics(model, "response_times", total_time)
-        self.log_metrics(model, "timebetweentokens", avg_tbt)
+            print(f"Time to First Token (TTFT): {TTFT:.4f} seconds")
+            print("".join(streamed_output))
 
-        # Calculate additional latency metrics
-        median_latency = (
-            np.median(inter_token_latencies) if inter_token_latencies else 0
+        # scaled to the output tokens the last chunk's usage metadata reports
+        reported = getattr(
+            getattr(last_chunk, "usage_metadata", None), "candidates_token_count", None
         )
-        p95_latency = (
-            np.percentile(inter_token_latencies, 95) if inter_token_latencies else 0
-        )
-
-        self.log_metrics(model, "timebetweentokens_median", median_latency)
-        self.log_metrics(model, "timebetweentokens_p95", p95_latency)
-        self.log_metrics(model, "totaltokens", total_tokens)
-        self.log_metrics(
-            model, "tps", total_tokens / total_time if total_time > 0 else 0
+        self.log_streaming_metrics(
+            model,
+            TTFT,
+            total_time,
+            inter_token_latencies,
+            reported if isinstance(reported, int) else None,
+            chunk_texts=streamed_output,
         )
+        if verbosity:
+            print(f"\nTotal Response Time: {total_time:.4f} seconds")
+            print(f"total tokens {self.metrics['totaltokens'][model][-1]}")
 
         return streamed_output
@@ -1,15 +1,21 @@
 import os
-from groq import Groq
+from groq import AsyncGroq, Groq
 from providers.base_provider import BaseProvider
+from providers.response_headers import groq_server_timing
 
 
 class GroqProvider(BaseProvider):
+    # free-tier limits of llama-3.3-70b-versatile
+    rate_limits = {"requests_per_minute": 30, "tokens_per_minute": 6000}
+
     def __init__(self):
         """
         Initializes the GROQ with the necessary API key and client.
         """
         groq_api = os.environ["GROQ_API_KEY"]
-        super().__init__(api_key=groq_api, client_class=Groq)
+        super().__init__(
+            api_key=groq_api, client_class=Groq, async_client_class=AsyncGroq
+        )
 
         # model names
         self.model_map = {
@@ -18,3 +24,18 @@ class GroqProvider(BaseProvider):
             "meta-llama-3.1-70b-instruct": "llama-3.3-70b-versatile",
             "common-model": "llama-3.3-70b-versatile",
         }
+
+    def server_timing(self, result, streaming):
+        """Groq reports its queue, prompt and completion times in the body."""
+        if not streaming:
+            usage = getattr(result, "usage", None)
+        else:
+            usage = next(
+                (
+                    chunk.x_groq.usage
+                    for chunk in reversed(result)
+                    if getattr(getattr(chunk, "x_groq", None), "usage", None) is not None
+                ),
+                None,
+            )
+        return None if usage is None else groq_server_timing(usage, streaming)
@@ -1,5 +1,5 @@
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from providers.base_provider import BaseProvider
 
 
@@ -19,7 +19,10 @@ class Hyperbolic(BaseProvider):
         base_url = "https://api.hyperbolic.xyz/v1"
 
         super().__init__(
-            api_key=perplexity_api, client_class=client_class, base_url=base_url
+            api_key=perplexity_api,
+            client_class=client_class,
+            base_url=base_url,
+            async_client_class=AsyncOpenAI,
         )
 
         # model names mapping
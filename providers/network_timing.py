@@ -0,0 +1,362 @@
+"""
+Per-request network phase timing for the httpx clients and requests sessions of
+the HTTP-based providers.
+"""
+import asyncio
+import socket
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import httpcore
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import create_connection
+
+NS_PER_SECOND = 1e9
+
+# metrics logged next to timetofirsttoken, in the order the phases happen
+NETWORK_PHASES = (
+    "dns_time",
+    "connect_time",
+    "tls_time",
+    "upload_time",
+    "queue_time",
+    "prefill_time",
+)
+
+_active_timer = ContextVar("network_phase_timer", default=None)
+# timer of the request a requests session is sending in this thread
+_session_timer = ContextVar("session_phase_timer", default=None)
+
+
+class PhaseTimer:
+    """
+    Collects the httpcore trace events of one request.
+
+    Pass trace as the request's "trace" extension. The callback runs in the
+    task sending the request, right before a new connection is opened, which
+    is how the TimedNetworkBackend attributes the DNS lookup to the request.
+    Requests sent through a session with a TimedHTTPAdapter are timed by
+    sending them inside measure() instead.
+
+    Attributes:
+        events (dict): perf_counter_ns() of every trace event, keyed by the event
+            name without its http11/http2/connection prefix.
+        dns_ns (int): Duration of the DNS lookup, 0 on a reused connection.
+    """
+
+    def __init__(self):
+        self.events = {}
+        self.dns_ns = 0
+
+    async def trace(self, name, info):  # pylint: disable=unused-argument
+        """httpcore trace callback; stamps the event on arrival."""
+        event = name.split(".", 1)[1]
+        self.events[event] = time.perf_counter_ns()
+        if event == "connect_tcp.started":
+            _active_timer.set(self)
+        elif event.startswith("connect_tcp."):
+            _active_timer.set(None)
+
+    def record(self, event):
+        """Stamps an event of a request sent through a TimedHTTPAdapter."""
+        self.events[event] = time.perf_counter_ns()
+
+    @contextmanager
+    def measure(self):
+        """Times the requests session request sent within the block."""
+        token = _session_timer.set(self)
+        try:
+            yield self
+        finally:
+            _session_timer.reset(token)
+
+    def span(self, start, end):
+        """Returns the seconds between two events, or 0 if either did not happen."""
+        if start not in self.events or end not in self.events:
+            return 0.0
+        return (self.events[end] - self.events[start]) / NS_PER_SECOND
+
+    def phases(self, first_token_ns=None):
+        """
+        Splits the time to first token into its network and server phases.
+
+        Phases of a reused connection (DNS, connect, TLS) are 0. Queue time runs
+        from the end of the upload to the response headers, which streaming APIs
+        send once the request is scheduled; prefill runs from the headers to the
+        first streamed event and is only reported when first_token_ns is given.
+
+        Args:
+            first_token_ns (int, optional): perf_counter_ns() of the first event.
+
+        Returns:
+            dict: Seconds per phase name of NETWORK_PHASES; empty if the request
+            did not go through an instrumented connection.
+        """
+        headers = self.events.get("receive_response_headers.complete")
+        if headers is None:
+            return {}
+        dns = self.dns_ns / NS_PER_SECOND
+        phases = {
+            "dns_time": dns,
+            "connect_time": max(
+                0.0, self.span("connect_tcp.started", "connect_tcp.complete") - dns
+            ),
+            "tls_time": self.span("start_tls.started", "start_tls.complete"),
+            "upload_time": self.span(
+                "send_request_headers.started", "send_request_body.complete"
+            ),
+            "queue_time": self.span(
+                "send_request_body.complete", "receive_response_headers.complete"
+            ),
+        }
+        if first_token_ns is not None:
+            phases["prefill_time"] = max(0, first_token_ns - headers) / NS_PER_SECOND
+        return phases
+
+
+class TimedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves host names itself to time the lookup.
+
+    The duration is reported to the PhaseTimer active in the calling task; TLS
+    still verifies against the original host name, which httpcore passes on
+    separately.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        start = time.perf_counter_ns()
+        addresses = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        timer = _active_timer.get()
+        if timer is not None:
+            timer.dns_ns = time.perf_counter_ns() - start
+        return await self.backend.connect_tcp(
+            addresses[0][4][0],
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors clients expect, most specific first
+HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+def as_httpx_error(exc):
+    """Returns the httpx error matching an httpcore error, or exc itself."""
+    for core_error, httpx_error in HTTPCORE_ERRORS:
+        if isinstance(exc, core_error):
+            return httpx_error(str(exc))
+    return exc
+
+
+class TimedResponseStream(httpx.AsyncByteStream):
+    """Response body of a TimedTransport request, raising httpx errors."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def __aiter__(self):
+        try:
+            async for part in self.stream:
+                yield part
+        except Exception as exc:  # pylint: disable=broad-except
+            error = as_httpx_error(exc)
+            if error is exc:
+                raise
+            raise error from exc
+
+    async def aclose(self):
+        await self.stream.aclose()
+
+
+class TimedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool with a TimedNetworkBackend.
+
+    Attributes:
+        pool (httpcore.AsyncConnectionPool): The connection pool requests go through.
+        http2 (bool): Whether connections negotiate HTTP/2.
+        max_keepalive_connections (int | None): Idle connections kept open.
+    """
+
+    def __init__(self, max_keepalive_connections=None, http2=False):
+        """
+        Initializes the transport.
+
+        Args:
+            max_keepalive_connections (int, optional): Idle connections kept open;
+                0 closes every connection after its request. Defaults to None.
+            http2 (bool, optional): Negotiate HTTP/2. Defaults to False.
+        """
+        self.http2 = http2
+        self.max_keepalive_connections = max_keepalive_connections
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=None,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=5.0,
+            http1=True,
+            http2=http2,
+            network_backend=TimedNetworkBackend(),
+        )
+
+    async def handle_async_request(self, request):
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = as_httpx_error(exc)
+            if error is exc:
+                raise
+            raise error from exc
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=TimedResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
+
+
+class TimedConnectionMixin:
+    """
+    Stamps the phases of a urllib3 connection on the PhaseTimer being measured.
+
+    The events carry the names of httpcore's trace events, so PhaseTimer.phases
+    splits both kinds of requests the same way. The host name is resolved
+    before connecting so the DNS lookup is timed on its own, as in the
+    TimedNetworkBackend.
+    """
+
+    def _new_conn(self):
+        timer = _session_timer.get()
+        if timer is None:
+            return super()._new_conn()
+        timer.record("connect_tcp.started")
+        start = time.perf_counter_ns()
+        try:
+            addresses = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            # let urllib3 report the failed lookup
+            return super()._new_conn()
+        timer.dns_ns = time.perf_counter_ns() - start
+        try:
+            sock = create_connection(
+                (addresses[0][4][0], self.port),
+                self.timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options,
+            )
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+        timer.record("connect_tcp.complete")
+        return sock
+
+    def request(self, method, url, body=None, headers=None, **kwargs):
+        timer = _session_timer.get()
+        if timer is None:
+            return super().request(method, url, body=body, headers=headers, **kwargs)
+        if self.sock is None:
+            # connect first, so the upload does not include the connection
+            self.connect()
+        timer.record("send_request_headers.started")
+        super().request(method, url, body=body, headers=headers, **kwargs)
+        timer.record("send_request_body.complete")
+        return None
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timer = _session_timer.get()
+        if timer is not None:
+            timer.record("receive_response_headers.complete")
+        return response
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    """urllib3 HTTP connection timed by TimedConnectionMixin."""
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    """urllib3 HTTPS connection timed by TimedConnectionMixin, TLS handshake included."""
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        timer = _session_timer.get()
+        if timer is not None:
+            timer.record("start_tls.started")
+        return sock
+
+    def connect(self):
+        super().connect()
+        timer = _session_timer.get()
+        if timer is not None and "start_tls.started" in timer.events:
+            timer.record("start_tls.complete")
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    requests adapter whose connections report their phases to PhaseTimer.measure().
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
@@ -1,5 +1,5 @@
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from providers.base_provider import BaseProvider
 
 
@@ -9,7 +9,9 @@ class Open_AI(BaseProvider):
         Initializes the OPENAI with the necessary API key and client.
         """
         open_ai_api = os.environ["OPEN_AI_API"]
-        super().__init__(api_key=open_ai_api, client_class=OpenAI)
+        super().__init__(
+            api_key=open_ai_api, client_class=OpenAI, async_client_class=AsyncOpenAI
+        )
         # model names
         self.model_map = {
             "meta-llama-3.2-3b-instruct": "gpt-4o-mini",  # speculative: 8-40b
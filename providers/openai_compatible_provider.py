@@ -0,0 +1,261 @@
+import os
+import time
+from timeit import default_timer as timer
+from providers.provider_interface import ProviderInterface
+from providers.network_timing import PhaseTimer
+from providers.sse import SSEParser
+from providers.stream_capture import StreamCapture
+
+
+class OpenAICompatible(ProviderInterface):
+    """
+    Provider for any server exposing the OpenAI completions or chat completions API.
+
+    Self-hosted engines such as vLLM, SGLang, TGI, the llama.cpp server and
+    Ollama all serve this API, so one provider configured with their base URL
+    benchmarks each of them through the same raw-HTTP streaming path.
+    """
+
+    MODES = ("completions", "chat")
+
+    def __init__(
+        self,
+        base_url=None,
+        mode="completions",
+        models=None,
+        extra_body=None,
+        api_key_env=None,
+        default_model=None,
+    ):
+        """
+        Initializes the provider for one server.
+
+        Args:
+            base_url (str, optional): URL the API paths are appended to, e.g.
+                "http://10.0.0.5:8000/v1".
+            mode (str, optional): "completions" sends a prompt to /completions,
+                "chat" sends messages to /chat/completions. Defaults to "completions".
+            models (dict, optional): Model keys mapped to the server's model IDs.
+            extra_body (dict, optional): Extra request parameters, e.g.
+                {"ignore_eos": true}; they override the benchmark's own.
+            api_key_env (str, optional): Environment variable holding a bearer token.
+            default_model (str, optional): Model ID for keys not in models.
+        """
+        super().__init__()
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown API mode '{mode}'. Choose from {self.MODES}.")
+        # pooled session, so connections are reused across requests
+        self.session = self.create_session()
+        self.set_base_url(base_url)
+        self.mode = mode
+        self.model_map = dict(models or {})
+        self.extra_body = dict(extra_body or {})
+        self.api_key = os.environ.get(api_key_env) if api_key_env else None
+        self.default_model = default_model
+
+    def get_model_name(self, model):
+        """Get the server's model ID, defaulting to default_model if not found."""
+        return self.model_map.get(model, self.default_model)
+
+    def endpoint(self):
+        """Returns the URL requests are sent to."""
+        if self.base_url is None:
+            raise ValueError(f"No base_url set for {self.__class__.__name__}.")
+        path = "chat/completions" if self.mode == "chat" else "completions"
+        return f"{self.base_url}/{path}"
+
+    def set_base_url(self, base_url):
+        """Points the provider at another server."""
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._async_client = None
+        return True
+
+    def connection_url(self, model):
+        """All models are served from the base URL."""
+        return self.base_url
+
+    def request_headers(self):
+        """Returns the request headers, with the bearer token if one is configured."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def request_body(self, model, prompt, max_output, stream=False):
+        """
+        Builds the JSON body of a request in the configured mode.
+        """
+        body = {"model": self.get_model_name(model), "max_tokens": max_output}
+        if self.mode == "chat":
+            body["messages"] = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt},
+            ]
+        else:
+            body["prompt"] = f"System: {self.system_prompt} \n User: {prompt}"
+        if stream:
+            body["stream"] = True
+        body.update(self.extra_body)
+        return body
+
+    def event_text(self, event):
+        """Returns the text of one streamed event in either mode."""
+        choices = event.get("choices") or [{}]
+        if self.mode == "chat":
+            return (choices[0].get("delta") or {}).get("content") or ""
+        return choices[0].get("text") or ""
+
+    def perform_inference(self, model, prompt, max_output=100, verbosity=True):
+        """
+        Sends an inference request to the server.
+        """
+        start_time = timer()
+        try:
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    self.endpoint(),
+                    headers=self.request_headers(),
+                    json=self.request_body(model, prompt, max_output),
+                    timeout=1800,
+                )
+            self.check_throttled(response)
+            elapsed = timer() - start_time
+
+            # Log response times metric
+            self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
+
+            if verbosity:
+                print(f"#### _Generated in *{elapsed:.2f}* seconds_")
+                print(response.json())
+            return elapsed
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"Error during inference: {e}")
+            return None
+
+    def perform_inference_streaming(self, model, prompt, max_output=100, verbosity=True):
+        """
+        Sends a streaming inference request to the server and parses token streams.
+        """
+        parser = SSEParser()
+
+        try:
+            start_ns = time.perf_counter_ns()
+            phases = PhaseTimer()
+            with phases.measure():
+                response = self.session.post(
+                    self.endpoint(),
+                    headers=self.request_headers(),
+                    json=self.request_body(model, prompt, max_output, stream=True),
+                    stream=True,
+                    timeout=100,
+                )
+            self.check_throttled(response)
+
+            capture = StreamCapture()
+            add = capture.add
+            for chunk in response.iter_content(chunk_size=None):
+                add(chunk)
+            parser.replay(capture)
+
+            result = self.finish_stream(model, parser, start_ns, verbosity, response.headers)
+            self.log_network_phases(model, phases, parser.arrivals[0])
+            return result
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"Error during streaming inference: {e}")
+            return None, None
+
+    def finish_stream(self, model, parser, start_ns, verbosity, headers):
+        """
+        Logs the metrics of a closed stream and decodes its text.
+
+        Returns:
+            tuple: The generated text and the total response time.
+        """
+        ttft, inter_token_latencies, total_time = parser.timings(start_ns)
+        chunk_texts = parser.texts(self.event_text)
+        generated_text = "".join(chunk_texts)
+        if verbosity:
+            print(
+                f"\nNumber of output tokens/chunks: {len(parser.payloads)}, "
+                f"Time to First Token (TTFT): {ttft:.4f} seconds, Total Response Time: {total_time:.4f} seconds"
+            )
+            print(f"\nGenerated Text: {generated_text}")
+        self.log_streaming_metrics(
+            model, ttft, total_time, inter_token_latencies, chunk_texts=chunk_texts
+        )
+        self.log_response_headers(model, headers, ttft)
+        return generated_text, total_time
+
+    async def perform_inference_async(self, model, prompt, max_output=100, verbosity=True):
+        """
+        Sends an inference request to the server asynchronously.
+        """
+        try:
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            start_time = timer()
+            response = await client.post(
+                self.endpoint(),
+                headers=self.request_headers(),
+                json=self.request_body(model, prompt, max_output),
+                timeout=1800,
+                extensions={"trace": phases.trace},
+            )
+            self.check_throttled(response)
+            elapsed = timer() - start_time
+            self.log_metrics(model, "response_times", elapsed)
+            self.log_response_headers(model, response.headers, elapsed)
+            self.log_network_phases(model, phases)
+
+            if verbosity:
+                print(f"#### _Generated in *{elapsed:.2f}* seconds_")
+                print(response.json())
+            return elapsed
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"Error during inference: {e}")
+            return None
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        """
+        Sends a streaming inference request to the server asynchronously.
+        """
+        parser = SSEParser()
+
+        try:
+            client = self.get_async_client()
+            phases = PhaseTimer()
+            start_ns = time.perf_counter_ns()
+            async with client.stream(
+                "POST",
+                self.endpoint(),
+                headers=self.request_headers(),
+                json=self.request_body(model, prompt, max_output, stream=True),
+                timeout=100,
+                extensions={"trace": phases.trace},
+            ) as response:
+                self.check_throttled(response)
+                capture = StreamCapture()
+                add = capture.add
+                async for chunk in response.aiter_bytes():
+                    add(chunk)
+            parser.replay(capture)
+
+            result = self.finish_stream(model, parser, start_ns, verbosity, response.headers)
+            self.log_network_phases(model, phases, parser.arrivals[0])
+            return result
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"Error during streaming inference: {e}")
+            return None, None
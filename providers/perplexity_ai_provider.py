@@ -1,8 +1,8 @@
 import os
 from timeit import default_timer as timer
-import numpy as np
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from providers.base_provider import BaseProvider
+from providers.stream_capture import StreamCapture
 
 
 class PerplexityAI(BaseProvider):
@@ -23,7 +23,10 @@ class PerplexityAI(BaseProvider):
         base_url = "https://api.perplexity.ai"
 
         super().__init__(
-            api_key=perplexity_api, client_class=client_class, base_url=base_url
+            api_key=perplexity_api,
+            client_class=client_class,
+            base_url=base_url,
+            async_client_class=AsyncOpenAI,
         )
         # model names mapping
         self.model_map = {
@@ -33,6 +36,13 @@ class PerplexityAI(BaseProvider):
             "common-model": "sonar-pro",
         }
 
+    def reported_tokens(self, chunks):
+        """Perplexity reports the cumulative completion tokens in every chunk."""
+        for chunk in reversed(chunks):
+            if getattr(chunk, "usage", None) is not None:
+                return chunk.usage.completion_tokens
+        return None
+
     def perform_inference_streaming(
         self, model, prompt, max_output=100, verbosity=True
     ):
@@ -40,12 +50,12 @@ class PerplexityAI(BaseProvider):
             model_id = self.get_model_name(model)
             if model_id is None:
                 raise ValueError(f"Model {model} not available for provider.")
-            first_token_time = None
-            inter_token_latencies = []
-            total_tokens = 0
+            capture = StreamCapture(timer, 1)
+            add = capture.add
 
             start = timer()
-            response = self.client.chat.completions.create(
+            response, headers = self.create_with_headers(
+                self.client.chat.completions,
                 model=model_id,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -55,63 +65,47 @@ class PerplexityAI(BaseProvider):
                 max_tokens=max_output,
                 timeout=500
             )
-            previous_completion_tokens = 0  # Initialize previous token count
 
             for chunk in response:
-                current_completion_tokens = chunk.usage.completion_tokens
-                new_tokens = current_completion_tokens - previous_completion_tokens
-                previous_completion_tokens = current_completion_tokens
-                if first_token_time is None:
-                    first_token_time = timer()
-                    ttft = first_token_time - start
-                    prev_token_time = first_token_time
-                    if verbosity:
-                        print(f"\nTime to First Token (TTFT): {ttft:.4f} seconds\n")
-
-                if chunk.choices[0].finish_reason:
-                    elapsed = timer() - start
-                    if verbosity:
-                        print(f"\nTotal Response Time: {elapsed:.4f} seconds")
-                    break
-
-                time_to_next_token = timer()
-                inter_token_latency = (time_to_next_token - prev_token_time) / max(
-                    1, new_tokens
-                )
-                prev_token_time = time_to_next_token
-                for _ in range(new_tokens):
-                    inter_token_latencies.append(inter_token_latency)
-
-                total_tokens += new_tokens
-
-                print(chunk.choices[0].delta.content or "", end="")
-                # Print the content of the chunk if verbosity is enabled
-                # if verbosity:
-                #     if len(inter_token_latencies) < 20:
-                #         print(chunk.choices[0].delta.content or "", end="", flush=True)
-                #     elif len(inter_token_latencies) == 20:
-                #         print("...")
-
-            if verbosity:
-                print(
-                    f"\nNumber of output tokens: {total_tokens}, "
-                    f"Time to First Token (TTFT): {ttft:.4f} seconds, "
-                    f"Total Response Time: {elapsed:.4f} seconds"
-                )
-            # Log metrics
-            self.log_metrics(model, "timetofirsttoken", ttft)
-            self.log_metrics(model, "response_times", elapsed)
-            avg_tbt = sum(inter_token_latencies) / len(inter_token_latencies)
-            self.log_metrics(model, "timebetweentokens", avg_tbt)
-
-            # Calculate additional latency metrics
-            median = np.median(inter_token_latencies) if inter_token_latencies else 0
-            p95 = np.percentile(inter_token_latencies, 95) if inter_token_latencies else 0
-            self.log_metrics(model, "timebetweentokens_median", median)
-            self.log_metrics(model, "timebetweentokens_p95", p95)
-            self.log_metrics(model, "totaltokens", total_tokens)
-            self.log_metrics(model, "tps", total_tokens / elapsed if elapsed > 0 else 0)
+                add(chunk)
+
+            self.finish_stream(model, capture, start, headers, verbosity)
+
+        except Exception as e:
+            self.raise_if_throttled(e)
+            print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
+            return None, None
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output=100, verbosity=True
+    ):
+        try:
+            model_id = self.get_model_name(model)
+            if model_id is None:
+                raise ValueError(f"Model {model} not available for provider.")
+            client = self.get_async_client()
+            capture = StreamCapture(timer, 1)
+            add = capture.add
+
+            start = timer()
+            response, headers = await self.create_with_headers_async(
+                client.chat.completions,
+                model=model_id,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+                max_tokens=max_output,
+                timeout=500
+            )
+
+            async for chunk in response:
+                add(chunk)
+
+            self.finish_stream(model, capture, start, headers, verbosity)
 
         except Exception as e:
+            self.raise_if_throttled(e)
             print(f"[ERROR] Streaming inference failed for model '{model}': {e}")
             return None, None
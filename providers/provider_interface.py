@@ -1,9 +1,42 @@
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
+import httpx
+import numpy as np
+import requests
+from providers.network_timing import NETWORK_PHASES, TimedHTTPAdapter, TimedTransport
+from providers.response_headers import (
+    CAPTURED_HEADERS,
+    SERVER_TIMING_METRICS,
+    capture_headers,
+    server_processing_time,
+)
+from providers.throttling import THROTTLE_STATUS_CODES, as_throttled_error
+from providers.token_attribution import (
+    CHUNK_METRICS,
+    chunk_token_counts,
+    model_family,
+    token_latencies,
+)
 
 
 # create an interface for providers (abstract class)
 class ProviderInterface(ABC):
 
+    # token-bucket limits applied by the benchmark, e.g.
+    # {"requests_per_minute": 30, "tokens_per_minute": 6000}; None means unlimited
+    rate_limits = None
+
+    # connection handling of raw-HTTP providers, see configure_http
+    CONNECTION_MODES = ("warm", "cold")
+    connection_mode = "warm"
+    pool_size = 10
+    keep_alive = True
+    http2 = False
+
+    # response headers kept per request, see log_response_headers
+    captured_headers = CAPTURED_HEADERS
+
     def __init__(self):
         """
         Initializes the Provider with the necessary API key and client.
@@ -24,6 +57,20 @@ class ProviderInterface(ABC):
             "timebetweentokens_median": {},
             "timebetweentokens_p95": {},
         }
+        self.metrics.update({metric: {} for metric in CHUNK_METRICS})
+        # network phases of the time to first token, see log_network_phases
+        self.metrics.update({phase: {} for phase in NETWORK_PHASES})
+        self.metrics.update({metric: {} for metric in SERVER_TIMING_METRICS})
+        # allow-listed response headers of every request, per model
+        self.response_headers = {}
+        # samples of unmeasured warm-up requests, kept apart from metrics
+        self.warmup_metrics = {}
+
+        # async client, created lazily for the event loop that uses it
+        self._async_client = None
+        self._async_client_loop = None
+        # HTTP versions negotiated by the async clients, see transport()
+        self.http_versions = set()
 
     def log_metrics(self, model_name, metric, value):
         """
@@ -31,10 +78,335 @@ class ProviderInterface(ABC):
         """
         if metric not in self.metrics:
             raise ValueError(f"Metric type '{metric}' is not defined.")
-        if model_name not in self.metrics[metric]:
-            self.metrics[metric][model_name] = []
+        # setdefault keeps list creation atomic when requests run concurrently
+        self.metrics[metric].setdefault(model_name, []).append(value)
+
+    def log_streaming_metrics(
+        self,
+        model_name,
+        ttft,
+        total_time,
+        inter_token_latencies,
+        total_tokens=None,
+        chunk_texts=None,
+    ):
+        """
+        Logs the standard set of streaming metrics for one request.
+
+        The gaps between chunks are logged as the timebetweenchunks metrics.
+        When the text of every chunk is given, the tokens of each chunk are
+        counted with the model's tokenizer and each gap is spread over the
+        tokens of the chunk it ends, giving per-token timebetweentokens
+        metrics; otherwise every chunk counts as one token.
+
+        Args:
+            model_name (str): The model alias the request was sent to.
+            ttft (float): Time to first token in seconds.
+            total_time (float): End-to-end response time in seconds.
+            inter_token_latencies (list): Gaps between consecutive chunks in seconds.
+            total_tokens (int, optional): Output tokens reported by the provider;
+                defaults to the tokens counted, or the chunks received.
+            chunk_texts (list, optional): Text of every chunk, one more entry
+                than inter_token_latencies.
+        """
+        per_token = inter_token_latencies
+        if chunk_texts is not None and len(chunk_texts) == len(inter_token_latencies) + 1:
+            chunk_tokens = chunk_token_counts(
+                chunk_texts, model_family(self.get_model_name(model_name)), total_tokens
+            )
+            per_token = token_latencies(inter_token_latencies, chunk_tokens)
+            total_tokens = sum(chunk_tokens)
+        if total_tokens is None:
+            total_tokens = len(inter_token_latencies) + 1
+        self.log_metrics(model_name, "timetofirsttoken", ttft)
+        self.log_metrics(model_name, "response_times", total_time)
+        self.log_latency_stats(model_name, "timebetweentokens", per_token)
+        self.log_latency_stats(model_name, "timebetweenchunks", inter_token_latencies)
+        self.log_metrics(model_name, "totaltokens", total_tokens)
+        self.log_metrics(
+            model_name, "tps", total_tokens / total_time if total_time > 0 else 0
+        )
+
+    def log_latency_stats(self, model_name, metric, latencies):
+        """
+        Logs the mean, median and p95 of one request's latencies as metric,
+        metric_median and metric_p95; nothing is logged for an empty list.
+        """
+        if not latencies:
+            return
+        self.log_metrics(model_name, metric, sum(latencies) / len(latencies))
+        self.log_metrics(model_name, f"{metric}_median", np.percentile(latencies, 50))
+        self.log_metrics(model_name, f"{metric}_p95", np.percentile(latencies, 95))
+
+    def log_network_phases(self, model_name, timer, first_token_ns=None):
+        """
+        Logs the network phase breakdown of one request traced by a PhaseTimer.
+
+        Args:
+            model_name (str): The model alias the request was sent to.
+            timer (PhaseTimer): The timer passed as the request's trace extension.
+            first_token_ns (int, optional): perf_counter_ns() of the first streamed
+                event, which closes the prefill phase.
+        """
+        for phase, value in timer.phases(first_token_ns).items():
+            self.log_metrics(model_name, phase, value)
+
+    def log_response_headers(self, model_name, headers, client_time, server_timing=None):
+        """
+        Keeps the allow-listed headers of one response and splits its latency.
+
+        When a header, or else the server timing of the response body, reports
+        the server's processing time, it is logged as server_processing_time
+        and the rest of client_time as network_overhead.
+
+        Args:
+            model_name (str): The model alias the request was sent to.
+            headers (Mapping): The response headers.
+            client_time (float): Client-side latency the server time is part of:
+                the response time, or the time to first token of a stream, whose
+                headers are sent before the first event.
+            server_timing (dict, optional): Timings in seconds the response body
+                reported, such as Groq's x_groq usage; its "server_time" entry
+                covers the same span as client_time.
+        """
+        captured = capture_headers(headers, self.captured_headers)
+        if not captured and not server_timing:
+            return
+        record = {"client_time": client_time, "headers": captured}
+        server_time = server_processing_time(captured)
+        if server_timing:
+            record["server_timing"] = server_timing
+            if server_time is None:
+                server_time = server_timing.get("server_time")
+        if server_time is not None:
+            record["server_time"] = server_time
+            self.log_metrics(model_name, "server_processing_time", server_time)
+            self.log_metrics(model_name, "network_overhead", client_time - server_time)
+        self.response_headers.setdefault(model_name, []).append(record)
+
+    @staticmethod
+    def create_with_headers(resource, **kwargs):
+        """
+        Calls resource.create() of an SDK and returns the result with its headers.
+
+        Uses the SDK's raw-response wrapper; SDKs without one return no headers.
+
+        Args:
+            resource: SDK resource such as client.chat.completions or client.messages.
+
+        Returns:
+            tuple: The parsed result and the response headers.
+        """
+        if not hasattr(resource, "with_raw_response"):
+            return resource.create(**kwargs), {}
+        raw = resource.with_raw_response.create(**kwargs)
+        return raw.parse(), raw.headers
+
+    @staticmethod
+    async def create_with_headers_async(resource, **kwargs):
+        """
+        Async version of create_with_headers.
+        """
+        if not hasattr(resource, "with_raw_response"):
+            return await resource.create(**kwargs), {}
+        raw = await resource.with_raw_response.create(**kwargs)
+        parsed = raw.parse()
+        # newer SDK response wrappers parse asynchronously
+        if inspect.isawaitable(parsed):
+            parsed = await parsed
+        return parsed, raw.headers
+
+    def raise_if_throttled(self, exc):
+        """
+        Re-raises rate-limit errors as ThrottledError.
+
+        Called first in every blanket exception handler, so throttled requests
+        reach the benchmark's retry layer instead of being printed and dropped.
+        """
+        throttled = as_throttled_error(exc)
+        if throttled is not None:
+            raise throttled from exc
+
+    @staticmethod
+    def check_throttled(response):
+        """
+        Raises for a throttled HTTP response before its body is read as output.
+        """
+        if response.status_code in THROTTLE_STATUS_CODES:
+            response.raise_for_status()
+
+    def configure_http(self, mode="warm", pool_size=10, keep_alive=True, http2=False):
+        """
+        Sets how raw-HTTP providers manage their connections.
+
+        In "warm" mode connections are kept alive and reused, so only the first
+        request to a host pays for the TCP and TLS handshakes. "cold" mode opens
+        a new connection for every request, so each measurement includes them.
+
+        Args:
+            mode (str, optional): "warm" or "cold". Defaults to "warm".
+            pool_size (int, optional): Connections kept open per host. Defaults to 10.
+            keep_alive (bool, optional): Reuse connections in warm mode. Defaults to True.
+            http2 (bool, optional): Let the async clients negotiate HTTP/2, so
+                concurrent streams share one connection. Defaults to False.
+        """
+        if mode not in self.CONNECTION_MODES:
+            raise ValueError(
+                f"Connection mode '{mode}' is not supported. Choose from {self.CONNECTION_MODES}."
+            )
+        self.connection_mode = mode
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive and mode != "cold"
+        self.http2 = http2
+        if getattr(self, "session", None) is not None:
+            self.session.close()
+            self.session = self.create_session()
+        self._async_client = None
+
+    def create_session(self):
+        """
+        Creates the pooled requests session used by raw-HTTP providers.
+
+        The session is created once per provider, so keep-alive connections
+        are reused across requests instead of being opened for every call.
+        Requests sent within PhaseTimer.measure() get their network phases timed.
+        """
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def create_http_client(self):
+        """
+        Creates the httpx client behind the async inference methods.
+
+        The number of connections is not capped, so the client never queues
+        requests the benchmark's concurrency allows. With http2 enabled,
+        concurrent streams are multiplexed over a shared connection. Requests
+        sent with a PhaseTimer as "trace" extension get their network phases timed.
+        """
+        # resolves host names in the backend so DNS time is measured on its own
+        transport = TimedTransport(
+            max_keepalive_connections=self.pool_size if self.keep_alive else 0,
+            http2=self.http2,
+        )
+        return httpx.AsyncClient(
+            timeout=500,
+            transport=transport,
+            event_hooks={"response": [self.record_http_version]},
+        )
+
+    def create_async_client(self):
+        """
+        Creates the async client used by the *_async inference methods.
+
+        Providers that talk to a raw HTTP endpoint use the httpx client directly;
+        SDK-based providers override this with the SDK's async client.
+        """
+        return self.create_http_client()
+
+    async def record_http_version(self, response):
+        """Notes the HTTP version of a response received by the httpx client."""
+        self.http_versions.add(response.http_version)
+
+    def transport(self):
+        """
+        Returns the HTTP version(s) the provider's requests were sent over.
+
+        Requests that did not go through create_http_client (the synchronous
+        paths and SDK default clients) use HTTP/1.1.
+        """
+        return ", ".join(sorted(self.http_versions)) or "HTTP/1.1"
+
+    def get_async_client(self):
+        """
+        Returns the async client bound to the running event loop.
+
+        Async clients pool connections per event loop, so a new client is
+        created whenever the benchmark starts a new loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = self.create_async_client()
+            self._async_client_loop = loop
+        return self._async_client
+
+    def connection_url(self, model):  # pylint: disable=unused-argument
+        """
+        Returns a URL on the host serving a model, used to open connections early.
+
+        None for providers whose connections are managed by an SDK client.
+        """
+        return None
+
+    def set_base_url(self, base_url):  # pylint: disable=unused-argument
+        """
+        Points the provider's requests at another server speaking its API.
+
+        Used to send requests to a local stand-in server; providers whose
+        requests cannot be redirected leave their settings unchanged.
+
+        Args:
+            base_url (str | None): Base URL of the server; None restores the default.
+
+        Returns:
+            bool: False if the provider cannot be redirected.
+        """
+        return False
+
+    def warm_connection(self, model):
+        """
+        Opens the pooled session's connection to a model's host without a request.
+
+        DNS, TCP and TLS are paid here, outside the measured window; any HTTP
+        response will do, since only the connection is kept.
+
+        Returns:
+            bool: False if the provider has no connection to warm.
+        """
+        url = self.connection_url(model)
+        if url is None or getattr(self, "session", None) is None:
+            return False
+        try:
+            self.session.head(url, timeout=30)
+        except Exception as e:
+            print(f"[ERROR] Warm-up connection to {url} failed: {e}")
+        return True
 
-        self.metrics[metric][model_name].append(value)
+    async def warm_connection_async(self, model):
+        """
+        Async variant of warm_connection, warming the async client's pool.
+        """
+        url = self.connection_url(model)
+        if url is None:
+            return False
+        try:
+            await self.get_async_client().head(url, timeout=30)
+        except Exception as e:
+            print(f"[ERROR] Warm-up connection to {url} failed: {e}")
+        return True
+
+    async def perform_inference_async(self, model, prompt, *args, **kwargs):
+        """
+        Async variant of perform_inference.
+
+        Providers without an async client run the synchronous path in a
+        worker thread, so timing is still taken around the blocking call.
+        """
+        return await asyncio.to_thread(
+            self.perform_inference, model, prompt, *args, **kwargs
+        )
+
+    async def perform_inference_streaming_async(self, model, prompt, *args, **kwargs):
+        """
+        Async variant of perform_inference_streaming.
+        """
+        return await asyncio.to_thread(
+            self.perform_inference_streaming, model, prompt, *args, **kwargs
+        )
 
     @abstractmethod
     def perform_inference(self, model, prompt):
@@ -0,0 +1,94 @@
+"""
+Registry of provider names, importing and constructing each provider only when selected.
+"""
+from importlib import import_module
+
+# config name -> "module:class"; a provider's SDK is imported with its module
+PROVIDER_PATHS = {
+    "TogetherAI": "providers.together_ai_provider:TogetherAI",
+    "Cloudflare": "providers.cloudflare_provider:Cloudflare",
+    "OpenAI": "providers.open_ai_provider:Open_AI",
+    "PerplexityAI": "providers.perplexity_ai_provider:PerplexityAI",
+    "Hyperbolic": "providers.hyperbolic_provider:Hyperbolic",
+    "Google": "providers.google_provider:GoogleGemini",
+    "Anthropic": "providers.anthropic_provider:Anthropic",
+    "Groq": "providers.groq_provider:GroqProvider",
+    "Azure": "providers.azure_provider:Azure",
+    "AWSBedrock": "providers.aws_provider:AWSBedrock",
+    "vLLM": "providers.vllm_provider:vLLM",
+}
+
+# config name -> OpenAICompatible settings of the endpoints a config defines
+_endpoints = {}
+_instances = {}
+
+
+def provider_names():
+    """Returns the names providers are selected by in a config."""
+    return list(PROVIDER_PATHS) + [name for name in _endpoints if name not in PROVIDER_PATHS]
+
+
+def register_endpoint(name, settings):
+    """
+    Registers an OpenAI-compatible server under a provider name.
+
+    A registered name takes precedence over a built-in provider of the same name.
+
+    Args:
+        name (str): The name the endpoint is selected by in "providers".
+        settings (dict): OpenAICompatible arguments, e.g.
+            {"base_url": "http://10.0.0.5:30000/v1", "mode": "chat",
+            "models": {"common-model": "meta-llama/Llama-3.1-8B-Instruct"}}.
+    """
+    _endpoints[name] = dict(settings)
+    _instances.pop(name, None)
+
+
+def load_provider_class(name):
+    """
+    Imports the module of a provider and returns its class.
+
+    Args:
+        name (str): The provider's config name, e.g. "OpenAI".
+
+    Returns:
+        type: The provider class.
+    """
+    if name not in PROVIDER_PATHS:
+        raise ValueError(f"Unknown provider '{name}'. Choose from {provider_names()}.")
+    module_path, class_name = PROVIDER_PATHS[name].split(":")
+    return getattr(import_module(module_path), class_name)
+
+
+def get_provider(name):
+    """
+    Returns the provider instance for a config name, constructing it on first use.
+
+    Instances are cached, so every lookup of a name returns the same provider
+    and its metrics.
+
+    Args:
+        name (str): The provider's config name.
+
+    Returns:
+        The provider instance, with config_name set to name.
+    """
+    if name not in _instances:
+        if name in _endpoints:
+            module = import_module("providers.openai_compatible_provider")
+            # results and plots are labelled by class name, so each endpoint
+            # gets a subclass named after it to keep them apart
+            endpoint_class = type(name, (module.OpenAICompatible,), {})
+            provider = endpoint_class(**_endpoints[name])
+        else:
+            provider = load_provider_class(name)()
+        # per-provider config sections are keyed by this name
+        provider.config_name = name
+        _instances[name] = provider
+    return _instances[name]
+
+
+def clear_providers():
+    """Drops the cached provider instances and the registered endpoints."""
+    _instances.clear()
+    _endpoints.clear()
@@ -0,0 +1,105 @@
+"""
+Server-side timing and request-ID headers kept from provider responses.
+"""
+import re
+
+# headers kept by default; names are matched case-insensitively
+CAPTURED_HEADERS = (
+    "openai-processing-ms",
+    "x-request-id",
+    "request-id",
+    "cf-ray",
+    "server-timing",
+    "x-groq-region",
+    "x-amzn-requestid",
+    "x-amzn-bedrock-invocation-latency",
+)
+
+# metrics logged when a response reports how long the server worked on it
+SERVER_TIMING_METRICS = ("server_processing_time", "network_overhead")
+
+# headers that carry the server's processing time in milliseconds
+MILLISECOND_HEADERS = ("openai-processing-ms", "x-amzn-bedrock-invocation-latency")
+
+# timings in seconds of the usage block Groq adds to response bodies
+GROQ_USAGE_TIMINGS = ("queue_time", "prompt_time", "completion_time", "total_time")
+
+_SERVER_TIMING_DUR = re.compile(r";\s*dur=([0-9.]+)")
+
+
+def capture_headers(headers, allowed):
+    """
+    Picks the allow-listed headers out of a response.
+
+    Args:
+        headers (Mapping): Response headers; requests and httpx look names up
+            case-insensitively, and botocore already lower-cases them.
+        allowed (iterable): Header names to keep.
+
+    Returns:
+        dict: The values found, keyed by lower-cased header name.
+    """
+    captured = {}
+    for name in allowed:
+        value = headers.get(name.lower())
+        if value is not None:
+            captured[name.lower()] = value
+    return captured
+
+
+def server_processing_time(headers):
+    """
+    Reads the server's processing time from captured headers.
+
+    Millisecond headers such as openai-processing-ms are used first; otherwise
+    the longest "dur" of a Server-Timing header, which covers the others when
+    the server reports nested spans.
+
+    Args:
+        headers (dict): Headers from capture_headers().
+
+    Returns:
+        float | None: Seconds, or None if no header reports the time.
+    """
+    for name in MILLISECOND_HEADERS:
+        if name in headers:
+            try:
+                return float(headers[name]) / 1000
+            except ValueError:
+                continue
+    durations = _SERVER_TIMING_DUR.findall(headers.get("server-timing", ""))
+    if durations:
+        return max(float(duration) for duration in durations) / 1000
+    return None
+
+
+def groq_server_timing(usage, streaming):
+    """
+    Reads the server timing of Groq's usage block.
+
+    Non-streaming responses carry it as their usage, streams in the x_groq
+    usage of their last chunk. The server time of a response is its
+    total_time; that of a stream, whose client-side time is the time to first
+    token, is the queue and prompt time before the first token.
+
+    Args:
+        usage: The usage object of the response or of the last chunk's x_groq.
+        streaming (bool): Whether the usage belongs to a stream.
+
+    Returns:
+        dict | None: The timings found and their "server_time", or None
+        without any.
+    """
+    timing = {
+        name: getattr(usage, name)
+        for name in GROQ_USAGE_TIMINGS
+        if getattr(usage, name, None) is not None
+    }
+    if not timing:
+        return None
+    if streaming:
+        if "queue_time" in timing and "prompt_time" in timing:
+            timing["server_time"] = timing["queue_time"] + timing["prompt_time"]
+    elif "total_time" in timing:
+        timing["server_time"] = timing["total_time"]
+    return timing
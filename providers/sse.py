@@ -0,0 +1,137 @@
+"""
+Incremental server-sent events parser shared by the raw-HTTP streaming providers.
+"""
+import json
+import time
+import numpy as np
+
+NS_PER_SECOND = 1e9
+
+
+class SSEParser:
+    """
+    Splits an SSE byte stream into data events as the bytes arrive.
+
+    Every network chunk is stamped with perf_counter_ns() before it is looked
+    at, or replayed with the stamp a StreamCapture gave it, and all events
+    completed by that chunk share the stamp. Lines are
+    located in a single reusable buffer with bytes methods, and payloads are
+    kept as raw bytes; decoding and JSON parsing are deferred to events(),
+    after the stream has ended, so the per-chunk work in the timed loop is
+    the same for every provider.
+
+    LLM APIs send one "data:" line per event, so each data line is taken as an
+    event; comments, blank lines and other fields are skipped.
+
+    Attributes:
+        payloads (list): Raw payload of every data event, without "[DONE]".
+        arrivals (list): perf_counter_ns() stamp of every payload.
+        done (bool): Whether the "[DONE]" sentinel has been received.
+        done_ns (int | None): perf_counter_ns() stamp of the sentinel.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.payloads = []
+        self.arrivals = []
+        self.done = False
+        self.done_ns = None
+
+    def feed(self, chunk, arrival=None):
+        """
+        Adds a chunk of the response body and collects the events it completes.
+
+        Args:
+            chunk (bytes): Bytes as received from the connection.
+            arrival (int, optional): perf_counter_ns() stamp the chunk arrived
+                at; defaults to now.
+
+        Returns:
+            int: The perf_counter_ns() stamp of the chunk.
+        """
+        if arrival is None:
+            arrival = time.perf_counter_ns()
+        buffer = self.buffer
+        buffer += chunk
+        start = 0
+        while not self.done:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line_end = end - 1 if end > start and buffer[end - 1] == 13 else end
+            if buffer.startswith(b"data:", start, line_end):
+                payload_start = start + 5
+                if payload_start < line_end and buffer[payload_start] == 32:
+                    payload_start += 1
+                payload = bytes(buffer[payload_start:line_end])
+                if payload == b"[DONE]":
+                    self.done = True
+                    self.done_ns = arrival
+                else:
+                    self.payloads.append(payload)
+                    self.arrivals.append(arrival)
+            start = end + 1
+        del buffer[:start]
+        return arrival
+
+    def replay(self, capture):
+        """
+        Parses the chunks of a closed stream with the stamps they were captured at.
+
+        Args:
+            capture (StreamCapture): Chunks captured with perf_counter_ns().
+        """
+        for arrival, chunk in capture:
+            self.feed(chunk, arrival)
+            if self.done:
+                break
+
+    def timings(self, start_ns, end_ns=None):
+        """
+        Computes the latency metrics of the stream.
+
+        Args:
+            start_ns (int): perf_counter_ns() taken when the request was sent.
+            end_ns (int, optional): End of the response; defaults to the "[DONE]"
+                sentinel, or the last event if there was none.
+
+        Returns:
+            tuple: Time to first token, the inter-token latencies and the total
+            response time, all in seconds.
+        """
+        if not self.arrivals:
+            raise ValueError("The stream ended before the first event.")
+        end_ns = end_ns or self.done_ns or self.arrivals[-1]
+        ttft = (self.arrivals[0] - start_ns) / NS_PER_SECOND
+        inter_token_latencies = (np.diff(self.arrivals) / NS_PER_SECOND).tolist()
+        return ttft, inter_token_latencies, (end_ns - start_ns) / NS_PER_SECOND
+
+    def events(self):
+        """
+        Decodes the JSON payloads received; payloads that are not JSON are skipped.
+        """
+        events = []
+        for payload in self.payloads:
+            try:
+                events.append(json.loads(payload))
+            except ValueError:
+                continue
+        return events
+
+    def texts(self, extract):
+        """
+        Decodes the text of every payload received, aligned with arrivals.
+
+        Args:
+            extract (callable): Returns the text of one decoded JSON event.
+
+        Returns:
+            list: The text of every payload; "" for payloads without text.
+        """
+        texts = []
+        for payload in self.payloads:
+            try:
+                texts.append(extract(json.loads(payload)) or "")
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                texts.append("")
+        return texts
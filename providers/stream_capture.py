@@ -0,0 +1,96 @@
+"""
+Capture buffer for the timed loop of a streamed response.
+"""
+import time
+
+NS_PER_SECOND = 1e9
+
+# slots preallocated per stream; long streams grow the buffer by doubling
+DEFAULT_CAPACITY = 1024
+
+
+class StreamCapture:
+    """
+    Records the arrival time of every chunk of a stream and nothing else.
+
+    The timed loop only stamps each chunk and keeps a reference to it in a
+    preallocated buffer; decoding, printing and metric computation are left
+    for after the stream has closed, so the measured gaps contain no work of
+    the benchmark itself.
+
+    Attributes:
+        clock (callable): Clock the chunks are stamped with.
+        ticks_per_second (float): Clock units per second.
+        count (int): Number of chunks captured.
+    """
+
+    __slots__ = ("clock", "ticks_per_second", "stamps", "chunks", "count")
+
+    def __init__(
+        self,
+        clock=time.perf_counter_ns,
+        ticks_per_second=NS_PER_SECOND,
+        capacity=DEFAULT_CAPACITY,
+    ):
+        """
+        Initializes an empty capture.
+
+        Args:
+            clock (callable, optional): Clock to stamp chunks with. Defaults to
+                time.perf_counter_ns.
+            ticks_per_second (float, optional): Units of clock per second.
+                Defaults to 1e9; pass 1 for clocks that return seconds.
+            capacity (int, optional): Chunks preallocated. Defaults to 1024.
+        """
+        self.clock = clock
+        self.ticks_per_second = ticks_per_second
+        self.stamps = [0] * capacity
+        self.chunks = [None] * capacity
+        self.count = 0
+
+    def add(self, chunk):
+        """Stamps a chunk and keeps a reference to it."""
+        stamp = self.clock()
+        i = self.count
+        if i == len(self.stamps):
+            self.stamps.extend([0] * i)
+            self.chunks.extend([None] * i)
+        self.stamps[i] = stamp
+        self.chunks[i] = chunk
+        self.count = i + 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yields (stamp, chunk) pairs in arrival order."""
+        return zip(self.stamps[: self.count], self.chunks[: self.count])
+
+    def captured(self):
+        """Returns the chunks captured, in arrival order."""
+        return self.chunks[: self.count]
+
+    def timings(self, start, stop=None, end=None):
+        """
+        Computes the latency metrics of the chunks before index stop.
+
+        Args:
+            start: Clock value taken when the request was sent.
+            stop (int, optional): Index of the first chunk not counted, e.g. a
+                finish chunk; defaults to all chunks.
+            end (optional): Clock value the response ended at; defaults to the
+                stamp of chunk stop, or the last chunk.
+
+        Returns:
+            tuple: Time to first token, the gaps between consecutive chunks and
+            the total response time, all in seconds.
+        """
+        stop = self.count if stop is None else stop
+        if stop == 0:
+            raise ValueError("The stream ended before the first chunk.")
+        if end is None:
+            end = self.stamps[stop] if stop < self.count else self.stamps[stop - 1]
+        scale = self.ticks_per_second
+        stamps = self.stamps[:stop]
+        gaps = [(b - a) / scale for a, b in zip(stamps, stamps[1:])]
+        return (stamps[0] - start) / scale, gaps, (end - start) / scale
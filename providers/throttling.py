@@ -0,0 +1,90 @@
+"""
+Recognition of rate-limit responses across the provider SDKs.
+"""
+import time
+from email.utils import parsedate_to_datetime
+
+# 429 Too Many Requests, 529 Anthropic "overloaded"
+THROTTLE_STATUS_CODES = {429, 529}
+# botocore error codes returned by Bedrock when throttled
+BOTO_THROTTLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+}
+
+
+class ThrottledError(Exception):
+    """
+    Raised by a provider when a request was rejected for rate limiting.
+
+    Attributes:
+        status_code (int | None): HTTP status of the rejected request, if known.
+        retry_after (float | None): Seconds the provider asked us to wait, if given.
+    """
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _status_and_headers(exc):
+    """Extracts the HTTP status and response headers from an SDK exception."""
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        # botocore ClientError
+        error_code = response.get("Error", {}).get("Code")
+        metadata = response.get("ResponseMetadata", {})
+        status = 429 if error_code in BOTO_THROTTLE_CODES else metadata.get("HTTPStatusCode")
+        return status, metadata.get("HTTPHeaders", {})
+    if response is not None and hasattr(response, "status_code"):
+        # openai / anthropic / groq status errors, requests and httpx errors
+        return response.status_code, response.headers
+    # together errors carry http_status, google api_core errors carry code
+    status = getattr(exc, "status_code", None) or getattr(exc, "http_status", None)
+    if status is None and isinstance(getattr(exc, "code", None), int):
+        status = exc.code
+    return status, getattr(exc, "headers", None) or {}
+
+
+def parse_retry_after(headers):
+    """
+    Parses the wait time a provider requested in its response headers.
+
+    Supports "retry-after-ms", and "retry-after" given in seconds or as an HTTP date.
+
+    Returns:
+        float | None: Seconds to wait, or None if no usable header is present.
+    """
+    headers = {key.lower(): value for key, value in dict(headers or {}).items()}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            value = headers["retry-after"]
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def as_throttled_error(exc):
+    """
+    Converts a provider exception into a ThrottledError when it signals rate limiting.
+
+    Args:
+        exc (Exception): The exception raised by an SDK or HTTP client.
+
+    Returns:
+        ThrottledError | None: The converted error, or None if exc is not a throttle.
+    """
+    if isinstance(exc, ThrottledError):
+        return exc
+    status, headers = _status_and_headers(exc)
+    if status not in THROTTLE_STATUS_CODES and "RateLimit" not in type(exc).__name__:
+        return None
+    return ThrottledError(str(exc), status_code=status, retry_after=parse_retry_after(headers))
@@ -1,5 +1,5 @@
 import os
-from together import Together
+from together import AsyncTogether, Together
 from providers.base_provider import BaseProvider
 
 
@@ -9,7 +9,11 @@ class TogetherAI(BaseProvider):
         Initializes the AnthropicProvider with the necessary API key and client.
         """
         together_api = os.environ["TOGETHER_AI_API"]
-        super().__init__(api_key=together_api, client_class=Together)
+        super().__init__(
+            api_key=together_api,
+            client_class=Together,
+            async_client_class=AsyncTogether,
+        )
 
         # model names
         self.model_map = {
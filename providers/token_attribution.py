@@ -0,0 +1,139 @@
+"""
+Post-stream attribution of output tokens to the chunks of a streamed response.
+
+Providers put an unknown number of tokens in each streamed chunk, so counting
+chunks as tokens makes TBT and tps incomparable across providers. Once a
+stream has closed, the text of every chunk is tokenized locally and the gap
+before each chunk is spread over the tokens it carried.
+"""
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # optional, see approximate_tokenizer
+    tiktoken = None
+
+# per-chunk counterparts of the timebetweentokens metrics
+CHUNK_METRICS = ("timebetweenchunks", "timebetweenchunks_median", "timebetweenchunks_p95")
+
+# model ID prefix -> tiktoken encoding; other families use DEFAULT_ENCODING as
+# the closest locally available BPE vocabulary
+FAMILY_ENCODINGS = {
+    "gpt-4o": "o200k_base",
+    "gpt-4.1": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "gpt": "cl100k_base",
+}
+DEFAULT_ENCODING = "cl100k_base"
+
+# BPE pre-tokenization pieces: words with their leading space, up to three
+# digits, punctuation runs and whitespace
+_PIECES = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+")
+
+
+def model_family(model_id):
+    """
+    Returns the tokenizer family of a model ID.
+
+    Args:
+        model_id (str | None): The provider's model ID, e.g. "gpt-4o-mini".
+
+    Returns:
+        str: The tiktoken encoding name used for the model.
+    """
+    name = (model_id or "").lower().rsplit("/", 1)[-1]
+    for prefix, encoding in FAMILY_ENCODINGS.items():
+        if name.startswith(prefix):
+            return encoding
+    return DEFAULT_ENCODING
+
+
+def approximate_tokenizer(text):
+    """Counts BPE pre-tokenization pieces, used when tiktoken is unavailable."""
+    return len(_PIECES.findall(text))
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(family):
+    """
+    Returns a function counting the tokens of a text, loaded once per family.
+
+    Falls back to approximate_tokenizer when tiktoken is not installed or its
+    encoding cannot be loaded (it is downloaded on first use).
+
+    Args:
+        family (str): A family from model_family().
+
+    Returns:
+        callable: Maps a string to its number of tokens.
+    """
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding(family)
+            return lambda text: len(encoding.encode_ordinary(text))
+        except Exception as e:
+            print(f"Warning: tokenizer '{family}' unavailable, approximating: {e}")
+    return approximate_tokenizer
+
+
+def chunk_token_counts(texts, family=DEFAULT_ENCODING, total_tokens=None):
+    """
+    Works out how many tokens each chunk of a stream held.
+
+    Args:
+        texts (list): Text of every chunk, in arrival order.
+        family (str, optional): Tokenizer family of the model.
+        total_tokens (int, optional): Output tokens reported by the provider;
+            when given, the local counts are scaled to add up to it.
+
+    Returns:
+        list: The number of tokens of every chunk.
+    """
+    tokenize = get_tokenizer(family)
+    counts = [tokenize(text) if text else 0 for text in texts]
+    if not total_tokens or total_tokens == sum(counts):
+        return counts
+
+    weights = counts if sum(counts) else [len(text or "") for text in texts]
+    if not sum(weights):
+        return counts
+    # largest-remainder split, so the counts add up to the reported total
+    shares = [total_tokens * weight / sum(weights) for weight in weights]
+    scaled = [int(share) for share in shares]
+    by_remainder = sorted(
+        range(len(shares)), key=lambda i: shares[i] - scaled[i], reverse=True
+    )
+    for i in by_remainder[: total_tokens - sum(scaled)]:
+        scaled[i] += 1
+    return scaled
+
+
+def token_latencies(inter_chunk_latencies, chunk_tokens):
+    """
+    Spreads the gap before each chunk evenly over the tokens it carried.
+
+    Gaps before the first chunk with text are part of the time to first
+    token, and the gap before a chunk without tokens is carried over to the
+    next chunk that has some.
+
+    Args:
+        inter_chunk_latencies (list): Gaps between consecutive chunks in seconds.
+        chunk_tokens (list): Tokens of every chunk, one more entry than gaps.
+
+    Returns:
+        list: One latency per token after the first chunk with text.
+    """
+    latencies = []
+    started = chunk_tokens[0] > 0
+    carried = 0.0
+    for gap, tokens in zip(inter_chunk_latencies, chunk_tokens[1:]):
+        if not started:
+            started = tokens > 0
+            continue
+        carried += gap
+        if tokens > 0:
+            latencies.extend([carried / tokens] * tokens)
+            carried = 0.0
+    return latencies
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from benchmarking.arrivals import build_duration_schedule, build_schedule
+
+
+def test_poisson_schedule_is_seeded_and_increasing():
+    arrival = {"type": "poisson", "rate_qps": 5, "seed": 7}
+    schedule = build_schedule(arrival, 1000)
+
+    assert schedule[0] == 0.0
+    assert np.all(np.diff(schedule) >= 0)
+    np.testing.assert_array_equal(schedule, build_schedule(arrival, 1000))
+    # mean inter-arrival gap should be close to 1 / rate_qps
+    assert np.mean(np.diff(schedule)) == pytest.approx(0.2, rel=0.1)
+
+
+def test_constant_schedule():
+    schedule = build_schedule({"type": "constant", "rate_qps": 4}, 5)
+    np.testing.assert_allclose(schedule, [0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def test_invalid_arrival_config():
+    with pytest.raises(ValueError, match="not supported"):
+        build_schedule({"type": "bursty", "rate_qps": 1}, 3)
+    with pytest.raises(ValueError, match="rate_qps"):
+        build_schedule({"type": "poisson"}, 3)
+
+
+def test_duration_schedule_fills_window():
+    schedule = build_duration_schedule({"type": "constant", "rate_qps": 4}, 2.0)
+    np.testing.assert_allclose(schedule, np.arange(8) * 0.25)
+
+    poisson = build_duration_schedule({"type": "poisson", "rate_qps": 50, "seed": 1}, 10)
+    assert poisson[-1] < 10
+    assert len(poisson) == pytest.approx(500, rel=0.2)
+
+
+def test_duration_schedule_min_requests():
+    schedule = build_duration_schedule(
+        {"type": "constant", "rate_qps": 1}, 2.0, min_requests=5
+    )
+    assert len(schedule) == 5
@@ -70,10 +70,11 @@ def test_benchmark_initialization(setup_benchmark):
 @patch.object(MockProvider, "perform_inference_streaming", return_value=None)
 @patch.object(MockProvider, "perform_inference", return_value=None)
 def test_benchmark_run_non_streaming(
-    mock_perform_inference, mock_perform_inference_streaming, setup_benchmark
+    mock_perform_inference, mock_perform_inference_streaming, setup_benchmark, tmp_path
 ):
     """Test the Benchmark run method in non-streaming mode."""
     benchmark = setup_benchmark
+    benchmark.graph_dir = str(tmp_path)
     benchmark.run()
 
     # Ensure perform_inference was called for each provider, model, and request
@@ -87,7 +88,7 @@ def test_benchmark_run_non_streaming(
 @patch.object(MockProvider, "perform_inference_streaming", return_value=None)
 @patch.object(MockProvider, "perform_inference", return_value=None)
 def test_benchmark_run_streaming(
-    mock_perform_inference, mock_perform_inference_streaming
+    mock_perform_inference, mock_perform_inference_streaming, tmp_path
 ):
     """Test the Benchmark run method in streaming mode."""
     providers = [
@@ -97,6 +98,7 @@ def test_benchmark_run_streaming(
     benchmark = Benchmark(
         providers, 2, ["model_a"], 100, "Test prompt", streaming=True, verbosity=True
     )
+    benchmark.graph_dir = str(tmp_path)
     benchmark.run()
 
     # Ensure perform_inference_streaming was called for each provider, model, and request
@@ -126,3 +128,15 @@ def test_plot_metrics(mock_plt, mock_datetime, setup_benchmark):
     )
     mock_plt.savefig.assert_called_once_with(expected_filename)
     mock_plt.close.assert_called_once()
+
+
+@patch("benchmarking.benchmark_main.plt")
+def test_plot_metrics_skips_providers_without_the_metric(mock_plt, setup_benchmark):
+    """A provider that never dispatched a scheduled request has no dispatch_lateness."""
+    benchmark = setup_benchmark
+    benchmark.providers[0].metrics["dispatch_lateness"] = {"model_a": [0.001, 0.002]}
+
+    benchmark.plot_metrics("dispatch_lateness", "dispatch_lateness")
+
+    assert mock_plt.plot.call_count == 1
+    mock_plt.savefig.assert_called_once()
@@ -0,0 +1,62 @@
+import json
+import pytest
+from unittest.mock import patch
+from benchmarking.budget import RequestBudget
+from benchmarking.throughput import record_throughput, report_throughput
+
+
+class CountingProvider:
+    """Mock provider with pre-filled metrics."""
+
+    def __init__(self):
+        self.metrics = {
+            "response_times": {"model_a": [0.1, 0.1, 0.1]},
+            "totaltokens": {"model_a": [10, 10, 10]},
+        }
+
+    def get_model_name(self, model):
+        return f"{model}-name"
+
+
+def test_budget_counts_requests():
+    budget = RequestBudget(3)
+
+    assert [budget.take() for _ in range(5)] == [True, True, True, False, False]
+    assert budget.describe() == "3"
+
+
+@patch("benchmarking.budget.time.perf_counter")
+def test_budget_time_window(mock_perf_counter):
+    budget = RequestBudget(100, duration_s=10, min_requests=3)
+
+    mock_perf_counter.return_value = 0.0
+    assert budget.take()
+    mock_perf_counter.return_value = 9.9
+    assert budget.take()
+    # the window has closed, but min_requests is not reached yet
+    mock_perf_counter.return_value = 10.0
+    assert budget.take()
+    assert not budget.take()
+    assert budget.issued == 3
+
+
+def test_budget_rejects_bad_duration():
+    with pytest.raises(ValueError):
+        RequestBudget(1, duration_s=0)
+
+
+def test_record_and_report_throughput(tmp_path):
+    provider = CountingProvider()
+
+    record_throughput(provider, "model_a", (1, 10), 2.0)
+    summary = report_throughput([provider], str(tmp_path))
+
+    assert provider.metrics["request_rate"]["model_a"] == [1.0]
+    assert provider.metrics["token_throughput"]["model_a"] == [10.0]
+    assert summary == {
+        "CountingProvider": {
+            "model_a-name": {"request_rate": 1.0, "token_throughput": 10.0}
+        }
+    }
+    saved = json.loads(next(tmp_path.glob("throughput_*.json")).read_text())
+    assert saved == summary
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+from unittest.mock import patch
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.burst import BurstWorkload, burst_summary
+
+
+class QueueingProvider:
+    """Mock provider that serves one request at a time, 10 ms each."""
+
+    def __init__(self):
+        self.metrics = {"response_times": {}}
+        self.lock = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def get_model_name(self, model):
+        return model
+
+    async def perform_inference_async(self, model, prompt, max_output, verbosity):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = asyncio.get_running_loop().time()
+        async with self.lock:
+            await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        latency = asyncio.get_running_loop().time() - start
+        self.metrics["response_times"].setdefault(model, []).append(latency)
+
+
+def test_burst_summary():
+    summary = burst_summary([0.3, 0.1, 0.2], [5.0, 5.001, 5.0])
+
+    assert summary["latencies"] == [0.1, 0.2, 0.3]
+    assert summary["spread"] == pytest.approx(0.2)
+    assert summary["p50"] == pytest.approx(0.2)
+    assert summary["release_spread"] == pytest.approx(0.001)
+    assert burst_summary([], [1.0])["spread"] is None
+
+
+@patch("benchmarking.burst.plt")
+def test_bursts_are_released_together(mock_plt, tmp_path):
+    provider = QueueingProvider()
+    benchmark = Benchmark([provider], 1, ["model_a"], 100, "Test prompt")
+    benchmark.graph_dir = str(tmp_path)
+
+    workload = BurstWorkload(benchmark, size=4, interval_s=0.05, bursts=2)
+    spreads = workload.run()
+
+    results = workload.results[("QueueingProvider", "model_a")]
+    assert len(results) == 2
+    assert provider.peak_in_flight == 4
+    assert all(len(r["latencies"]) == 4 for r in results)
+    # a provider that queues spreads the burst over three extra service times
+    assert spreads[("QueueingProvider", "model_a")] >= 0.025
+    assert mock_plt.savefig.called
+
+    (saved,) = tmp_path.glob("burst_*.json")
+    data = json.loads(saved.read_text())
+    assert data["size"] == 4
+    assert len(data["bursts"]["QueueingProvider - model_a"]) == 2
+
+
+def test_burst_size_must_be_positive():
+    benchmark = Benchmark([QueueingProvider()], 1, ["model_a"], 100, "Test prompt")
+
+    with pytest.raises(ValueError):
+        BurstWorkload(benchmark, size=0)
@@ -0,0 +1,89 @@
+import json
+import requests
+import pytest
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.calibration import OverheadCalibration, overhead_profile
+from benchmarking.loopback import LoopbackServer
+from providers.openai_compatible_provider import OpenAICompatible
+
+
+class FixedProvider:
+    """Mock provider that cannot be redirected to a local server."""
+
+    def __init__(self):
+        self.metrics = {"timetofirsttoken": {"model_a": [0.5, 0.7]}}
+
+    def get_model_name(self, model):
+        return model
+
+
+def test_loopback_server_follows_schedule():
+    with LoopbackServer(ttft_s=0.02, interval_s=0.01, chunks=3) as server:
+        response = requests.post(
+            f"{server.base_url}/chat/completions", json={"stream": True}, timeout=5
+        )
+
+    events = [line for line in response.text.splitlines() if line.startswith("data:")]
+    assert len(events) == 4
+    assert events[-1] == "data: [DONE]"
+    (record,) = server.records
+    assert record["first"] >= 0.02
+    assert len(record["gaps"]) == 2
+    # chunks are sent on absolute deadlines, so a late chunk does not delay the rest
+    assert record["total"] >= 0.04
+
+
+def test_overhead_profile():
+    samples = {
+        "response_times": [0.35, 0.33],
+        "timetofirsttoken": [0.12, 0.11],
+        "timebetweenchunks": [0.021, 0.022],
+        "timebetweenchunks_p95": [0.025, 0.025],
+    }
+    records = [{"first": 0.1, "gaps": [0.02, 0.02], "total": 0.3}] * 2
+
+    profile = overhead_profile(samples, records, streaming=True)
+    assert profile["requests"] == 2
+    assert profile["response_overhead"] == pytest.approx(0.04)
+    assert profile["ttft_overhead"] == pytest.approx(0.015)
+    assert profile["chunk_overhead"] == pytest.approx(0.0015)
+    assert profile["chunk_jitter_p95"] == pytest.approx(0.005)
+    assert "ttft_overhead" not in overhead_profile(samples, records, streaming=False)
+    assert overhead_profile({}, records, streaming=True) == {}
+
+
+def test_calibrate_streaming_provider(tmp_path):
+    provider = OpenAICompatible(
+        base_url="http://10.0.0.5:8000/v1", models={"model_a": "org/model"}
+    )
+    benchmark = Benchmark([provider], 1, ["model_a"], 100, "Test prompt", streaming=True)
+    benchmark.graph_dir = str(tmp_path)
+
+    calibration = OverheadCalibration(
+        benchmark, chunks=4, interval_ms=10, ttft_ms=20, requests=2, subtract=True
+    )
+    calibration.run()
+
+    profile = calibration.profiles[("OpenAICompatible", "model_a")]
+    assert profile["requests"] == 2
+    assert 0 <= profile["ttft_overhead"] < 0.5
+    assert abs(profile["chunk_overhead"]) < 0.05
+    # the provider is restored and keeps no calibration samples
+    assert provider.base_url == "http://10.0.0.5:8000/v1"
+    assert not provider.metrics["timetofirsttoken"].get("model_a")
+
+    (saved,) = tmp_path.glob("calibration_*.json")
+    data = json.loads(saved.read_text())
+    assert data["subtracted"] is True
+    assert "ttft_overhead" in data["profiles"]["OpenAICompatible"]["org/model"]
+
+
+def test_subtract_overhead_skips_unredirectable_providers():
+    provider = FixedProvider()
+    benchmark = Benchmark([provider], 1, ["model_a"], 100, "Test prompt", streaming=True)
+    calibration = OverheadCalibration(benchmark, subtract=True)
+
+    assert calibration.calibrate() == {}
+    calibration.profiles[("FixedProvider", "model_a")] = {"ttft_overhead": 0.6}
+    calibration.subtract_overhead()
+    assert provider.metrics["timetofirsttoken"]["model_a"] == [0.0, pytest.approx(0.1)]
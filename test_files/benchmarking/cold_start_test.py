@@ -0,0 +1,91 @@
+import json
+import time
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+from unittest.mock import patch
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.cold_start import ColdStartProbe, build_gap_schedule, find_cold_start
+from benchmarking.rate_limiter import RateLimiter
+
+
+class ScaleToZeroProvider:
+    """Mock provider that scales to zero after 50 ms without requests."""
+
+    def __init__(self):
+        self.metrics = {"response_times": {}}
+        self.last_request = None
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        now = time.perf_counter()
+        idle = None if self.last_request is None else now - self.last_request
+        latency = 0.5 if idle is None or idle > 0.05 else 0.1
+        self.metrics["response_times"].setdefault(model, []).append(latency)
+        self.last_request = time.perf_counter()
+
+
+def test_gap_schedule_shuffles_each_round():
+    schedule, seed = build_gap_schedule([0, 1, 2, 3], repeats=3, seed=7)
+
+    assert seed == 7
+    assert len(schedule) == 12
+    for i in range(0, 12, 4):
+        assert sorted(schedule[i:i + 4]) == [0, 1, 2, 3]
+    assert build_gap_schedule([0, 1, 2, 3], repeats=3, seed=7)[0] == schedule
+    with pytest.raises(ValueError):
+        build_gap_schedule([-1])
+
+
+def test_find_cold_start():
+    results = [
+        {"gap_s": 0, "latency": 0.1},
+        {"gap_s": 0, "latency": 0.12},
+        {"gap_s": 30, "latency": 0.13},
+        {"gap_s": 300, "latency": 0.5},
+        {"gap_s": 900, "latency": 0.6},
+    ]
+
+    cold = find_cold_start(results, penalty_ratio=1.5)
+
+    assert cold["gap_s"] == 300
+    assert cold["penalty_s"] == pytest.approx(0.39)
+    assert find_cold_start(results, penalty_ratio=10) is None
+
+
+@patch("benchmarking.cold_start.plt")
+def test_probe_reports_gap_where_latency_rises(mock_plt, tmp_path):
+    provider = ScaleToZeroProvider()
+    benchmark = Benchmark([provider], 1, ["model_a"], 100, "Test prompt")
+    benchmark.graph_dir = str(tmp_path)
+
+    probe = ColdStartProbe(benchmark, gaps_s=[0, 0.01, 0.1], repeats=2, seed=1)
+    cold_starts = probe.run()
+
+    results = probe.results[("ScaleToZeroProvider", "model_a")]
+    assert sorted(r["gap_s"] for r in results) == [0, 0, 0.01, 0.01, 0.1, 0.1]
+    assert cold_starts[("ScaleToZeroProvider", "model_a")]["gap_s"] == 0.1
+    assert mock_plt.savefig.called
+
+    (saved,) = tmp_path.glob("cold_start_*.json")
+    data = json.loads(saved.read_text())
+    assert data["seed"] == 1
+    assert data["providers"]["ScaleToZeroProvider - model_a"]["cold_start"]["gap_s"] == 0.1
+
+
+@patch("benchmarking.cold_start.plt")
+def test_probes_wait_for_the_rate_limiter(mock_plt, tmp_path):
+    provider = ScaleToZeroProvider()
+    benchmark = Benchmark([provider], 1, ["model_a", "model_b"], 100, "Test prompt")
+    benchmark.graph_dir = str(tmp_path)
+
+    probe = ColdStartProbe(benchmark, gaps_s=[0, 0.01], repeats=2, seed=1)
+    with patch.object(RateLimiter, "acquire", autospec=True) as mock_acquire:
+        probe.run()
+
+    # One priming request plus one probe per scheduled gap, for each model.
+    assert mock_acquire.call_count == 2 * (1 + len(probe.schedule))
+    assert len(provider.metrics["throttled_time"]["model_a"]) == 1 + len(probe.schedule)
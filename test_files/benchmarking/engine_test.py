@@ -0,0 +1,203 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+from unittest.mock import patch
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.engine import AsyncEngine, get_concurrency
+from benchmarking.rate_limiter import get_rate_limiter
+from benchmarking.sequential import SequentialRunner
+
+
+class SyncProvider:
+    """Mock provider exposing only the synchronous inference methods."""
+
+    def __init__(self):
+        self.metrics = {
+            "response_times": {},
+            "timetofirsttoken": {},
+            "timebetweentokens": {},
+            "timebetweentokens_median": {},
+            "timebetweentokens_p95": {},
+        }
+        self.calls = 0
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        self.calls += 1
+
+    def perform_inference_streaming(self, model, prompt, max_output, verbosity):
+        self.calls += 1
+
+
+class AsyncProvider(SyncProvider):
+    """Mock provider with async methods that records the peak in-flight count."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output, verbosity
+    ):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.calls += 1
+        self.metrics["response_times"].setdefault(model, []).append(0.01)
+
+
+def make_benchmark(providers, num_requests=8, concurrency=4, streaming=True):
+    return Benchmark(
+        providers,
+        num_requests,
+        ["model_a"],
+        100,
+        "Test prompt",
+        streaming=streaming,
+        verbosity=False,
+        concurrency=concurrency,
+    )
+
+
+def test_get_concurrency():
+    provider = SyncProvider()
+    provider.config_name = "OpenAI"
+    assert get_concurrency(None, provider) == 1
+    assert get_concurrency(4, provider) == 4
+    assert get_concurrency({"OpenAI": 8, "default": 2}, provider) == 8
+    assert get_concurrency({"SyncProvider": 6}, provider) == 6
+    assert get_concurrency({"Groq": 8, "default": 2}, provider) == 2
+    assert get_concurrency({"Groq": 8}, provider) == 1
+
+
+def test_engine_respects_concurrency():
+    provider = AsyncProvider()
+    benchmark = make_benchmark([provider], num_requests=8, concurrency=3)
+
+    AsyncEngine(benchmark).run()
+
+    assert provider.calls == 8
+    assert provider.peak_in_flight == 3
+
+
+def test_engine_falls_back_to_sync_methods():
+    provider = SyncProvider()
+    benchmark = make_benchmark([provider], num_requests=5, streaming=False)
+
+    AsyncEngine(benchmark).run()
+
+    assert provider.calls == 5
+
+
+def test_engine_shares_one_rate_limiter_across_models():
+    provider = AsyncProvider()
+    benchmark = make_benchmark([provider], num_requests=2, concurrency=2)
+    benchmark.models = ["model_a", "model_b"]
+
+    with patch("benchmarking.engine.get_rate_limiter", wraps=get_rate_limiter) as mock:
+        AsyncEngine(benchmark).run()
+
+    mock.assert_called_once()
+    assert provider.calls == 4
+
+
+def test_sync_fallback_is_not_capped_by_default_executor():
+    provider = SyncProvider()
+    # more requests in flight than asyncio's default executor has workers
+    concurrency = min(32, (os.cpu_count() or 1) + 4) + 4
+    benchmark = make_benchmark([provider], num_requests=concurrency, concurrency=concurrency)
+    # every request waits for all the others, which only passes if all run at once
+    barrier = threading.Barrier(concurrency, timeout=5)
+
+    with patch.object(
+        SyncProvider,
+        "perform_inference_streaming",
+        autospec=True,
+        side_effect=lambda *args: barrier.wait(),
+    ):
+        AsyncEngine(benchmark).run()
+
+    assert not barrier.broken
+    assert len(provider.metrics["throttled_time"]["model_a"]) == concurrency
+
+
+@patch.object(Benchmark, "plot_metrics")
+def test_benchmark_run_uses_engine(mock_plot_metrics, tmp_path):
+    provider = AsyncProvider()
+    benchmark = make_benchmark([provider], num_requests=4, concurrency=2)
+    benchmark.graph_dir = str(tmp_path)
+
+    benchmark.run()
+
+    assert provider.calls == 4
+    assert mock_plot_metrics.call_count > 0
+
+
+def test_engine_open_loop_dispatches_on_schedule():
+    provider = AsyncProvider()
+    benchmark = make_benchmark([provider], num_requests=10, concurrency=None)
+    benchmark.arrival = {"type": "constant", "rate_qps": 1000}
+
+    AsyncEngine(benchmark).run()
+
+    assert provider.calls == 10
+    # requests overlap because dispatch does not wait for completions
+    assert provider.peak_in_flight > 1
+    lateness = provider.metrics["dispatch_lateness"]["model_a"]
+    assert len(lateness) == 10
+    assert all(value >= 0 for value in lateness)
+
+
+def test_engine_runs_providers_in_parallel():
+    providers = [AsyncProvider(), AsyncProvider()]
+    benchmark = make_benchmark(providers, num_requests=3, concurrency=1)
+    benchmark.parallel_providers = True
+
+    start = time.perf_counter()
+    AsyncEngine(benchmark).run()
+    elapsed = time.perf_counter() - start
+
+    assert [provider.calls for provider in providers] == [3, 3]
+    # bounded by one provider's 3 sequential requests, not the sum of both
+    assert elapsed < 6 * 0.01
+
+
+def test_sequential_path_runs_providers_in_threads():
+    providers = [SyncProvider(), SyncProvider()]
+    benchmark = make_benchmark(providers, num_requests=4, concurrency=None)
+    benchmark.parallel_providers = True
+    # each request waits for the other provider, which only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    with patch.object(
+        SyncProvider,
+        "perform_inference_streaming",
+        autospec=True,
+        side_effect=lambda *args: barrier.wait(),
+    ):
+        SequentialRunner(benchmark).run()
+
+    assert providers[0].metrics["throttled_time"]["model_a"] == [0.0] * 4
+    assert providers[1].metrics["throttled_time"]["model_a"] == [0.0] * 4
+
+
+def test_engine_duration_bounded_run():
+    provider = AsyncProvider()
+    benchmark = make_benchmark([provider], num_requests=1, concurrency=2)
+    benchmark.duration_s = 0.1
+
+    AsyncEngine(benchmark).run()
+
+    # 2 workers with 10 ms requests keep sending until the window closes
+    assert provider.calls > 4
+    (request_rate,) = provider.metrics["request_rate"]["model_a"]
+    assert request_rate == pytest.approx(provider.calls / 0.1, rel=0.5)
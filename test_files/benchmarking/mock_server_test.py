@@ -0,0 +1,88 @@
+import random
+from types import SimpleNamespace
+import pytest
+from benchmarking.mock_formats import event_stream_message, response_format
+from benchmarking.mock_server import MockLLMServer, sample_delay, validate_distribution
+
+
+@pytest.fixture
+def mock_server():
+    server = MockLLMServer(
+        ttft={"dist": "constant", "value_ms": 20},
+        tbt={"dist": "constant", "value_ms": 2},
+        output_tokens=4,
+    ).start()
+    yield server
+    server.stop()
+
+
+def test_validate_distribution():
+    validate_distribution({"dist": "uniform", "low_ms": 1, "high_ms": 2})
+    with pytest.raises(ValueError):
+        validate_distribution({"dist": "pareto"})
+    with pytest.raises(ValueError):
+        validate_distribution({"dist": "normal", "mean_ms": 20})
+
+
+def test_draws_repeat_per_request_index():
+    spec = {"dist": "lognormal", "median_ms": 200, "sigma": 0.5}
+    first = MockLLMServer(seed=7).draw(3)
+    again = MockLLMServer(seed=7).draw(3)
+
+    assert sample_delay(spec, first) == sample_delay(spec, again)
+    assert sample_delay({"dist": "normal", "mean_ms": -50, "std_ms": 1}, random.Random(0)) == 0.0
+
+
+def test_prefill_and_slowdown_stretch_delays():
+    server = MockLLMServer(prefill_ms_per_token=1.0, slowdown=0.5)
+    api = SimpleNamespace(input_tokens=100)
+
+    assert server.first_delay(api, server.draw(0)) == pytest.approx(0.2)
+    server.in_flight = 3
+    assert server.first_delay(api, server.draw(0)) == pytest.approx(0.4)
+    assert server.gap(server.draw(0)) == pytest.approx(0.04)
+
+
+def test_formats_follow_request_path():
+    assert type(response_format("/v1/messages", {})).__name__ == "AnthropicFormat"
+    assert type(response_format("/v1/accounts/a/ai/run/@cf/m", {})).__name__ == "CloudflareFormat"
+    bedrock = response_format("/model/m/invoke-with-response-stream", {"max_gen_len": 9})
+    assert bedrock.stream and bedrock.max_tokens == 9
+    assert type(response_format("/v1/chat/completions", {})).__name__ == "OpenAIFormat"
+
+
+def test_event_stream_message_decodes_with_botocore():
+    from botocore.eventstream import EventStreamBuffer
+
+    buffer = EventStreamBuffer()
+    buffer.add_data(event_stream_message(b'{"bytes": "e30="}'))
+    (message,) = list(buffer)
+
+    assert message.headers[":event-type"] == "chunk"
+    assert message.payload == b'{"bytes": "e30="}'
+
+
+def test_anthropic_provider_streams_from_mock(mock_server, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API", "test-key")
+    from providers.anthropic_provider import Anthropic
+
+    provider = Anthropic()
+    provider.set_base_url(mock_server.base_url)
+    provider.perform_inference_streaming("common-model", "hello", verbosity=False)
+
+    assert provider.metrics["timetofirsttoken"]["common-model"][0] >= 0.02
+    assert provider.metrics["totaltokens"]["common-model"] == [4]
+
+
+def test_bedrock_provider_streams_from_mock(mock_server, monkeypatch):
+    monkeypatch.setenv("AWS_BEDROCK_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_BEDROCK_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_BEDROCK_REGION", "us-east-1")
+    from providers.aws_provider import AWSBedrock
+
+    provider = AWSBedrock()
+    provider.set_base_url(mock_server.base_url)
+    provider.perform_inference_streaming("common-model", "hello", verbosity=False)
+
+    assert provider.metrics["totaltokens"]["common-model"] == [4]
+    assert len(mock_server.records[-1]["gaps"]) == 3
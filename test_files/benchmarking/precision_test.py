@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.budget import build_budget
+from benchmarking.precision import PrecisionTarget, quantile_ci
+from benchmarking.sequential import SequentialRunner
+
+
+class NoisyProvider:
+    """Mock provider logging response times drawn from a lognormal distribution."""
+
+    def __init__(self, sigma, seed=0):
+        self.metrics = {"response_times": {}}
+        self.rng = np.random.default_rng(seed)
+        self.sigma = sigma
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        value = self.rng.lognormal(0, self.sigma)
+        self.metrics["response_times"].setdefault(model, []).append(value)
+
+
+def test_quantile_ci_brackets_median():
+    values = np.random.default_rng(1).normal(10, 1, 1000)
+
+    lower, upper = quantile_ci(values, 0.5)
+
+    assert lower < np.median(values) < upper
+    assert upper - lower < 0.3
+    # too few samples for a 95% interval of the p99
+    assert quantile_ci(values[:20], 0.99) is None
+
+
+def test_precision_target_reached():
+    target = PrecisionTarget(rel_half_width=0.05, min_requests=10)
+
+    assert not target.reached([1.0] * 5)
+    assert target.reached([1.0] * 20)
+    assert not target.reached(list(np.linspace(0.1, 10, 20)))
+    with pytest.raises(ValueError):
+        PrecisionTarget(quantile=100)
+
+
+def test_budget_stops_stable_provider_early():
+    precision = {"rel_half_width": 0.05, "min_requests": 20, "max_requests": 500}
+    results = {}
+    for sigma in (0.01, 1.0):
+        provider = NoisyProvider(sigma)
+        benchmark = Benchmark(
+            [provider], 10, ["model_a"], 100, "Test prompt", precision=precision
+        )
+        SequentialRunner(benchmark).run_provider(provider)
+        budget_samples = provider.metrics["response_times"]["model_a"]
+        results[sigma] = len(budget_samples)
+
+    assert results[0.01] == 20
+    assert 20 < results[1.0] <= 500
+
+
+def test_budget_counts_only_new_samples():
+    provider = NoisyProvider(0.01)
+    provider.metrics["response_times"]["model_a"] = [1.0] * 50
+    benchmark = Benchmark(
+        [provider], 10, ["model_a"], 100, "Test prompt", precision={"min_requests": 5}
+    )
+
+    budget = build_budget(benchmark, provider, "model_a")
+
+    assert budget.samples() == []
+    assert budget.take()
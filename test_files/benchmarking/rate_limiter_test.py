@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import patch
+from benchmarking.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    estimate_request_tokens,
+    get_rate_limiter,
+)
+
+
+class LimitedProvider:
+    rate_limits = {"requests_per_minute": 60}
+
+
+@patch("benchmarking.rate_limiter.time.monotonic", return_value=0.0)
+def test_token_bucket_waits_only_for_deficit(mock_monotonic):
+    bucket = TokenBucket(per_minute=60, capacity=2)
+
+    # the burst capacity is available immediately
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # the next request waits for one unit at 1 unit/s
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    mock_monotonic.return_value = 5.0
+    # refill is capped at the capacity
+    assert bucket.reserve() == 0.0
+    assert bucket.level == pytest.approx(1.0)
+
+
+@patch("benchmarking.rate_limiter.time.monotonic", return_value=0.0)
+def test_rate_limiter_uses_slowest_bucket(mock_monotonic):
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=600)
+
+    assert limiter.reserve(tokens=600) == 0.0
+    # request bucket still has room, token bucket needs 300 tokens at 10 tokens/s
+    assert limiter.reserve(tokens=300) == pytest.approx(30.0)
+
+
+def test_get_rate_limiter_prefers_config():
+    provider = LimitedProvider()
+
+    assert get_rate_limiter(None, provider).buckets[0][0].rate == 1.0
+    limiter = get_rate_limiter(
+        {"LimitedProvider": {"requests_per_minute": 120}}, provider
+    )
+    assert limiter.buckets[0][0].rate == 2.0
+    assert get_rate_limiter(None, object()).buckets == []
+
+
+@patch("benchmarking.rate_limiter.time.monotonic", return_value=0.0)
+def test_rate_limiter_throttle_pauses_and_recovers(mock_monotonic):
+    limiter = RateLimiter(requests_per_minute=60)
+
+    limiter.throttle(5.0)
+    assert limiter.buckets[0][0].rate == 0.5
+    assert limiter.reserve() == pytest.approx(5.0)
+
+    for _ in range(10):
+        limiter.recover()
+    assert limiter.buckets[0][0].rate == 1.0
+
+
+def test_estimate_request_tokens():
+    assert estimate_request_tokens("a" * 40, 100) == 110
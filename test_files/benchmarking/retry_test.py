@@ -0,0 +1,122 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from benchmarking.rate_limiter import RateLimiter
+from benchmarking.retry import RetryPolicy, send_with_retry, send_with_retry_async
+from providers.throttling import ThrottledError, as_throttled_error, parse_retry_after
+
+
+class StatusError(Exception):
+    """Mimics an SDK status exception carrying an HTTP response."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__("rate limited")
+        self.response = MagicMock(status_code=status_code, headers=headers or {})
+
+
+def flaky(failures, exc):
+    """Returns a callable that raises exc for the first failures calls."""
+    calls = []
+
+    def send():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise exc
+        return "ok"
+
+    send.calls = calls
+    return send
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+
+def test_as_throttled_error():
+    throttled = as_throttled_error(StatusError(529, {"retry-after": "2"}))
+    assert throttled.status_code == 529
+    assert throttled.retry_after == 2.0
+
+    assert as_throttled_error(StatusError(500)) is None
+    assert as_throttled_error(ValueError("bad request")) is None
+
+    boto_error = Exception()
+    boto_error.response = {
+        "Error": {"Code": "ThrottlingException"},
+        "ResponseMetadata": {"HTTPStatusCode": 400, "HTTPHeaders": {}},
+    }
+    assert as_throttled_error(boto_error).status_code == 429
+
+
+def test_backoff_honors_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+    assert policy.backoff(3, retry_after=2.5) == 2.5
+    assert all(0 <= policy.backoff(10) <= 8.0 for _ in range(20))
+
+
+@patch("benchmarking.rate_limiter.time.sleep")
+def test_send_with_retry_waits_retry_after(mock_sleep):
+    limiter = RateLimiter()
+    send = flaky(2, StatusError(429, {"retry-after": "4"}))
+
+    result, throttled_time = send_with_retry(send, RetryPolicy(), limiter)
+
+    assert result == "ok"
+    assert len(send.calls) == 3
+    # the backoff sleeps are patched out, so no time was spent throttled
+    assert throttled_time == pytest.approx(0.0, abs=0.05)
+    assert mock_sleep.call_args_list[0].args[0] == pytest.approx(4.0, abs=0.1)
+
+
+def test_send_with_retry_reraises_other_errors():
+    send = flaky(1, ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        send_with_retry(send, RetryPolicy(), RateLimiter())
+
+
+def test_send_with_retry_gives_up():
+    send = flaky(10, ThrottledError("overloaded", retry_after=0.0))
+
+    result, _ = send_with_retry(send, RetryPolicy(max_retries=2), RateLimiter())
+
+    assert result is None
+    assert len(send.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_send_with_retry_async():
+    failures = []
+
+    async def send():
+        if not failures:
+            failures.append(1)
+            raise ThrottledError("rate limited", status_code=429, retry_after=0.1)
+        await asyncio.sleep(0.3)
+        return "ok"
+
+    result, throttled_time = await send_with_retry_async(
+        send, RetryPolicy(), RateLimiter()
+    )
+
+    assert result == "ok"
+    # the backoff slept, without the latency of the final attempt
+    assert throttled_time == pytest.approx(0.1, abs=0.05)
+
+
+def test_throttled_time_excludes_final_attempt():
+    def slow_success():
+        time.sleep(0.3)
+        return "ok"
+
+    send = flaky(1, ThrottledError("rate limited", status_code=429, retry_after=0.1))
+    result, throttled_time = send_with_retry(
+        lambda: send() and slow_success(), RetryPolicy(), RateLimiter()
+    )
+
+    assert result == "ok"
+    assert throttled_time == pytest.approx(0.1, abs=0.05)
@@ -0,0 +1,120 @@
+import json
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+from collections import Counter
+from unittest.mock import patch
+from benchmarking import benchmark_main, dynamo_bench
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.scheduler import build_request_plan
+
+
+class RecordingProvider:
+    """Mock provider that appends every request to a shared log."""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.metrics = {}
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        self.log.append((self.name, model))
+        self.metrics.setdefault("response_times", {}).setdefault(model, []).append(0.1)
+
+
+def test_blocked_plan_keeps_order():
+    plan, seed = build_request_plan(["a", "b"], ["m1", "m2"], 2)
+
+    assert seed is None
+    assert plan == [
+        (0, "m1"), (0, "m1"), (0, "m2"), (0, "m2"),
+        (1, "m1"), (1, "m1"), (1, "m2"), (1, "m2"),
+    ]
+
+
+def test_interleaved_plan_is_seeded_shuffle():
+    scheduler = {"type": "interleaved", "seed": 7}
+    plan, seed = build_request_plan(["a", "b"], ["m1", "m2"], 5, scheduler)
+
+    assert seed == 7
+    assert plan == build_request_plan(["a", "b"], ["m1", "m2"], 5, scheduler)[0]
+    assert plan != build_request_plan(["a", "b"], ["m1", "m2"], 5)[0]
+    assert Counter(plan) == Counter(build_request_plan(["a", "b"], ["m1", "m2"], 5)[0])
+
+
+def test_interleaved_plan_draws_seed():
+    plan, seed = build_request_plan(["a"], ["m1", "m2"], 3, {"type": "interleaved"})
+
+    assert isinstance(seed, int)
+    assert plan == build_request_plan(
+        ["a"], ["m1", "m2"], 3, {"type": "interleaved", "seed": seed}
+    )[0]
+
+
+def test_unknown_scheduler_type():
+    with pytest.raises(ValueError):
+        build_request_plan(["a"], ["m1"], 1, {"type": "random"})
+
+
+def test_benchmark_follows_and_saves_plan(tmp_path):
+    log = []
+    providers = [RecordingProvider("a", log), RecordingProvider("b", log)]
+    benchmark = Benchmark(
+        providers,
+        3,
+        ["m1"],
+        100,
+        "Test prompt",
+        scheduler={"type": "interleaved", "seed": 3},
+    )
+    benchmark.graph_dir = str(tmp_path)
+
+    with patch.object(Benchmark, "plot_metrics"):
+        benchmark.run()
+
+    expected = [("ab"[index], model) for index, model in benchmark.request_plan]
+    assert log == expected
+    assert benchmark.schedule_seed == 3
+    saved = json.loads(next(tmp_path.glob("request_plan_*.json")).read_text())
+    assert saved["seed"] == 3
+    assert saved["scheduler"] == "interleaved"
+    assert len(saved["plan"]) == 6
+
+
+def test_plan_records_throughput_of_each_model(tmp_path):
+    log = []
+    providers = [RecordingProvider("a", log), RecordingProvider("b", log)]
+    benchmark = Benchmark(
+        providers, 2, ["m1", "m2"], 100, "Test prompt", scheduler={"type": "interleaved"}
+    )
+    benchmark.graph_dir = str(tmp_path)
+
+    with patch.object(Benchmark, "plot_metrics"):
+        benchmark.run()
+
+    for provider in providers:
+        for model in ("m1", "m2"):
+            assert len(provider.metrics["request_rate"][model]) == 1
+            assert provider.metrics["request_rate"][model][0] > 0
+
+
+@pytest.mark.parametrize("module", [benchmark_main, dynamo_bench])
+@pytest.mark.parametrize(
+    "option",
+    [{"duration_s": 10}, {"min_requests": 5}, {"precision": {"quantile": 50}}],
+)
+def test_plan_rejects_open_ended_budgets(module, option):
+    with pytest.raises(ValueError, match="scheduler plan"):
+        module.Benchmark(
+            [RecordingProvider("a", [])],
+            2,
+            ["m1"],
+            100,
+            "Test prompt",
+            scheduler={"type": "interleaved"},
+            **option,
+        )
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.rate_limiter import get_rate_limiter
+from benchmarking.sequential import SequentialRunner, run_benchmark_requests
+
+
+class CountingProvider:
+    """Mock provider with only synchronous inference methods."""
+
+    def __init__(self):
+        self.metrics = {"response_times": {}}
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        self.metrics["response_times"].setdefault(model, []).append(0.1)
+
+
+def test_runner_sends_every_request():
+    provider = CountingProvider()
+    benchmark = Benchmark([provider], 3, ["model_a", "model_b"], 100, "Test prompt")
+
+    SequentialRunner(benchmark).run()
+
+    for model in ("model_a", "model_b"):
+        assert provider.metrics["response_times"][model] == [0.1] * 3
+        assert provider.metrics["throttled_time"][model] == [0.0] * 3
+        assert len(provider.metrics["request_rate"][model]) == 1
+
+
+@pytest.mark.parametrize("scheduler", [None, {"type": "interleaved"}])
+def test_runner_shares_one_rate_limiter_across_models(scheduler):
+    provider = CountingProvider()
+    benchmark = Benchmark(
+        [provider], 2, ["model_a", "model_b"], 100, "Test prompt", scheduler=scheduler
+    )
+
+    with patch(
+        "benchmarking.sequential.get_rate_limiter", wraps=get_rate_limiter
+    ) as mock:
+        SequentialRunner(benchmark).run()
+
+    mock.assert_called_once()
+    for model in ("model_a", "model_b"):
+        assert provider.metrics["response_times"][model] == [0.1] * 2
+
+
+@patch("benchmarking.sequential.AsyncEngine")
+@patch("benchmarking.sequential.SequentialRunner")
+def test_run_benchmark_requests_picks_runner(mock_runner, mock_engine):
+    benchmark = Benchmark([CountingProvider()], 1, ["model_a"], 100, "Test prompt")
+
+    run_benchmark_requests(benchmark)
+    assert mock_runner.return_value.run.called and not mock_engine.called
+
+    benchmark.concurrency = 2
+    run_benchmark_requests(benchmark)
+    mock_engine.return_value.run.assert_called_once()
+
+
+def test_scheduler_rejected_with_engine():
+    benchmark = Benchmark(
+        [CountingProvider()],
+        1,
+        ["model_a"],
+        100,
+        "Test prompt",
+        concurrency=2,
+        scheduler={"type": "interleaved"},
+    )
+
+    with pytest.raises(ValueError, match="scheduler plan"):
+        run_benchmark_requests(benchmark)
@@ -0,0 +1,50 @@
+import json
+import pytest
+from providers.provider_interface import ProviderInterface
+from benchmarking.server_timing import report_server_timing, server_timing_summary
+
+
+class HeaderProvider(ProviderInterface):
+    def get_model_name(self, model):
+        return f"{model}-id"
+
+    def perform_inference(self, model, prompt, max_output=100, verbosity=True):
+        pass
+
+    def perform_inference_streaming(self, model, prompt, max_output=100, verbosity=True):
+        pass
+
+
+def test_headers_split_client_time():
+    provider = HeaderProvider()
+    provider.log_response_headers("m", {"openai-processing-ms": "300"}, 0.5)
+    provider.log_response_headers("m", {"openai-processing-ms": "700"}, 1.0)
+    provider.log_response_headers("m", {"x-request-id": "req-3"}, 2.0)
+    provider.log_response_headers("m", {"content-type": "text/plain"}, 2.0)
+
+    assert len(provider.response_headers["m"]) == 3
+    assert provider.metrics["server_processing_time"]["m"] == pytest.approx([0.3, 0.7])
+    assert provider.metrics["network_overhead"]["m"] == pytest.approx([0.2, 0.3])
+
+    split = server_timing_summary([provider])["HeaderProvider"]["m-id"]
+    assert split["requests"] == 2
+    assert split["server_time_p50"] == pytest.approx(0.5)
+    assert split["overhead_p50"] == pytest.approx(0.25)
+    assert split["server_share"] == pytest.approx(1.0 / 1.5)
+
+
+def test_report_saves_requests_only_when_headers_were_captured(tmp_path):
+    provider = HeaderProvider()
+    assert report_server_timing([provider], str(tmp_path)) == {}
+    assert not list(tmp_path.iterdir())
+
+    provider.captured_headers = ("cf-ray",)
+    provider.log_response_headers("m", {"cf-ray": "abc", "x-request-id": "r"}, 0.1)
+    report_server_timing([provider], str(tmp_path))
+
+    (saved,) = tmp_path.glob("server_timing_*.json")
+    data = json.loads(saved.read_text())
+    assert data["summary"] == {}
+    assert data["requests"]["HeaderProvider"]["m-id"] == [
+        {"client_time": 0.1, "headers": {"cf-ray": "abc"}}
+    ]
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+from unittest.mock import patch
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.sweep import LoadSweep, find_knee
+
+
+class SaturatingProvider:
+    """Mock provider whose latency grows once more than 4 requests are in flight."""
+
+    def __init__(self):
+        self.metrics = {
+            "response_times": {},
+            "timetofirsttoken": {},
+            "totaltokens": {},
+            "timebetweentokens": {},
+        }
+        self.in_flight = 0
+
+    def get_model_name(self, model):
+        return model
+
+    def log(self, model, metric, value):
+        self.metrics[metric].setdefault(model, []).append(value)
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output, verbosity
+    ):
+        self.in_flight += 1
+        ttft = 0.002 * max(1, self.in_flight - 4)
+        await asyncio.sleep(ttft)
+        self.in_flight -= 1
+        self.log(model, "timetofirsttoken", ttft)
+        self.log(model, "response_times", ttft)
+        self.log(model, "totaltokens", 10)
+        self.log(model, "timebetweentokens", 0.001)
+
+
+class CollapsingProvider(SaturatingProvider):
+    """Mock provider that fails every request once more than 2 have been in flight."""
+
+    peak = 0
+
+    async def perform_inference_streaming_async(
+        self, model, prompt, max_output, verbosity
+    ):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if self.peak > 2:
+            print("[ERROR] overloaded")
+            return
+        self.log(model, "timetofirsttoken", 0.001)
+        self.log(model, "response_times", 0.001)
+        self.log(model, "totaltokens", 10)
+        self.log(model, "timebetweentokens", 0.001)
+
+
+def test_find_knee():
+    results = [
+        {"level": 1, "throughput": 10, "latency_p99": 0.1},
+        {"level": 2, "throughput": 20, "latency_p99": 0.1},
+        {"level": 4, "throughput": 30, "latency_p99": 0.5},
+    ]
+    assert find_knee(results)["level"] == 4
+    assert find_knee(results[:2]) is None
+
+
+def test_find_knee_at_total_failure():
+    results = [
+        {"level": 1, "throughput": 10, "latency_p99": 0.1},
+        {"level": 2, "throughput": 0.0, "latency_p99": None},
+    ]
+    assert find_knee(results)["level"] == 2
+    assert find_knee(results[1:])["level"] == 2
+
+
+def test_invalid_sweep_mode():
+    benchmark = Benchmark([SaturatingProvider()], 4, ["model_a"], 100, "Test prompt")
+    with pytest.raises(ValueError, match="not supported"):
+        LoadSweep(benchmark, mode="users")
+
+
+@patch("benchmarking.sweep.plt")
+def test_sweep_records_every_step(mock_plt):
+    provider = SaturatingProvider()
+    benchmark = Benchmark(
+        [provider], 4, ["model_a"], 100, "Test prompt", streaming=True
+    )
+    sweep = LoadSweep(benchmark, steps=[1, 2, 4, 8, 16], requests_per_step=16)
+
+    knees = sweep.run()
+
+    results = sweep.results[("SaturatingProvider", "model_a")]
+    assert [r["level"] for r in results] == [1, 2, 4, 8, 16]
+    assert all(r["error_rate"] == 0 for r in results)
+    assert all(r["ttft_p99"] is not None for r in results)
+    assert ("SaturatingProvider", "model_a") in knees
+    saved = mock_plt.savefig.call_args[0][0]
+    assert os.path.dirname(saved) == benchmark.graph_dir
+    assert os.path.basename(saved).startswith("sweep_concurrency_")
+
+
+@patch("benchmarking.sweep.plt")
+def test_sweep_finds_collapse(mock_plt, tmp_path):
+    provider = CollapsingProvider()
+    benchmark = Benchmark([provider], 4, ["model_a"], 100, "Test prompt", streaming=True)
+    benchmark.graph_dir = str(tmp_path)
+    sweep = LoadSweep(benchmark, steps=[1, 2, 4], requests_per_step=8)
+
+    knees = sweep.run()
+
+    collapsed = sweep.results[("CollapsingProvider", "model_a")][-1]
+    assert collapsed["requests"] == 8
+    assert collapsed["error_rate"] == 1
+    assert collapsed["throughput"] == 0.0
+    assert knees[("CollapsingProvider", "model_a")]["level"] == 4
+
+
+@patch("benchmarking.sweep.plt")
+def test_sweep_rates_are_per_provider(mock_plt, tmp_path):
+    fast, slow = SaturatingProvider(), CollapsingProvider()
+    benchmark = Benchmark([fast, slow], 4, ["model_a"], 100, "Test prompt", streaming=True)
+    benchmark.graph_dir = str(tmp_path)
+    sweep = LoadSweep(benchmark, steps=[1], requests_per_step=4)
+
+    sweep.run()
+
+    fast_rate = sweep.results[("SaturatingProvider", "model_a")][0]["throughput"]
+    slow_rate = sweep.results[("CollapsingProvider", "model_a")][0]["throughput"]
+    assert fast_rate == fast.metrics["token_throughput"]["model_a"][-1]
+    assert slow_rate == slow.metrics["token_throughput"]["model_a"][-1]
+    assert fast_rate != slow_rate
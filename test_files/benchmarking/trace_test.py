@@ -0,0 +1,87 @@
+import inspect
+import json
+import pytest
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.engine import AsyncEngine
+from benchmarking.trace import read_trace, record_prompt, trace_schedule
+from utils.prompt_generator import PROMPT_1000_TOKENS, get_prompt_of_length
+
+
+class TraceProvider:
+    """Mock provider recording the prompt and output limit of every request."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.requests = []
+
+    def get_model_name(self, model):
+        return model
+
+    async def perform_inference_async(self, model, prompt, max_output, verbosity):
+        self.requests.append((model, len(prompt), max_output))
+
+
+def write_trace(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    return str(path)
+
+
+def test_read_trace_is_lazy(tmp_path):
+    path = write_trace(
+        tmp_path / "trace.jsonl",
+        [{"timestamp": 1, "prompt": "hi"}, {"timestamp": 2}],
+    )
+
+    records = read_trace(path)
+
+    assert inspect.isgenerator(records)
+    assert next(records)["prompt"] == "hi"
+    # the invalid second line is only parsed when it is reached
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_trace_schedule_scales_offsets():
+    records = [{"timestamp": 100.0}, {"timestamp": 101.0}, {"timestamp": 104.0}]
+
+    offsets = [offset for offset, _ in trace_schedule(records, time_scale=2.0)]
+
+    assert offsets == [0.0, 0.5, 2.0]
+    with pytest.raises(ValueError):
+        list(trace_schedule(records, time_scale=0))
+
+
+def test_record_prompt():
+    assert record_prompt({"prompt": "hello"}) == "hello"
+    prompt = get_prompt_of_length(2500)
+    assert record_prompt({"input_tokens": 2500}) == prompt
+    assert len(prompt) == pytest.approx(2.5 * len(PROMPT_1000_TOKENS), abs=1)
+
+
+def test_engine_replays_trace(tmp_path):
+    path = write_trace(
+        tmp_path / "trace.jsonl",
+        [
+            {"timestamp": 10.0, "prompt": "abc", "max_output": 5},
+            {"timestamp": 10.02, "input_tokens": 100, "model": "model_b"},
+            {"timestamp": 10.04, "prompt": "abcd", "model": "unknown"},
+        ],
+    )
+    provider = TraceProvider()
+    benchmark = Benchmark(
+        [provider],
+        1,
+        ["model_a", "model_b"],
+        100,
+        "Test prompt",
+        trace={"path": path, "time_scale": 1.0},
+    )
+
+    AsyncEngine(benchmark).run()
+
+    assert provider.requests == [
+        ("model_a", 3, 5),
+        ("model_b", len(get_prompt_of_length(100)), 100),
+    ]
+    assert len(provider.metrics["dispatch_lateness"]["model_a"]) == 1
+    assert len(provider.metrics["dispatch_lateness"]["model_b"]) == 1
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import pytest
+from benchmarking.benchmark_main import Benchmark
+from benchmarking.engine import AsyncEngine
+from benchmarking.sequential import SequentialRunner
+from benchmarking.warmup import report_warmup, warmup_plan
+
+
+class SlowFirstProvider:
+    """Mock provider whose first request pays a cold-start penalty."""
+
+    def __init__(self):
+        self.metrics = {"response_times": {}}
+        self.calls = 0
+
+    def get_model_name(self, model):
+        return model
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        self.calls += 1
+        latency = 1.0 if self.calls == 1 else 0.1
+        self.metrics["response_times"].setdefault(model, []).append(latency)
+
+    async def perform_inference_async(self, model, prompt, max_output, verbosity):
+        await asyncio.sleep(0)
+        self.perform_inference(model, prompt, max_output, verbosity)
+
+
+class HeaderProvider(SlowFirstProvider):
+    """Mock provider that keeps a header record for every request."""
+
+    def __init__(self):
+        super().__init__()
+        self.response_headers = {}
+
+    def perform_inference(self, model, prompt, max_output, verbosity):
+        super().perform_inference(model, prompt, max_output, verbosity)
+        self.response_headers.setdefault(model, []).append({"request": self.calls})
+
+
+class ConnectingProvider(SlowFirstProvider):
+    """Mock raw-HTTP provider that can open its connection without a request."""
+
+    def warm_connection(self, model):
+        return True
+
+    async def warm_connection_async(self, model):
+        return True
+
+
+def make_benchmark(providers, warmup, concurrency=None):
+    return Benchmark(
+        providers,
+        3,
+        ["model_a"],
+        100,
+        "Test prompt",
+        concurrency=concurrency,
+        warmup=warmup,
+    )
+
+
+def test_warmup_plan_validates_mode():
+    assert warmup_plan({}) == ("requests", 1)
+    assert warmup_plan({"mode": "connect"}) == ("connect", 1)
+    with pytest.raises(ValueError):
+        warmup_plan({"mode": "ping"})
+
+
+@pytest.mark.parametrize("concurrency", [None, 2])
+def test_warmup_requests_go_to_separate_bucket(concurrency):
+    provider = SlowFirstProvider()
+    benchmark = make_benchmark([provider], {"requests": 2}, concurrency)
+
+    if concurrency is None:
+        SequentialRunner(benchmark).run()
+    else:
+        AsyncEngine(benchmark).run()
+
+    assert provider.calls == 5
+    assert provider.warmup_metrics["response_times"]["model_a"] == [1.0, 0.1]
+    assert provider.metrics["response_times"]["model_a"] == [0.1, 0.1, 0.1]
+
+
+@pytest.mark.parametrize("concurrency", [None, 2])
+def test_warmup_response_headers_go_to_separate_bucket(concurrency):
+    provider = HeaderProvider()
+    benchmark = make_benchmark([provider], {"requests": 2}, concurrency)
+
+    if concurrency is None:
+        SequentialRunner(benchmark).run()
+    else:
+        AsyncEngine(benchmark).run()
+
+    assert provider.warmup_metrics["response_headers"]["model_a"] == [
+        {"request": 1},
+        {"request": 2},
+    ]
+    assert len(provider.response_headers["model_a"]) == 3
+    assert {"request": 1} not in provider.response_headers["model_a"]
+
+
+def test_connect_warmup_falls_back_to_one_request():
+    connecting, sdk = ConnectingProvider(), SlowFirstProvider()
+    benchmark = make_benchmark([connecting, sdk], {"mode": "connect"})
+
+    SequentialRunner(benchmark).run()
+
+    assert connecting.calls == 3
+    assert len(connecting.warmup_metrics["connection_setup"]["model_a"]) == 1
+    assert sdk.calls == 4
+    assert sdk.warmup_metrics["response_times"] == {"model_a": [1.0]}
+
+
+def test_report_warmup_compares_cold_and_warm(tmp_path):
+    provider = SlowFirstProvider()
+    SequentialRunner(make_benchmark([provider], {"requests": 1})).run()
+
+    summary = report_warmup([provider], str(tmp_path))
+
+    assert summary["SlowFirstProvider"]["model_a"] == {
+        "response_times_cold": 1.0,
+        "response_times_warm_p50": pytest.approx(0.1),
+    }
+    (saved,) = tmp_path.glob("warmup_*.json")
+    data = json.loads(saved.read_text())
+    assert data["warmup"]["SlowFirstProvider"]["response_times"]["model_a"] == [1.0]
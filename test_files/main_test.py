@@ -274,7 +274,20 @@ class TestCommandLineInterface(unittest.TestCase):
 
         # Verify the config was loaded and benchmark was run
         mock_load_config.assert_called_once_with("config.json")
-        mock_run_benchmark.assert_called_once_with(mock_load_config.return_value, '192.168.1.10')
+        mock_run_benchmark.assert_called_once_with(
+            mock_load_config.return_value, '192.168.1.10', False
+        )
+
+    @patch("main.run_benchmark")
+    @patch("main.load_config", return_value={"providers": ["TogetherAI"]})
+    def test_calibrate_flag(self, mock_load_config, mock_run_benchmark):
+        """Test --calibrate flag functionality"""
+        test_args = ["main.py", "-c", "config.json", "--calibrate"]
+        with patch.object(sys, "argv", test_args):
+            main.__name__ = "__main__"
+            main.main()
+
+        mock_run_benchmark.assert_called_once_with(mock_load_config.return_value, None, True)
 
     @patch("main.run_benchmark")
     @patch("main.load_config", return_value=None)
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
 from providers.anthropic_provider import Anthropic
 
 
@@ -52,7 +54,9 @@ def test_perform_inference(mock_anthropic_client_class, setup_anthropic_provider
     # Mock the client instance and replace it in the provider instance
     mock_client_instance = MagicMock()
     mock_response = Message(content=[TextBlock(text="Test response", type="text")])
-    mock_client_instance.messages.create.return_value = mock_response
+    raw_response = mock_client_instance.messages.with_raw_response.create
+    raw_response.return_value.parse.return_value = mock_response
+    raw_response.return_value.headers = {"request-id": "req_1"}
     provider.client = mock_client_instance  # Directly set the mock client
 
     # Call the method with verbosity enabled
@@ -61,7 +65,7 @@ def test_perform_inference(mock_anthropic_client_class, setup_anthropic_provider
     )
 
     # Verify messages.create is called with correct parameters
-    provider.client.messages.create.assert_called_once_with(
+    raw_response.assert_called_once_with(
         model="claude-3-5-sonnet-20241022",
         max_tokens=100,
         messages=[{"role": "user", "content": "Test prompt"}],
@@ -72,6 +76,9 @@ def test_perform_inference(mock_anthropic_client_class, setup_anthropic_provider
 
     # Check if elapsed_time is a float (indicating the timer was used)
     assert isinstance(elapsed_time, float)
+    assert provider.response_headers["claude-3.5-sonnet"][0]["headers"] == {
+        "request-id": "req_1"
+    }
 
 
 @patch("providers.anthropic_provider.anthropic.Anthropic")
@@ -112,3 +119,46 @@ def test_perform_inference_streaming(
     assert "chunk3" in captured.out
     assert "Time to First Token" in captured.out
     assert "Total Response Time" in captured.out
+
+
+def test_streaming_logs_reported_output_tokens(setup_anthropic_provider):
+    """Test that both streaming paths log the output tokens of the final usage."""
+    provider = setup_anthropic_provider
+    final_message = SimpleNamespace(usage=SimpleNamespace(output_tokens=12))
+
+    mock_stream = MagicMock()
+    mock_stream.text_stream = iter(["chunk1", "chunk2", "chunk3"])
+    mock_stream.get_final_message.return_value = final_message
+    provider.client = MagicMock()
+    provider.client.messages.stream.return_value.__enter__.return_value = mock_stream
+
+    provider.perform_inference_streaming(
+        "claude-3.5-sonnet", "Test prompt", max_output=100, verbosity=False
+    )
+
+    async def text_stream():
+        for chunk in ["chunk1", "chunk2", "chunk3"]:
+            yield chunk
+
+    mock_async_stream = MagicMock()
+    mock_async_stream.text_stream = text_stream()
+    mock_async_stream.get_final_message = AsyncMock(return_value=final_message)
+    async_client = MagicMock()
+    async_client.messages.stream.return_value.__aenter__.return_value = mock_async_stream
+
+    with patch.object(provider, "create_async_client", return_value=async_client):
+        asyncio.run(
+            provider.perform_inference_streaming_async(
+                "claude-3.5-sonnet", "Test prompt", max_output=100, verbosity=False
+            )
+        )
+
+    assert provider.metrics["totaltokens"]["claude-3.5-sonnet"] == [12, 12]
+
+
+def test_anthropic_clients_do_not_retry(setup_anthropic_provider):
+    """Test that throttles are left to the benchmark's retry layer."""
+    provider = setup_anthropic_provider
+
+    assert provider.client.max_retries == 0
+    assert provider.create_async_client().max_retries == 0
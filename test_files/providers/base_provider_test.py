@@ -23,14 +23,16 @@ def test_perform_inference(
     mock_response = MagicMock()
     mock_response.choices = [MagicMock()]
     mock_response.choices[0].message.content = "Test response content."
-    base_provider.client.chat.completions.create.return_value = mock_response
+    raw_response = base_provider.client.chat.completions.with_raw_response.create
+    raw_response.return_value.parse.return_value = mock_response
+    raw_response.return_value.headers = {"x-request-id": "req-1"}
 
     # Call perform_inference
     elapsed_time = base_provider.perform_inference(
         "test-model", "What is the test prompt?"
     )
 
-    base_provider.client.chat.completions.create.assert_called_once_with(
+    raw_response.assert_called_once_with(
         model="model_id_test",
         messages=[
             {"role": "system", "content": "This is a test system prompt."},
@@ -43,9 +45,12 @@ def test_perform_inference(
     mock_log_metrics.assert_called_with("test-model", "response_times", 1.0)
     mock_display_response.assert_called_with(mock_response, 1.0)
     assert elapsed_time == 1.0
+    assert base_provider.response_headers["test-model"] == [
+        {"client_time": 1.0, "headers": {"x-request-id": "req-1"}}
+    ]
 
 
-@patch("providers.base_provider.timer", side_effect=[0, 0.5, 1.0, 1.5, 2.0])
+@patch("providers.base_provider.timer", side_effect=[0, 0.5, 1.0, 2.0])
 @patch.object(BaseProvider, "log_metrics")
 @patch.object(BaseProvider, "display_response")
 def test_perform_inference_streaming(
@@ -67,18 +72,20 @@ def test_perform_inference_streaming(
     mock_chunk3.choices[0].finish_reason = "stop"
 
     # Simulate the stream response
-    base_provider.client.chat.completions.create.return_value = [
+    raw_response = base_provider.client.chat.completions.with_raw_response.create
+    raw_response.return_value.parse.return_value = [
         mock_chunk1,
         mock_chunk2,
         mock_chunk3,
     ]
+    raw_response.return_value.headers = {}
 
     # Call perform_inference_streaming
     base_provider.perform_inference_streaming(
         "test-model", "What is the test streaming prompt?"
     )
 
-    base_provider.client.chat.completions.create.assert_called_once_with(
+    raw_response.assert_called_once_with(
         model="model_id_test",
         messages=[
             {"role": "system", "content": "This is a test system prompt."},
@@ -89,9 +96,102 @@ def test_perform_inference_streaming(
         timeout=(1,2)
     )
 
-    avg_tbt = sum([0.5, 0.5]) / len([0.5, 0.5])
     mock_log_metrics.assert_any_call("test-model", "timetofirsttoken", 0.5)
     mock_log_metrics.assert_any_call("test-model", "response_times", 2.0)
-    mock_log_metrics.assert_any_call("test-model", "timebetweentokens", avg_tbt)
+    mock_log_metrics.assert_any_call("test-model", "timebetweenchunks", 0.5)
 
     mock_display_response.assert_not_called()
+
+
+class AsyncStream:
+    """Async iterable over a fixed list of chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        self._iter = iter(self.chunks)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+@patch("providers.base_provider.timer", side_effect=[0, 0.5, 1.0, 1.5, 2.0])
+@patch.object(BaseProvider, "log_metrics")
+async def test_perform_inference_streaming_async(mock_log_metrics, mock_timer):
+    mock_async_client = MagicMock()
+    provider = BaseProvider(
+        api_key="test_api_key",
+        client_class=MagicMock(),
+        async_client_class=MagicMock(return_value=mock_async_client),
+    )
+    provider.model_map = {"test-model": "model_id_test"}
+
+    chunks = []
+    for content, finish_reason in [("a", None), ("b", None), ("c", None), (None, "stop")]:
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = content
+        chunk.choices[0].finish_reason = finish_reason
+        chunks.append(chunk)
+
+    async def create(**kwargs):
+        raw_response = MagicMock()
+        raw_response.parse.return_value = AsyncStream(chunks)
+        raw_response.headers = {"openai-processing-ms": "300"}
+        return raw_response
+
+    mock_async_client.chat.completions.with_raw_response.create = create
+
+    await provider.perform_inference_streaming_async(
+        "test-model", "What is the test streaming prompt?", verbosity=False
+    )
+
+    mock_log_metrics.assert_any_call("test-model", "timetofirsttoken", 0.5)
+    mock_log_metrics.assert_any_call("test-model", "response_times", 2.0)
+    mock_log_metrics.assert_any_call("test-model", "timebetweentokens", 0.5)
+    mock_log_metrics.assert_any_call("test-model", "totaltokens", 3)
+    mock_log_metrics.assert_any_call("test-model", "server_processing_time", 0.3)
+    mock_log_metrics.assert_any_call("test-model", "network_overhead", 0.2)
+
+
+def test_create_async_client_uses_http2_client():
+    async_client_class = MagicMock()
+    provider = BaseProvider(
+        api_key="test_api_key",
+        client_class=MagicMock(),
+        async_client_class=async_client_class,
+    )
+
+    provider.create_async_client()
+    assert "http_client" not in async_client_class.call_args.kwargs
+
+    # a MagicMock signature exposes no http_client parameter, so use a real class
+    class SDKClient:
+        def __init__(self, api_key, max_retries=2, http_client=None):
+            self.http_client = http_client
+
+    provider.async_client_class = SDKClient
+    provider.configure_http(http2=True)
+    client = provider.create_async_client()
+    assert client.http_client._transport.http2 is True
+
+
+def test_sdk_clients_do_not_retry():
+    client_class, async_client_class = MagicMock(), MagicMock()
+    provider = BaseProvider(
+        api_key="test_api_key",
+        client_class=client_class,
+        async_client_class=async_client_class,
+    )
+    provider.create_async_client()
+    provider.set_base_url("http://127.0.0.1:8080/v1")
+
+    # throttles must reach the benchmark's retry layer, not the SDK's
+    for call in (*client_class.call_args_list, async_client_class.call_args):
+        assert call.kwargs["max_retries"] == 0
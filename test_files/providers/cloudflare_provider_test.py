@@ -1,3 +1,4 @@
+import httpx
 import pytest
 import os
 from unittest.mock import patch, MagicMock
@@ -42,7 +43,7 @@ def test_cloudflare_provider_missing_env_variables():
             Cloudflare()
 
 
-@patch("providers.cloudflare_provider.requests.post")
+@patch("requests.Session.post")
 def test_perform_inference(mock_post, setup_cloudflare_provider):
     """Test perform_inference method."""
     provider = setup_cloudflare_provider
@@ -72,16 +73,16 @@ def test_perform_inference(mock_post, setup_cloudflare_provider):
     assert isinstance(elapsed_time, float)
 
 
-@patch("providers.cloudflare_provider.requests.post")
+@patch("requests.Session.post")
 def test_perform_inference_streaming(mock_post, setup_cloudflare_provider, capfd):
     """Test perform_inference_streaming method handles streaming responses."""
     provider = setup_cloudflare_provider
     mock_response = MagicMock()
-    mock_response.iter_lines.return_value = [
-        b'data: {"response":"chunk1"}',
-        b'data: {"response":"chunk2"}',
-        b'data: {"response":"chunk3"}',
-        b"data: [DONE]",
+    # network chunks do not line up with events
+    mock_response.iter_content.return_value = [
+        b'data: {"response":"chunk1"}\n\ndata: {"resp',
+        b'onse":"chunk2"}\n\n',
+        b'data: {"response":"chunk3"}\n\ndata: [DONE]\n\n',
     ]
     mock_post.return_value = mock_response
 
@@ -113,3 +114,73 @@ def test_perform_inference_streaming(mock_post, setup_cloudflare_provider, capfd
     assert "chunk1" in captured.out
     assert "chunk2" in captured.out
     assert "chunk3" in captured.out
+    # three chunks of two tokens each, "chunk" and the digit
+    assert provider.metrics["totaltokens"]["meta-llama-3.2-3b-instruct"] == [6]
+
+
+@pytest.mark.asyncio
+async def test_perform_inference_streaming_async(setup_cloudflare_provider):
+    """Test perform_inference_streaming_async reads the stream with the async client."""
+    provider = setup_cloudflare_provider
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        body = (
+            b'data: {"response":"chunk1"}\n\n'
+            b'data: {"response":"chunk2"}\n\n'
+            b'data: {"response":"chunk3"}\n\n'
+            b"data: [DONE]\n\n"
+        )
+        return httpx.Response(200, content=body)
+
+    provider.create_async_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+
+    await provider.perform_inference_streaming_async(
+        "meta-llama-3.2-3b-instruct", "Test prompt", max_output=100, verbosity=False
+    )
+
+    assert len(requests_seen) == 1
+    assert requests_seen[0].url.path.endswith("@cf/meta/llama-3.2-3b-instruct")
+    # three chunks of two tokens each, "chunk" and the digit
+    assert provider.metrics["totaltokens"]["meta-llama-3.2-3b-instruct"] == [6]
+    assert len(provider.metrics["timetofirsttoken"]["meta-llama-3.2-3b-instruct"]) == 1
+
+
+def test_session_is_pooled_and_reused(setup_cloudflare_provider):
+    """Test that the provider keeps one pooled session and honors connection modes."""
+    provider = setup_cloudflare_provider
+    session = provider.session
+
+    assert session.get_adapter("https://api.cloudflare.com")._pool_maxsize == 10
+    assert session.headers["Connection"] == "keep-alive"
+
+    provider.configure_http(mode="cold", pool_size=4)
+
+    assert provider.session is not session
+    assert provider.session.headers["Connection"] == "close"
+    assert provider.session.get_adapter("https://api.cloudflare.com")._pool_maxsize == 4
+    assert provider.create_async_client()._transport.max_keepalive_connections == 0
+    with pytest.raises(ValueError):
+        provider.configure_http(mode="lukewarm")
+
+
+@pytest.mark.asyncio
+async def test_http2_transport_is_recorded(setup_cloudflare_provider):
+    """Test that HTTP/2 is enabled on the async client and the used version recorded."""
+    provider = setup_cloudflare_provider
+    assert provider.transport() == "HTTP/1.1"
+
+    provider.configure_http(http2=True)
+    client = provider.create_http_client()
+    assert client._transport.http2 is True
+
+    def handler(request):
+        return httpx.Response(200, json={}, extensions={"http_version": b"HTTP/2"})
+
+    client._transport = httpx.MockTransport(handler)
+    await client.post("https://api.cloudflare.com/client/v4/test")
+
+    assert provider.transport() == "HTTP/2"
@@ -1,5 +1,6 @@
 import pytest
 import os
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 from providers.google_provider import GoogleGemini
 import google.generativeai as genai
@@ -97,3 +98,55 @@ def test_perform_inference_streaming(mock_gen_model_class, setup_google_gemini,
     assert "chunk3" in captured.out
     assert "Time to First Token" in captured.out
     assert "Total Response Time" in captured.out
+
+
+@patch("providers.google_provider.genai.GenerativeModel")
+def test_streaming_attributes_tokens_after_stream(mock_gen_model_class, setup_google_gemini):
+    """Tokens come from usage metadata after the stream, without count_tokens calls."""
+    provider = setup_google_gemini
+
+    mock_gen_model_instance = MagicMock()
+    last_chunk = MagicMock(text="cccccccc")
+    last_chunk.usage_metadata.candidates_token_count = 6
+    mock_gen_model_instance.generate_content.return_value = [
+        MagicMock(text="aaaa"),
+        MagicMock(text="bbbb"),
+        last_chunk,
+    ]
+    mock_gen_model_class.return_value = mock_gen_model_instance
+
+    for _ in range(2):
+        provider.perform_inference_streaming(
+            "gemini-1.5-flash", "Test prompt", max_output=100, verbosity=False,
+        )
+
+    mock_gen_model_class.assert_called_once_with("gemini-1.5-flash")
+    mock_gen_model_instance.count_tokens.assert_not_called()
+    assert provider.metrics["totaltokens"]["gemini-1.5-flash"] == [6, 6]
+
+
+
+@patch("providers.google_provider.genai.GenerativeModel")
+def test_concurrent_requests_use_their_own_model(mock_gen_model_class, setup_google_gemini):
+    """Requests from several threads each call the instance of their own model."""
+    provider = setup_google_gemini
+    instances = {}
+
+    def create(model_id):
+        instances[model_id] = MagicMock()
+        return instances[model_id]
+
+    mock_gen_model_class.side_effect = create
+    models = ["gemini-1.5-flash", "gemini-1.5-pro"] * 4
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda model: provider.perform_inference(model, "Test prompt", verbosity=False),
+                models,
+            )
+        )
+
+    assert instances["gemini-1.5-flash"].generate_content.call_count == 4
+    assert instances["gemini-1.5-pro"].generate_content.call_count == 4
+    assert not hasattr(provider, "model")
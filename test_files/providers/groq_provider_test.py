@@ -1,5 +1,6 @@
 import pytest
 import os
+from types import SimpleNamespace
 from unittest.mock import patch
 from providers.groq_provider import GroqProvider
 
@@ -38,7 +39,7 @@ def test_groq_provider_client_initialization(mock_groq_client):
         provider = GroqProvider()
 
     # Ensure the client is created with the correct API key
-    mock_groq_client.assert_called_once_with(api_key="test_api_key")
+    mock_groq_client.assert_called_once_with(api_key="test_api_key", max_retries=0)
 
 
 @patch("providers.groq_provider.Groq")
@@ -58,3 +59,36 @@ def test_groq_provider_get_model_name(mock_groq_client, setup_groq_provider):
     assert (
         provider.get_model_name("non-existent-model") is None
     )  # Should return None for unknown model
+
+
+def test_groq_server_timing_from_usage(setup_groq_provider):
+    """Test that the x_groq usage timings are logged with the other server timing."""
+    provider = setup_groq_provider
+    response = SimpleNamespace(
+        usage=SimpleNamespace(
+            queue_time=0.01, prompt_time=0.02, completion_time=0.3, total_time=0.33
+        )
+    )
+
+    provider.log_response_headers(
+        "common-model", {}, 0.5, provider.server_timing(response, streaming=False)
+    )
+
+    (record,) = provider.response_headers["common-model"]
+    assert record["server_timing"]["queue_time"] == 0.01
+    assert record["server_time"] == pytest.approx(0.33)
+    assert provider.metrics["network_overhead"]["common-model"] == [pytest.approx(0.17)]
+
+
+def test_groq_stream_server_timing_covers_first_token(setup_groq_provider):
+    """Test that a stream's server time is the queue and prompt time of its last chunk."""
+    provider = setup_groq_provider
+    usage = SimpleNamespace(
+        queue_time=0.01, prompt_time=0.02, completion_time=0.3, total_time=0.33
+    )
+    chunks = [SimpleNamespace(x_groq=None), SimpleNamespace(x_groq=SimpleNamespace(usage=usage))]
+
+    timing = provider.server_timing(chunks, streaming=True)
+
+    assert timing["server_time"] == pytest.approx(0.03)
+    assert provider.server_timing(chunks[:1], streaming=True) is None
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+import httpx
+from providers.network_timing import PhaseTimer, TimedTransport
+from benchmarking.loopback import LoopbackServer
+from providers.openai_compatible_provider import OpenAICompatible
+from providers.vllm_provider import vLLM
+
+HEADERS_DELAY = 0.2
+FIRST_EVENT_DELAY = 0.3
+
+
+async def slow_completion_server(reader, writer):
+    """Answers one streaming completion, pausing before the headers and the first event."""
+    request = await reader.readuntil(b"\r\n\r\n")
+    length = next(
+        int(line.split(b":")[1])
+        for line in request.lower().split(b"\r\n")
+        if line.startswith(b"content-length")
+    )
+    await reader.readexactly(length)
+
+    await asyncio.sleep(HEADERS_DELAY)
+    writer.write(
+        b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+        b"transfer-encoding: chunked\r\n\r\n"
+    )
+    await writer.drain()
+    await asyncio.sleep(FIRST_EVENT_DELAY)
+    for event in (b'{"choices": [{"text": "hi"}]}', b"[DONE]"):
+        data = b"data: " + event + b"\n\n"
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_streaming_request_logs_network_phases():
+    server = await asyncio.start_server(slow_completion_server, "127.0.0.1", 0)
+    provider = vLLM()
+    provider.set_host("127.0.0.1", server.sockets[0].getsockname()[1])
+
+    async with server:
+        text, _ = await provider.perform_inference_streaming_async(
+            "common-model", "hello", verbosity=False
+        )
+
+    assert text == "hi"
+    metrics = provider.metrics
+    assert metrics["queue_time"]["common-model"][0] == pytest.approx(
+        HEADERS_DELAY, abs=0.1
+    )
+    assert metrics["prefill_time"]["common-model"][0] == pytest.approx(
+        FIRST_EVENT_DELAY, abs=0.1
+    )
+    assert metrics["tls_time"]["common-model"] == [0.0]
+    assert metrics["dns_time"]["common-model"][0] >= 0
+    assert metrics["connect_time"]["common-model"][0] >= 0
+    assert metrics["upload_time"]["common-model"][0] >= 0
+
+
+def test_phases_need_response_headers():
+    timer = PhaseTimer()
+    assert not timer.phases()
+
+    timer.events = {
+        "send_request_headers.started": 1_000,
+        "send_request_body.complete": 3_000,
+        "receive_response_headers.complete": 10_000,
+    }
+    phases = timer.phases(first_token_ns=15_000)
+    assert phases["connect_time"] == 0
+    assert phases["upload_time"] == pytest.approx(2e-6)
+    assert phases["queue_time"] == pytest.approx(7e-6)
+    assert phases["prefill_time"] == pytest.approx(5e-6)
+
+
+@pytest.mark.asyncio
+async def test_timed_transport_raises_httpx_errors():
+    # a port nothing listens on, taken from a server that is closed right away
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    async with httpx.AsyncClient(transport=TimedTransport()) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get(f"http://127.0.0.1:{port}/")
+
+
+def test_session_request_logs_network_phases():
+    with LoopbackServer(ttft_s=0.2, interval_s=0.01, chunks=2) as server:
+        provider = OpenAICompatible(base_url=server.base_url, default_model="mock")
+        for _ in range(2):
+            provider.perform_inference_streaming("model_a", "hello", verbosity=False)
+
+    metrics = provider.metrics
+    assert metrics["prefill_time"]["model_a"][0] == pytest.approx(0.2, abs=0.1)
+    assert metrics["queue_time"]["model_a"][0] < 0.1
+    assert metrics["tls_time"]["model_a"] == [0.0, 0.0]
+    # the second request reuses the pooled connection
+    assert metrics["connect_time"]["model_a"][0] > 0
+    assert metrics["connect_time"]["model_a"][1] == 0
+    assert metrics["dns_time"]["model_a"][1] == 0
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import pytest
+from providers.openai_compatible_provider import OpenAICompatible
+
+
+def make_chat_server(requests):
+    """Returns a server callback that records each request body and streams two chat deltas."""
+
+    async def chat_server(reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in request.lower().split(b"\r\n")
+            if line.startswith(b"content-length")
+        )
+        requests.append(
+            (request.split(b" ")[1].decode(), json.loads(await reader.readexactly(length)))
+        )
+        body = b"".join(
+            b"data: " + event + b"\n\n"
+            for event in (
+                b'{"choices": [{"delta": {"role": "assistant"}}]}',
+                b'{"choices": [{"delta": {"content": "hel"}}]}',
+                b'{"choices": [{"delta": {"content": "lo"}}]}',
+                b'{"choices": [], "usage": {"completion_tokens": 2}}',
+                b"[DONE]",
+            )
+        )
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"content-length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        writer.close()
+
+    return chat_server
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        OpenAICompatible(base_url="http://localhost:8000/v1", mode="responses")
+
+
+def test_request_body_modes():
+    completions = OpenAICompatible(models={"m": "org/model"})
+    chat = OpenAICompatible(mode="chat", extra_body={"max_tokens": 7, "ignore_eos": True})
+
+    body = completions.request_body("m", "hi", 50, stream=True)
+    assert body["model"] == "org/model"
+    assert body["prompt"].endswith("User: hi")
+    assert body["stream"] is True
+
+    body = chat.request_body("m", "hi", 50)
+    assert body["messages"][-1] == {"role": "user", "content": "hi"}
+    assert body["max_tokens"] == 7
+    assert body["ignore_eos"] is True
+    with pytest.raises(ValueError):
+        chat.endpoint()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_from_local_server():
+    requests = []
+    server = await asyncio.start_server(make_chat_server(requests), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    provider = OpenAICompatible(
+        base_url=f"http://127.0.0.1:{port}/v1",
+        mode="chat",
+        models={"common-model": "org/model"},
+        extra_body={"temperature": 0},
+    )
+
+    async with server:
+        text, _ = await provider.perform_inference_streaming_async(
+            "common-model", "hello", max_output=20, verbosity=False
+        )
+
+    assert text == "hello"
+    path, body = requests[0]
+    assert path == "/v1/chat/completions"
+    assert body["stream"] is True
+    assert body["temperature"] == 0
+    assert len(provider.metrics["timetofirsttoken"]["common-model"]) == 1
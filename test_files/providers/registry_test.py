@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from providers import registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.clear_providers()
+    yield
+    registry.clear_providers()
+
+
+def test_get_provider_caches_instance():
+    with patch.dict(os.environ, {"OPEN_AI_API": "test_openai_api"}):
+        provider = registry.get_provider("OpenAI")
+
+    assert provider.__class__.__name__ == "Open_AI"
+    assert provider.config_name == "OpenAI"
+    assert registry.get_provider("OpenAI") is provider
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(ValueError):
+        registry.get_provider("InvalidProvider")
+
+
+def test_only_selected_provider_sdk_is_imported():
+    code = (
+        "import sys\n"
+        "from providers.registry import get_provider\n"
+        "get_provider('vLLM')\n"
+        "print(sorted(m for m in ('anthropic', 'boto3', 'groq', 'together', 'openai')"
+        " if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_registered_endpoint_is_named_after_config():
+    registry.register_endpoint(
+        "SGLang", {"base_url": "http://10.0.0.5:30000/v1/", "mode": "chat"}
+    )
+
+    provider = registry.get_provider("SGLang")
+
+    assert "SGLang" in registry.provider_names()
+    assert provider.__class__.__name__ == "SGLang"
+    assert provider.config_name == "SGLang"
+    assert provider.endpoint() == "http://10.0.0.5:30000/v1/chat/completions"
@@ -0,0 +1,28 @@
+import pytest
+import requests
+from providers.response_headers import capture_headers, server_processing_time
+
+
+def test_capture_headers_keeps_allow_list_case_insensitively():
+    headers = requests.structures.CaseInsensitiveDict(
+        {"X-Request-Id": "req-1", "CF-Ray": "abc-IAD", "Content-Type": "text/plain"}
+    )
+
+    captured = capture_headers(headers, ("x-request-id", "CF-RAY", "server-timing"))
+
+    assert captured == {"x-request-id": "req-1", "cf-ray": "abc-IAD"}
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"openai-processing-ms": "250"}, 0.25),
+        ({"x-amzn-bedrock-invocation-latency": "1200"}, 1.2),
+        ({"server-timing": 'cfL4;desc="?rtt=10", total;dur=80.5, db;dur=12'}, 0.0805),
+        ({"server-timing": 'cfL4;desc="?rtt=10"'}, None),
+        ({"openai-processing-ms": "n/a"}, None),
+        ({"x-request-id": "req-1"}, None),
+    ],
+)
+def test_server_processing_time(headers, expected):
+    assert server_processing_time(headers) == pytest.approx(expected)
@@ -0,0 +1,39 @@
+import pytest
+from unittest.mock import patch
+from providers.sse import SSEParser
+
+
+def test_parser_splits_events_across_chunks():
+    parser = SSEParser()
+
+    parser.feed(b': keep-alive\n\ndata: {"a": 1}\r\n\r\ndata: {"a"')
+    parser.feed(b": 2}\n\nevent: ping\ndata:{\"a\": 3}\n")
+    parser.feed(b"\ndata: [DONE]\n\ndata: {\"a\": 4}\n\n")
+
+    assert parser.payloads == [b'{"a": 1}', b'{"a": 2}', b'{"a": 3}']
+    assert parser.events() == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert parser.done
+
+
+@patch("providers.sse.time.perf_counter_ns", side_effect=[1_000, 3_000, 6_000])
+def test_parser_stamps_chunks_on_arrival(mock_perf_counter_ns):
+    parser = SSEParser()
+
+    parser.feed(b"data: 1\n\ndata: 2\n\n")
+    parser.feed(b"data: 3\n\n")
+    parser.feed(b"data: [DONE]\n\n")
+
+    assert parser.arrivals == [1_000, 1_000, 3_000]
+    ttft, inter_token_latencies, total_time = parser.timings(start_ns=0)
+    assert ttft == pytest.approx(1e-6)
+    assert inter_token_latencies == pytest.approx([0.0, 2e-6])
+    assert total_time == pytest.approx(6e-6)
+
+
+def test_parser_skips_non_json_and_requires_events():
+    parser = SSEParser()
+    with pytest.raises(ValueError):
+        parser.timings(0)
+
+    parser.feed(b"data: not json\n\n")
+    assert parser.events() == []
@@ -0,0 +1,48 @@
+import pytest
+from providers.sse import SSEParser
+from providers.stream_capture import StreamCapture
+
+
+def make_clock(values):
+    """Returns a clock yielding the given values in turn."""
+    values = iter(values)
+    return lambda: next(values)
+
+
+def test_capture_grows_past_capacity():
+    capture = StreamCapture(make_clock(range(5)), 1, capacity=2)
+    for chunk in "abcde":
+        capture.add(chunk)
+
+    assert len(capture) == 5
+    assert capture.captured() == list("abcde")
+    assert list(capture)[-1] == (4, "e")
+
+
+def test_timings_stop_before_finish_chunk():
+    capture = StreamCapture(make_clock([1.0, 1.5, 2.5, 3.0]), 1)
+    for chunk in ("a", "b", "c", "finish"):
+        capture.add(chunk)
+
+    ttft, gaps, total = capture.timings(0.5, stop=3)
+    assert ttft == 0.5
+    assert gaps == [0.5, 1.0]
+    assert total == 2.5
+    assert capture.timings(0.5, end=4.0)[2] == 3.5
+
+
+def test_timings_without_chunks_raises():
+    with pytest.raises(ValueError):
+        StreamCapture().timings(0)
+
+
+def test_sse_replay_uses_capture_stamps():
+    capture = StreamCapture(make_clock([100, 300, 400]))
+    for chunk in (b'data: {"a": 1}\n\ndata: {"a"', b': 2}\n\n', b"data: [DONE]\n\n"):
+        capture.add(chunk)
+
+    parser = SSEParser()
+    parser.replay(capture)
+    assert parser.arrivals == [100, 300]
+    assert parser.done_ns == 400
+    assert parser.events() == [{"a": 1}, {"a": 2}]
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch
+from providers.provider_interface import ProviderInterface
+from providers.token_attribution import (
+    approximate_tokenizer,
+    chunk_token_counts,
+    model_family,
+    token_latencies,
+)
+
+
+def test_model_family():
+    assert model_family("gpt-4o-mini") == "o200k_base"
+    assert model_family("gpt-3.5-turbo") == "cl100k_base"
+    assert model_family("meta-llama/Llama-3.1-8B") == "cl100k_base"
+    assert model_family(None) == "cl100k_base"
+
+
+def test_approximate_tokenizer_splits_words_numbers_and_punctuation():
+    assert approximate_tokenizer("Hello, world") == 3
+    assert approximate_tokenizer(" 12345!") == 3
+
+
+@patch("providers.token_attribution.get_tokenizer", return_value=approximate_tokenizer)
+def test_chunk_token_counts_scale_to_reported_total(mock_tokenizer):
+    assert chunk_token_counts(["one", " two three", ""]) == [1, 2, 0]
+    assert chunk_token_counts(["one", " two three", ""], total_tokens=6) == [2, 4, 0]
+
+
+def test_token_latencies_spread_gaps_over_chunk_tokens():
+    # a role-only first chunk, then chunks of 1, 3, 0 and 2 tokens
+    latencies = token_latencies([0.4, 0.3, 0.1, 0.1], [0, 1, 3, 0, 2])
+
+    assert latencies == pytest.approx([0.1, 0.1, 0.1, 0.1, 0.1])
+
+
+class StreamingProvider(ProviderInterface):
+    def get_model_name(self, model):
+        return "gpt-4o"
+
+    def perform_inference(self, model, prompt, max_output=100, verbosity=True):
+        pass
+
+    def perform_inference_streaming(self, model, prompt, max_output=100, verbosity=True):
+        pass
+
+
+@patch("providers.token_attribution.get_tokenizer", return_value=approximate_tokenizer)
+def test_streaming_metrics_per_chunk_and_per_token(mock_tokenizer):
+    provider = StreamingProvider()
+
+    provider.log_streaming_metrics(
+        "m", 0.2, 1.0, [0.2, 0.6], chunk_texts=["Hi", " there", " big world"]
+    )
+
+    assert provider.metrics["timebetweenchunks"]["m"] == [pytest.approx(0.4)]
+    assert provider.metrics["timebetweentokens"]["m"] == [pytest.approx(0.8 / 3)]
+    assert provider.metrics["totaltokens"]["m"] == [4]
+    assert provider.metrics["tps"]["m"] == [4.0]
+    mock_tokenizer.assert_called_with("o200k_base")
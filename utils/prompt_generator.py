@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 PROMPT_100_TOKENS = "Tell me a long story based on the following story description: \
 In a future world where emotions are regulated by technology, \
 a girl discovers a hidden garden that awakens real feelings. \
@@ -31,3 +33,11 @@ def get_prompt(input_size):
     if input_size == 10000:
         return PROMPT_1000_TOKENS * 5 + PROMPT_100_TOKENS * 50
     return PROMPT_1000_TOKENS * 100
+
+
+@lru_cache(maxsize=256)
+def get_prompt_of_length(input_tokens):
+    """Generates a prompt of about input_tokens tokens by repeating the 1000-token story."""
+    chars_per_token = len(PROMPT_1000_TOKENS) / 1000
+    length = max(1, int(input_tokens * chars_per_token))
+    return (PROMPT_1000_TOKENS * (length // len(PROMPT_1000_TOKENS) + 1))[:length]